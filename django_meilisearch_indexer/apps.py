@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class DjangoMeilisearchIndexerConfig(AppConfig):
+    name = "django_meilisearch_indexer"
+    verbose_name = "Django Meilisearch Indexer"
+    default_auto_field = "django.db.models.BigAutoField"
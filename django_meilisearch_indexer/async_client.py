@@ -0,0 +1,197 @@
+import asyncio
+from functools import lru_cache
+import ssl
+from typing import Any, Dict, List, Optional, Tuple, Union
+from weakref import WeakKeyDictionary
+
+from django.core.exceptions import ImproperlyConfigured
+from meilisearch.errors import MeilisearchApiError
+
+from django_meilisearch_indexer.types import MeilisearchSettings
+
+try:
+    # httpx imports its transport lazily, which would block the first event loop using it
+    import httpcore  # noqa: F401
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None  # ty: ignore
+
+
+_clients: "WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, Optional[str]], AsyncMeilisearchClient]]" = WeakKeyDictionary()
+
+
+class AsyncMeilisearchClient:
+    """
+    A minimal asyncio Meilisearch client, covering the endpoints used by the indexers.
+    Requests go through a single `httpx.AsyncClient`, which keeps a pool of
+    keep-alive connections. Errors are raised as `MeilisearchApiError`, like the sync client.
+
+    Args:
+        url (str): The Meilisearch host
+        api_key (Optional[str]): The Meilisearch API key. Defaults to None.
+        timeout (Optional[float]): The timeout of each request, in seconds. Defaults to 10.
+        max_connections (int): The maximum number of pooled connections. Defaults to 100.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        api_key: Optional[str] = None,
+        timeout: Optional[float] = 10,
+        max_connections: int = 100,
+    ) -> None:
+        if httpx is None:
+            raise ImproperlyConfigured(
+                "The async API requires httpx: pip install django_meilisearch_indexer[async]"
+            )
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.http = httpx.AsyncClient(
+            base_url=url.rstrip("/"),
+            headers=headers,
+            verify=_get_ssl_context(),
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+    async def close(self) -> None:
+        """Closes the pooled connections."""
+        await self.http.aclose()
+
+    # --------------------------------------------------
+    # Indexes
+    # --------------------------------------------------
+    async def get_index(self, index_name: str) -> Dict[str, Any]:
+        """Returns the index information."""
+        return await self._request("GET", f"/indexes/{index_name}")
+
+    async def create_index(
+        self, index_name: str, options: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Creates the index and returns its task."""
+        body = {"uid": index_name, **(options or {})}
+        return await self._request("POST", "/indexes", json=body)
+
+    async def get_settings(self, index_name: str) -> Dict[str, Any]:
+        """Returns the index settings."""
+        return await self._request("GET", f"/indexes/{index_name}/settings")
+
+    async def update_settings(
+        self, index_name: str, settings: MeilisearchSettings
+    ) -> Dict[str, Any]:
+        """Updates the index settings and returns the task."""
+        return await self._request(
+            "PATCH", f"/indexes/{index_name}/settings", json=settings
+        )
+
+    # --------------------------------------------------
+    # Documents
+    # --------------------------------------------------
+    async def add_documents_ndjson(
+        self, index_name: str, payload: bytes, partial: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Adds or replaces the NDJSON documents and returns the task.
+
+        Args:
+            index_name (str): The target index name
+            payload (bytes): The NDJSON documents
+            partial (bool): Whether to merge them into the existing documents instead.
+                Defaults to False.
+
+        Returns:
+            Dict[str, Any]: The enqueued task
+        """
+        return await self._request(
+            "PUT" if partial else "POST",
+            f"/indexes/{index_name}/documents",
+            content=payload,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+    async def delete_documents(
+        self, index_name: str, ids: Union[List[int], List[str]]
+    ) -> Dict[str, Any]:
+        """Deletes the documents with the given ids and returns the task."""
+        return await self._request(
+            "POST", f"/indexes/{index_name}/documents/delete-batch", json=ids
+        )
+
+    # --------------------------------------------------
+    # Search
+    # --------------------------------------------------
+    async def search(
+        self, index_name: str, query: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Searches the index with the given query and parameters."""
+        body = {**params, "q": query}
+        return await self._request("POST", f"/indexes/{index_name}/search", json=body)
+
+    async def multi_search(
+        self, queries: List[Dict[str, Any]], federation: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Performs several searches in a single request, optionally federated."""
+        body: Dict[str, Any] = {"queries": queries}
+        if federation is not None:
+            body["federation"] = federation
+        return await self._request("POST", "/multi-search", json=body)
+
+    # --------------------------------------------------
+    # Tasks
+    # --------------------------------------------------
+    async def get_tasks(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns the tasks matching the parameters, with list values joined by commas."""
+        query = {
+            key: ",".join(map(str, value))
+            if isinstance(value, (list, tuple))
+            else value
+            for key, value in params.items()
+        }
+        return await self._request("GET", "/tasks", params=query)
+
+    # --------------------------------------------------
+    # Utils
+    # --------------------------------------------------
+    async def _request(self, method: str, path: str, **kwargs: Any) -> Dict[str, Any]:
+        response = await self.http.request(method, path, **kwargs)
+        if response.is_error:
+            raise MeilisearchApiError(str(response.status_code), response)  # ty: ignore
+        return response.json() if response.content else {}
+
+
+def get_async_client(url: str, api_key: Optional[str]) -> AsyncMeilisearchClient:
+    """
+    Returns the client of the running event loop, creating it if needed.
+    An `httpx.AsyncClient` can't be shared between event loops, so each loop gets its own.
+
+    Args:
+        url (str): The Meilisearch host
+        api_key (Optional[str]): The Meilisearch API key
+
+    Returns:
+        AsyncMeilisearchClient: The pooled client of the running loop
+    """
+    loop_clients = _clients.setdefault(asyncio.get_running_loop(), {})
+    client = loop_clients.get((url, api_key))
+    if client is None:
+        client = AsyncMeilisearchClient(url, api_key)
+        loop_clients[(url, api_key)] = client
+    return client
+
+
+@lru_cache(maxsize=None)
+def _get_ssl_context() -> ssl.SSLContext:
+    """
+    Returns the SSL context shared by the clients of every event loop,
+    as loading the CA certificates takes a while and would block each new loop.
+    """
+    return httpx.create_ssl_context()  # ty: ignore
+
+
+async def close_async_clients() -> None:
+    """Closes the clients of the running event loop, for example on ASGI shutdown."""
+    loop_clients = _clients.pop(asyncio.get_running_loop(), {})
+    for client in loop_clients.values():
+        await client.close()
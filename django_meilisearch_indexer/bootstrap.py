@@ -0,0 +1,153 @@
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import inspect
+import json
+from typing import Dict, Iterator, List, Optional, Sequence, Type
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import autodiscover_modules, import_string
+
+from django_meilisearch_indexer.indexers import (
+    MeilisearchModelIndexer,
+    _get_index_names,
+)
+from django_meilisearch_indexer.tasks import TaskTracker
+from django_meilisearch_indexer.transport import get_transport
+
+FINGERPRINT_CACHE_KEY = "django_meilisearch_indexer:bootstrap:fingerprint"
+
+
+def get_indexers(autodiscover: bool = True) -> List[Type[MeilisearchModelIndexer]]:
+    """
+    Returns the concrete indexers, one per index name.
+    When several indexers share an index, the first one defined is kept.
+
+    Args:
+        autodiscover (bool): Whether to import the `indexers` module of each installed app
+            first, so their indexers are defined. Defaults to True.
+
+    Returns:
+        List[Type[MeilisearchModelIndexer]]: The indexers, in definition order
+    """
+    if autodiscover:
+        autodiscover_modules("indexers")
+    indexers: Dict[str, Type[MeilisearchModelIndexer]] = {}
+    for indexer in _iter_subclasses(MeilisearchModelIndexer):
+        if inspect.isabstract(indexer) or not hasattr(indexer, "SETTINGS"):
+            continue
+        indexers.setdefault(indexer.index_name(), indexer)
+    return list(indexers.values())
+
+
+def get_indexers_by_name(names: Sequence[str]) -> List[Type[MeilisearchModelIndexer]]:
+    """
+    Resolves the indexers given to the management commands.
+
+    Args:
+        names (Sequence[str]): Indexer class names, dotted paths, or index names
+
+    Returns:
+        List[Type[MeilisearchModelIndexer]]: The matching indexers,
+            or all the indexers from `get_indexers` if `names` is empty
+
+    Raises:
+        CommandError: If a name matches no indexer
+    """
+    indexers = get_indexers()
+    if len(names) == 0:
+        return indexers
+    selected = []
+    for name in names:
+        if "." in name:
+            selected.append(import_string(name))
+            continue
+        matches = [
+            indexer
+            for indexer in indexers
+            if name in (indexer.__name__, indexer.index_name())
+        ]
+        if len(matches) == 0:
+            raise CommandError(f"Unknown indexer: {name}")
+        selected.extend(matches)
+    return selected
+
+
+def get_settings_fingerprint(indexers: Sequence[Type[MeilisearchModelIndexer]]) -> str:
+    """
+    Returns a digest of the host, index names, primary keys, and settings of the indexers.
+
+    Args:
+        indexers (Sequence[Type[MeilisearchModelIndexer]]): The indexers
+
+    Returns:
+        str: The fingerprint, which changes whenever one of them does
+    """
+    data = [settings.MEILISEARCH_HOST] + sorted(
+        (
+            [indexer.index_name(), indexer.PRIMARY_KEY, indexer.SETTINGS]
+            for indexer in indexers
+        ),
+        key=lambda item: item[0],
+    )
+    encoded = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+    return hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
+
+
+def bootstrap_indexes(
+    indexers: Optional[Sequence[Type[MeilisearchModelIndexer]]] = None,
+    concurrency: int = 8,
+    fingerprint_cache: Optional[str] = None,
+) -> List[str]:
+    """
+    Creates the missing indexes and updates the settings that changed, for all the indexers.
+    The existing indexes are listed in a single request, then each index is handled
+    concurrently, only sending the settings that differ from the current ones.
+    It then waits for all the enqueued tasks, so the indexes are ready once it returns.
+    With `fingerprint_cache`, the fingerprint of the settings is stored once they all
+    succeeded, and the next calls return immediately until one of the indexers changes.
+
+    Args:
+        indexers (Optional[Sequence[Type[MeilisearchModelIndexer]]]): The indexers to set up.
+            Defaults to None, meaning all the indexers from `get_indexers`.
+        concurrency (int): The maximum number of indexes handled at once. Defaults to 8.
+        fingerprint_cache (Optional[str]): The alias of the Django cache storing the
+            fingerprint. Defaults to None, meaning no fingerprint is used.
+
+    Returns:
+        List[str]: The names of the indexes that were created or updated
+
+    Raises:
+        MeilisearchTaskError: If one of the tasks failed, in which case
+            the fingerprint is not stored
+    """
+    indexers = get_indexers() if indexers is None else indexers
+    fingerprint = get_settings_fingerprint(indexers)
+    if fingerprint_cache is not None:
+        if caches[fingerprint_cache].get(FINGERPRINT_CACHE_KEY) == fingerprint:
+            return []
+    existing = _get_index_names(get_transport().client)
+
+    def sync(indexer: Type[MeilisearchModelIndexer]) -> TaskTracker:
+        return indexer._sync_index(exists=indexer.index_name() in existing)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        trackers = list(executor.map(sync, indexers))
+    TaskTracker(trackers).wait()
+    if fingerprint_cache is not None:
+        caches[fingerprint_cache].set(FINGERPRINT_CACHE_KEY, fingerprint, None)
+    return [
+        indexer.index_name()
+        for indexer, tracker in zip(indexers, trackers)
+        if len(tracker) > 0
+    ]
+
+
+def _iter_subclasses(
+    cls: Type[MeilisearchModelIndexer],
+) -> Iterator[Type[MeilisearchModelIndexer]]:
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _iter_subclasses(subclass)
@@ -0,0 +1,204 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import pickle
+from threading import Lock
+from time import monotonic
+from typing import Dict, Optional, Tuple
+from uuid import uuid4
+
+from django.core.cache import caches
+
+from django_meilisearch_indexer.types import MeilisearchSearchResults
+
+
+class SearchCache(ABC):
+    """
+    Stores search results by key, with a version per index.
+    Keys built by the indexers contain the current version of their index,
+    so bumping it on every write makes the previous entries unreachable.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = Lock()
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[MeilisearchSearchResults]:
+        """Returns the cached results for the key, if any."""
+
+    @abstractmethod
+    def set(self, key: str, results: MeilisearchSearchResults) -> None:
+        """Caches the results for the key."""
+
+    @abstractmethod
+    def get_version(self, index_name: str) -> str:
+        """Returns the current version of the index."""
+
+    @abstractmethod
+    def bump_version(self, index_name: str) -> None:
+        """Changes the version of the index, invalidating its cached results."""
+
+    async def aget(self, key: str) -> Optional[MeilisearchSearchResults]:
+        """Async version of `get`. Defaults to calling it directly."""
+        return self.get(key)
+
+    async def aset(self, key: str, results: MeilisearchSearchResults) -> None:
+        """Async version of `set`. Defaults to calling it directly."""
+        self.set(key, results)
+
+    async def aget_version(self, index_name: str) -> str:
+        """Async version of `get_version`. Defaults to calling it directly."""
+        return self.get_version(index_name)
+
+    async def abump_version(self, index_name: str) -> None:
+        """Async version of `bump_version`. Defaults to calling it directly."""
+        self.bump_version(index_name)
+
+    def record(self, hit: bool) -> None:
+        """Counts a cache hit or miss."""
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns the hit and miss counts, and the hit rate.
+
+        Returns:
+            Dict[str, float]: The `hits`, `misses`, and `hit_rate` of the cache
+        """
+        with self._stats_lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total > 0 else 0.0,
+            }
+
+    def reset_stats(self) -> None:
+        """Resets the hit and miss counts."""
+        with self._stats_lock:
+            self.hits = 0
+            self.misses = 0
+
+
+class LocalSearchCache(SearchCache):
+    """
+    An in-process LRU cache, with a time-to-live for each entry.
+    Results are pickled, so callers can't modify the cached data.
+
+    Args:
+        max_size (int): The maximum number of cached results. Defaults to 1024.
+        timeout (float): The time-to-live of an entry, in seconds. Defaults to 60.
+    """
+
+    def __init__(self, max_size: int = 1024, timeout: float = 60) -> None:
+        super().__init__()
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[MeilisearchSearchResults]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, data = entry
+            if expires_at <= monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return pickle.loads(data)
+
+    def set(self, key: str, results: MeilisearchSearchResults) -> None:
+        data = pickle.dumps(results, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._entries[key] = (monotonic() + self.timeout, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_version(self, index_name: str) -> str:
+        with self._lock:
+            return str(self._versions.get(index_name, 0))
+
+    def bump_version(self, index_name: str) -> None:
+        with self._lock:
+            self._versions[index_name] = self._versions.get(index_name, 0) + 1
+
+    def clear(self) -> None:
+        """Removes all the cached results."""
+        with self._lock:
+            self._entries.clear()
+
+
+class DjangoSearchCache(SearchCache):
+    """
+    Stores the results in one of the Django `CACHES`, to share them between processes.
+
+    Args:
+        alias (str): The alias of the Django cache. Defaults to "default".
+        timeout (Optional[float]): The time-to-live of an entry, in seconds.
+            Defaults to 60. None uses the timeout of the Django cache.
+    """
+
+    def __init__(self, alias: str = "default", timeout: Optional[float] = 60) -> None:
+        super().__init__()
+        self.alias = alias
+        self.timeout = timeout
+
+    def get(self, key: str) -> Optional[MeilisearchSearchResults]:
+        return caches[self.alias].get(self._make_key(key))
+
+    def set(self, key: str, results: MeilisearchSearchResults) -> None:
+        cache = caches[self.alias]
+        if self.timeout is None:
+            cache.set(self._make_key(key), results)
+        else:
+            cache.set(self._make_key(key), results, self.timeout)
+
+    def get_version(self, index_name: str) -> str:
+        # Versions are random tokens, so an evicted version can't revive stale entries
+        cache = caches[self.alias]
+        version_key = self._make_key(f"{index_name}:version")
+        version = cache.get(version_key)
+        if version is None:
+            cache.add(version_key, uuid4().hex, None)
+            version = cache.get(version_key)
+        return str(version)
+
+    def bump_version(self, index_name: str) -> None:
+        version_key = self._make_key(f"{index_name}:version")
+        caches[self.alias].set(version_key, uuid4().hex, None)
+
+    async def aget(self, key: str) -> Optional[MeilisearchSearchResults]:
+        return await caches[self.alias].aget(self._make_key(key))
+
+    async def aset(self, key: str, results: MeilisearchSearchResults) -> None:
+        cache = caches[self.alias]
+        if self.timeout is None:
+            await cache.aset(self._make_key(key), results)
+        else:
+            await cache.aset(self._make_key(key), results, self.timeout)
+
+    async def aget_version(self, index_name: str) -> str:
+        cache = caches[self.alias]
+        version_key = self._make_key(f"{index_name}:version")
+        version = await cache.aget(version_key)
+        if version is None:
+            await cache.aadd(version_key, uuid4().hex, None)
+            version = await cache.aget(version_key)
+        return str(version)
+
+    async def abump_version(self, index_name: str) -> None:
+        version_key = self._make_key(f"{index_name}:version")
+        await caches[self.alias].aset(version_key, uuid4().hex, None)
+
+    @staticmethod
+    def _make_key(key: str) -> str:
+        return f"django_meilisearch_indexer:search:{key}"
@@ -0,0 +1,585 @@
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from functools import lru_cache
+import math
+import re
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from django_meilisearch_indexer.types import MeilisearchFilters
+
+_ATTRIBUTE_RE = re.compile(r"^[\w.\-]+$")
+_SAFE_VALUE_RE = re.compile(r"^[\w.\-]+$")
+_KEYWORDS = {
+    "AND",
+    "OR",
+    "NOT",
+    "IN",
+    "TO",
+    "EXISTS",
+    "IS",
+    "NULL",
+    "EMPTY",
+    "CONTAINS",
+    "STARTS",
+    "WITH",
+}
+_UNARY_OPERATORS = {
+    "EXISTS",
+    "NOT EXISTS",
+    "IS NULL",
+    "IS NOT NULL",
+    "IS EMPTY",
+    "IS NOT EMPTY",
+}
+_COMPARISON_OPERATORS = {"=", "!=", ">", ">=", "<", "<="}
+_LIST_OPERATORS = {"IN", "NOT IN"}
+
+
+# --------------------------------------------------
+# Expressions
+# --------------------------------------------------
+class Filter:
+    """
+    Base class of the filter expressions, which are combined with
+    `&` (AND), `|` (OR), and `~` (NOT), and compiled into Meilisearch filter strings.
+    Templates are cached by shape: the literal values of the expression are slots
+    filled when rendering, so expressions only differing by their values share one.
+    """
+
+    def __and__(self, other: "Filter") -> "Filter":
+        return And((*_flatten(self, And), *_flatten(other, And)))
+
+    def __or__(self, other: "Filter") -> "Filter":
+        return Or((*_flatten(self, Or), *_flatten(other, Or)))
+
+    def __invert__(self) -> "Filter":
+        if isinstance(self, Not):
+            return self.child
+        return Not(self)
+
+    def attributes(self) -> Set[str]:
+        """Returns the names of the attributes used by the expression."""
+        raise NotImplementedError
+
+    def compile(self) -> "FilterTemplate":
+        """Returns the template of the filter string, compiled once per shape."""
+        literals: Dict[str, Any] = {}
+        template = _compile(_extract_literals(self, literals))
+        if len(literals) == 0:
+            return template
+        return template.with_literals(literals)
+
+    def bind(self, **params: Any) -> "BoundFilter":
+        """Returns the expression with values for its `Param` placeholders."""
+        return BoundFilter(self, params)
+
+    def render(self, **params: Any) -> str:
+        """Returns the filter string, with the given values for its `Param` placeholders."""
+        return self.compile().render(params)
+
+    def _parts(self) -> Iterator[Union[str, "_Slot"]]:
+        """Yields the literal strings and parameter slots of the filter string."""
+        raise NotImplementedError
+
+
+@dataclass(frozen=True)
+class Param:
+    """
+    A placeholder for a value, given when rendering or binding the expression.
+
+    Args:
+        name (str): The name of the parameter
+    """
+
+    name: str
+
+
+@dataclass(frozen=True)
+class Condition(Filter):
+    """
+    A single condition on an attribute. Usually built from an `Attribute`.
+
+    Args:
+        attribute (str): The attribute name
+        operator (str): The Meilisearch operator, like "=", "IN", "TO", or "IS NULL"
+        value (Any): The value, a tuple of values for "IN" and "TO", or a `Param`
+    """
+
+    attribute: str
+    operator: str
+    value: Any = None
+
+    def attributes(self) -> Set[str]:
+        return {self.attribute}
+
+    def _parts(self) -> Iterator[Union[str, "_Slot"]]:
+        if self.operator in _UNARY_OPERATORS:
+            yield f"{self.attribute} {self.operator}"
+        elif self.operator in _COMPARISON_OPERATORS:
+            yield f"{self.attribute} {self.operator} "
+            yield _value_part(self.value)
+        elif self.operator in _LIST_OPERATORS:
+            yield f"{self.attribute} {self.operator} "
+            if isinstance(self.value, Param):
+                yield _Slot(self.value.name, many=True)
+            else:
+                yield _format_values(self.value)
+        elif self.operator == "TO":
+            low, high = self.value
+            yield f"{self.attribute} "
+            yield _value_part(low)
+            yield " TO "
+            yield _value_part(high)
+        else:
+            raise ValueError(f"Unsupported filter operator: {self.operator}")
+
+
+@dataclass(frozen=True)
+class And(Filter):
+    """Matches the documents matching all the expressions."""
+
+    children: Tuple[Filter, ...]
+
+    def attributes(self) -> Set[str]:
+        return set().union(*(child.attributes() for child in self.children))
+
+    def _parts(self) -> Iterator[Union[str, "_Slot"]]:
+        yield from _join_parts(self.children, " AND ", wrap=Or)
+
+
+@dataclass(frozen=True)
+class Or(Filter):
+    """Matches the documents matching at least one of the expressions."""
+
+    children: Tuple[Filter, ...]
+
+    def attributes(self) -> Set[str]:
+        return set().union(*(child.attributes() for child in self.children))
+
+    def _parts(self) -> Iterator[Union[str, "_Slot"]]:
+        yield from _join_parts(self.children, " OR ", wrap=And)
+
+
+@dataclass(frozen=True)
+class Not(Filter):
+    """Matches the documents not matching the expression."""
+
+    child: Filter
+
+    def attributes(self) -> Set[str]:
+        return self.child.attributes()
+
+    def _parts(self) -> Iterator[Union[str, "_Slot"]]:
+        if isinstance(self.child, Condition):
+            yield "NOT "
+            yield from self.child._parts()
+        else:
+            yield "NOT ("
+            yield from self.child._parts()
+            yield ")"
+
+
+class Attribute:
+    """
+    Builds conditions on a filterable attribute with Python operators:
+    `Attribute("age") >= 18`, `Attribute("city").one_of(["Paris", "Lyon"])`...
+    Values can be strings, numbers, booleans, or a `Param`.
+
+    Args:
+        name (str): The attribute name, dotted for nested attributes
+    """
+
+    def __init__(self, name: str) -> None:
+        if not _ATTRIBUTE_RE.match(name):
+            raise ValueError(f"Invalid filter attribute: {name!r}")
+        self.name = name
+
+    def __eq__(self, value: Any) -> Condition:  # ty: ignore
+        return Condition(self.name, "=", value)
+
+    def __ne__(self, value: Any) -> Condition:  # ty: ignore
+        return Condition(self.name, "!=", value)
+
+    def __gt__(self, value: Any) -> Condition:
+        return Condition(self.name, ">", value)
+
+    def __ge__(self, value: Any) -> Condition:
+        return Condition(self.name, ">=", value)
+
+    def __lt__(self, value: Any) -> Condition:
+        return Condition(self.name, "<", value)
+
+    def __le__(self, value: Any) -> Condition:
+        return Condition(self.name, "<=", value)
+
+    __hash__ = None  # ty: ignore
+
+    def one_of(self, values: Union[Iterable[Any], Param]) -> Condition:
+        """Matches any of the values."""
+        return Condition(self.name, "IN", _freeze(values))
+
+    def none_of(self, values: Union[Iterable[Any], Param]) -> Condition:
+        """Matches none of the values."""
+        return Condition(self.name, "NOT IN", _freeze(values))
+
+    def between(self, low: Any, high: Any) -> Condition:
+        """Matches the values between `low` and `high`, both included."""
+        return Condition(self.name, "TO", (low, high))
+
+    def exists(self) -> Condition:
+        """Matches the documents having the attribute, even if null or empty."""
+        return Condition(self.name, "EXISTS")
+
+    def is_null(self) -> Condition:
+        """Matches the documents where the attribute is null."""
+        return Condition(self.name, "IS NULL")
+
+    def is_empty(self) -> Condition:
+        """Matches the documents where the attribute is an empty string, list, or object."""
+        return Condition(self.name, "IS EMPTY")
+
+
+@dataclass(frozen=True)
+class BoundFilter:
+    """
+    An expression with the values of its parameters, as accepted by `search`.
+
+    Args:
+        expression (Filter): The filter expression
+        params (Dict[str, Any]): The values of its `Param` placeholders
+    """
+
+    expression: Filter
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    def attributes(self) -> Set[str]:
+        """Returns the names of the attributes used by the expression."""
+        return self.expression.attributes()
+
+    def render(self) -> str:
+        """Returns the filter string."""
+        return self.expression.compile().render(self.params)
+
+
+SearchFilter = Union[MeilisearchFilters, Filter, BoundFilter]
+
+
+# --------------------------------------------------
+# Templates
+# --------------------------------------------------
+@dataclass(frozen=True)
+class _Slot:
+    name: str
+    many: bool = False
+
+
+class FilterTemplate:
+    """
+    A compiled filter string, with slots for its parameters and literal values.
+
+    Args:
+        parts (Sequence[Union[str, _Slot]]): The literal strings and parameter slots
+        literals (Optional[Mapping[str, Any]]): The values of the slots that are not
+            parameters, such as the literal values of an expression. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        parts: Sequence[Union[str, _Slot]],
+        literals: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        merged: List[Union[str, _Slot]] = []
+        for part in parts:
+            if (
+                isinstance(part, str)
+                and len(merged) > 0
+                and isinstance(merged[-1], str)
+            ):
+                merged[-1] += part
+            else:
+                merged.append(part)
+        self.parts = tuple(merged)
+        self.literals = dict(literals or {})
+        self.params = {
+            part.name for part in merged if isinstance(part, _Slot)
+        } - self.literals.keys()
+
+    def with_literals(self, literals: Mapping[str, Any]) -> "FilterTemplate":
+        """Returns a copy of the template, with values for some of its slots."""
+        return FilterTemplate(self.parts, {**self.literals, **literals})
+
+    def render(self, params: Mapping[str, Any]) -> str:
+        """
+        Returns the filter string with the given parameter values.
+
+        Args:
+            params (Mapping[str, Any]): The value of each parameter
+
+        Returns:
+            str: The Meilisearch filter string
+
+        Raises:
+            ValueError: If a parameter is missing or unknown
+        """
+        if params.keys() != self.params:
+            missing = sorted(self.params - params.keys())
+            unknown = sorted(params.keys() - self.params)
+            raise ValueError(
+                f"Invalid filter parameters (missing: {missing}, unknown: {unknown})"
+            )
+        if len(self.params) == 0 and len(self.literals) == 0:
+            return "".join(self.parts)  # ty: ignore
+        values = {**self.literals, **params}
+        return "".join(
+            part
+            if isinstance(part, str)
+            else _format_values(values[part.name])
+            if part.many
+            else format_value(values[part.name])
+            for part in self.parts
+        )
+
+
+@lru_cache(maxsize=1024)
+def _compile(expression: Filter) -> FilterTemplate:
+    return FilterTemplate(list(expression._parts()))
+
+
+def _extract_literals(expression: Filter, literals: Dict[str, Any]) -> Filter:
+    """
+    Returns the shape of the expression, where each literal value is replaced
+    by a `Param` placeholder, and stores the values in `literals`.
+    """
+    if isinstance(expression, Condition):
+        if expression.operator in _UNARY_OPERATORS:
+            return expression
+        if expression.operator == "TO":
+            low, high = expression.value
+            value = (_literal_param(low, literals), _literal_param(high, literals))
+        else:
+            value = _literal_param(expression.value, literals)
+        return Condition(expression.attribute, expression.operator, value)
+    if isinstance(expression, (And, Or)):
+        return type(expression)(
+            tuple(_extract_literals(child, literals) for child in expression.children)
+        )
+    if isinstance(expression, Not):
+        return Not(_extract_literals(expression.child, literals))
+    return expression
+
+
+def _literal_param(value: Any, literals: Dict[str, Any]) -> Param:
+    if isinstance(value, Param):
+        return value
+    # Starts with a NUL character, so it can't clash with the user parameters
+    name = f"\x00{len(literals)}"
+    literals[name] = value
+    return Param(name)
+
+
+# --------------------------------------------------
+# Legacy filters
+# --------------------------------------------------
+def build_filter(filters: MeilisearchFilters) -> str:
+    """
+    Returns the filter string of the `MeilisearchFilters` keyword lists, joined with AND.
+    The template is cached by shape (keys and attributes), so only the values are formatted.
+
+    Args:
+        filters (MeilisearchFilters): The filters, as given to `search`
+
+    Returns:
+        str: The Meilisearch filter string, empty if there are no filters
+    """
+    shape: List[Tuple[str, str, int]] = []
+    params: Dict[str, Any] = {}
+    for key in _FILTER_KEYS:
+        for item in filters.get(key) or []:  # ty: ignore
+            if key in _UNARY_FILTERS:
+                shape.append((key, item, 0))
+                continue
+            attribute, value = item
+            if key == "all_of":
+                values = list(value)
+                shape.append((key, attribute, len(values)))
+                for position, item_value in enumerate(values):
+                    params[f"p{len(shape) - 1}_{position}"] = item_value
+            else:
+                shape.append((key, attribute, 1))
+                params[f"p{len(shape) - 1}"] = value
+    if len(shape) == 0:
+        return ""
+    return _compile_shape(tuple(shape)).render(params)
+
+
+@lru_cache(maxsize=1024)
+def _compile_shape(shape: Tuple[Tuple[str, str, int], ...]) -> FilterTemplate:
+    conditions: List[Filter] = []
+    for position, (key, attribute, count) in enumerate(shape):
+        operator = _FILTER_KEYS[key]
+        Attribute(attribute)  # Validates the name
+        if key in _UNARY_FILTERS:
+            conditions.append(Condition(attribute, operator))
+        elif key == "all_of":
+            conditions.extend(
+                Condition(attribute, operator, Param(f"p{position}_{index}"))
+                for index in range(count)
+            )
+        else:
+            conditions.append(Condition(attribute, operator, Param(f"p{position}")))
+    return FilterTemplate(list(And(tuple(conditions))._parts()))
+
+
+_FILTER_KEYS = {
+    "is_empty": "IS EMPTY",
+    "is_not_empty": "IS NOT EMPTY",
+    "is_null": "IS NULL",
+    "is_not_null": "IS NOT NULL",
+    "one_of": "IN",
+    "none_of": "NOT IN",
+    "all_of": "=",
+    "eq": "=",
+    "neq": "!=",
+    "gt": ">",
+    "gte": ">=",
+    "lt": "<",
+    "lte": "<=",
+}
+_UNARY_FILTERS = {"is_empty", "is_not_empty", "is_null", "is_not_null"}
+
+
+def get_filter_attributes(filters: SearchFilter) -> Set[str]:
+    """Returns the names of the attributes used by the filters."""
+    if isinstance(filters, (Filter, BoundFilter)):
+        return filters.attributes()
+    attributes = set()
+    for key in _FILTER_KEYS:
+        for item in filters.get(key) or []:  # ty: ignore
+            attributes.add(item if key in _UNARY_FILTERS else item[0])
+    return attributes
+
+
+def render_filter(filters: SearchFilter) -> str:
+    """Returns the filter string of the filters, whatever their kind."""
+    if isinstance(filters, Filter):
+        return filters.render()
+    if isinstance(filters, BoundFilter):
+        return filters.render()
+    return build_filter(filters)
+
+
+# --------------------------------------------------
+# Validation
+# --------------------------------------------------
+def check_filterable(
+    attributes: Iterable[str], filterable_attributes: Sequence[Any]
+) -> None:
+    """
+    Checks that the attributes are filterable, before sending the search.
+    A nested attribute (`address.city`) is filterable if its parent is.
+    Supports both the attribute names and the `attributePatterns` objects of the settings.
+
+    Args:
+        attributes (Iterable[str]): The attributes used by the filter
+        filterable_attributes (Sequence[Any]): The `filterableAttributes` of the settings
+
+    Raises:
+        ValueError: If an attribute is not filterable
+    """
+    patterns: List[str] = []
+    for item in filterable_attributes:
+        if isinstance(item, str):
+            patterns.append(item)
+        else:
+            patterns.extend(item.get("attributePatterns", []))
+    for attribute in attributes:
+        if not any(_matches(attribute, pattern) for pattern in patterns):
+            raise ValueError(
+                f"`{attribute}` is not in the `filterableAttributes` of the index"
+            )
+
+
+def _matches(attribute: str, pattern: str) -> bool:
+    if "*" in pattern:
+        return fnmatchcase(attribute, pattern)
+    return attribute == pattern or attribute.startswith(f"{pattern}.")
+
+
+# --------------------------------------------------
+# Values
+# --------------------------------------------------
+def format_value(value: Any) -> str:
+    """
+    Formats a value for a filter string. Strings are only quoted when needed,
+    with their backslashes and double quotes escaped.
+
+    Args:
+        value (Any): A string, number, or boolean. Other types are formatted as strings.
+
+    Returns:
+        str: The formatted value
+
+    Raises:
+        ValueError: If the value is None or not a finite number
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        if not math.isfinite(value):
+            raise ValueError(f"Invalid filter value: {value}")
+        return str(value)
+    if value is None:
+        raise ValueError("Filters can't compare to None, use `IS NULL` instead")
+    value = str(value)
+    if _SAFE_VALUE_RE.match(value) and value.upper() not in _KEYWORDS:
+        return value
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _format_values(values: Iterable[Any]) -> str:
+    return f"[{', '.join(format_value(value) for value in values)}]"
+
+
+def _value_part(value: Any) -> Union[str, _Slot]:
+    if isinstance(value, Param):
+        return _Slot(value.name)
+    return format_value(value)
+
+
+def _freeze(values: Union[Iterable[Any], Param]) -> Union[Tuple[Any, ...], Param]:
+    if isinstance(values, Param):
+        return values
+    return tuple(values)
+
+
+def _flatten(expression: Filter, kind: type) -> Tuple[Filter, ...]:
+    if isinstance(expression, kind):
+        return expression.children  # ty: ignore
+    return (expression,)
+
+
+def _join_parts(
+    children: Sequence[Filter], separator: str, wrap: type
+) -> Iterator[Union[str, _Slot]]:
+    for position, child in enumerate(children):
+        if position > 0:
+            yield separator
+        if isinstance(child, wrap):
+            yield "("
+            yield from child._parts()
+            yield ")"
+        else:
+            yield from child._parts()
@@ -1,25 +1,82 @@
 from abc import ABC, abstractmethod
+import asyncio
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+import hashlib
+from itertools import chain, islice
+import json
+import multiprocessing
+from multiprocessing.context import BaseContext
+from operator import attrgetter, itemgetter
+import re
 from typing import (
     TYPE_CHECKING,
     Any,
+    AsyncIterator,
+    Callable,
+    Deque,
     Dict,
+    Generator,
     Generic,
+    Iterable,
+    Iterator,
     List,
     Optional,
+    Sequence,
+    Set,
     Tuple,
     Type,
     TypeVar,
     Union,
 )
+from uuid import UUID, uuid4
+import warnings
 
+from asgiref.sync import sync_to_async
+import django
+from django.apps import apps
 from django.conf import settings
-from django.core.paginator import Paginator
-from django.db.models import Q, QuerySet
+from django.core.cache import caches
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, router
+from django.db.models import (
+    Case,
+    IntegerField,
+    Prefetch,
+    Q,
+    QuerySet,
+    Value,
+    When,
+    prefetch_related_objects,
+)
+from django.db.models.constants import LOOKUP_SEP
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from meilisearch import Client
+from meilisearch.errors import MeilisearchApiError
+from meilisearch.models.task import TaskInfo
 from typing_extensions import Unpack
 
+from django_meilisearch_indexer import signals
+from django_meilisearch_indexer.cache import SearchCache
+from django_meilisearch_indexer.filters import (
+    SearchFilter,
+    build_filter,
+    check_filterable,
+    get_filter_attributes,
+    render_filter,
+)
+from django_meilisearch_indexer.search import SearchInstances
+from django_meilisearch_indexer.tasks import (
+    MeilisearchTaskError,
+    TaskTracker,
+    wait_for_tasks,
+)
+from django_meilisearch_indexer.transport import get_transport
 from django_meilisearch_indexer.types import (
-    MeilisearchFilters,
+    MeilisearchFieldMap,
     MeilisearchFilterValue,
     MeilisearchSearchHits,
     MeilisearchSearchParameters,
@@ -30,22 +87,45 @@ from django_meilisearch_indexer.types import (
 if TYPE_CHECKING:
     from django.db.models import Model
 
+    from django_meilisearch_indexer.async_client import AsyncMeilisearchClient
+    from django_meilisearch_indexer.models import MeilisearchRebuild
+
 
 M = TypeVar("M", bound="Model")
 
 
 class MeilisearchModelIndexer(ABC, Generic[M]):
-    _meilisearch_client: Optional[Client] = None
+    _row_builder: Optional[
+        Tuple[Any, List[str], Callable[[Sequence[Any]], Dict[str, Any]]]
+    ] = None
 
     MODEL_CLASS: Type[M]
     PRIMARY_KEY = "id"
     SETTINGS: MeilisearchSettings
+    BATCH_SIZE = 500
+    INDEXING_CONCURRENCY = 1
+    BUILD_PROCESSES = 1
+    MAX_PAYLOAD_BYTES = 10 * 1024 * 1024
+    MAX_BATCH_DOCUMENTS: Optional[int] = None
+    FIELDS: Optional[MeilisearchFieldMap] = None
+    SELECT_RELATED: Optional[List[str]] = None
+    PREFETCH_RELATED: Optional[List[Union[str, Prefetch]]] = None
+    ONLY: Optional[List[str]] = None
+    DEBUG_QUERIES = False
+    UPDATED_AT_FIELD: Optional[str] = None
+    SYNC_OVERLAP = timedelta(minutes=1)
+    DOCUMENT_HASH_CACHE: Optional[str] = None
+    SEARCH_CACHE: Optional[SearchCache] = None
+    VALIDATE_FILTERS = True
+    REBUILD_CHECKPOINT_ROWS = 10_000
+    REBUILD_CONCURRENCY = 1
+    TASK_TIMEOUT = timedelta(minutes=10)
 
     @classmethod
-    @abstractmethod
     def build_object(cls, instance: M) -> Dict[str, Any]:
         """
-        Required. Should return the object to be indexed.
+        Required unless `FIELDS` is set. Should return the object to be indexed.
+        By default, builds the object from the `FIELDS` map.
 
         Args:
             instance (M): A model instance
@@ -53,6 +133,41 @@ class MeilisearchModelIndexer(ABC, Generic[M]):
         Returns:
             Dict[str, Any]: A dictionary representing the object to be indexed
         """
+        if cls.FIELDS is None:
+            raise NotImplementedError(
+                f"{cls.__name__} must either implement `build_object` or set `FIELDS`"
+            )
+        obj = {}
+        for key, source in cls.FIELDS.items():
+            path, transform = (source, None) if isinstance(source, str) else source
+            value = _get_path_value(instance, path)
+            obj[key] = value if transform is None else transform(value)
+        return obj
+
+    @classmethod
+    def build_fields(cls, instance: M, fields: List[str]) -> Dict[str, Any]:
+        """
+        Returns the given fields of the object to be indexed, used for partial updates.
+        By default, only builds these fields from the `FIELDS` map if it is set,
+        and otherwise picks them from `build_object`.
+
+        Args:
+            instance (M): A model instance
+            fields (List[str]): The document fields to build, including the primary key
+
+        Returns:
+            Dict[str, Any]: A dictionary with the given fields of the object
+        """
+        if cls.FIELDS is None:
+            obj = cls.build_object(instance)
+            return {key: obj[key] for key in fields if key in obj}
+        obj = {}
+        for key in fields:
+            source = cls.FIELDS[key]
+            path, transform = (source, None) if isinstance(source, str) else source
+            value = _get_path_value(instance, path)
+            obj[key] = value if transform is None else transform(value)
+        return obj
 
     @classmethod
     @abstractmethod
@@ -64,6 +179,18 @@ class MeilisearchModelIndexer(ABC, Generic[M]):
             str: The name of the index
         """
 
+    @classmethod
+    def get_queryset(cls) -> QuerySet[M]:
+        """
+        Returns the base queryset used by the indexing methods.
+        Can be overridden to filter or annotate the rows. Defaults to all the instances
+        of `MODEL_CLASS` with the `SELECT_RELATED`, `PREFETCH_RELATED`, and `ONLY` options.
+
+        Returns:
+            QuerySet[M]: The base queryset
+        """
+        return cls._apply_queryset_options(cls.MODEL_CLASS.objects.all())
+
     # --------------------------------------------------
     # Index management
     # --------------------------------------------------
@@ -73,72 +200,439 @@ class MeilisearchModelIndexer(ABC, Generic[M]):
         try:
             cls.meilisearch_client().get_index(cls.index_name())
             return True
-        except Exception:  # noqa
-            return False
+        except MeilisearchApiError as error:
+            if error.code == "index_not_found":
+                return False
+            raise
 
     @classmethod
-    def maybe_create_index(cls) -> None:
-        """Creates the index if it doesn't exist."""
-        client = cls.meilisearch_client()
-        if not cls.index_exists():
-            client.create_index(cls.index_name(), {"primaryKey": cls.PRIMARY_KEY})
-        cls.update_settings()
+    def maybe_create_index(cls) -> TaskTracker:
+        """
+        Creates the index if it doesn't exist, and updates its settings.
+        Only the settings that differ from the current ones are sent,
+        so nothing is enqueued when they are already up to date.
+        """
+        return cls._sync_index()
 
     @classmethod
-    def update_settings(cls) -> None:
+    def update_settings(cls) -> TaskTracker:
         """Updates the index settings."""
-        cls.meilisearch_client().index(cls.index_name()).update_settings(cls.SETTINGS)
+        index = cls.meilisearch_client().index(cls.index_name())
+        return TaskTracker([index.update_settings(cls.SETTINGS)])
+
+    @classmethod
+    def get_settings_diff(cls, current: Dict[str, Any]) -> MeilisearchSettings:
+        """
+        Returns the `SETTINGS` that differ from the current settings of the index.
+        Lists that Meilisearch treats as sets (like `filterableAttributes`) are compared
+        regardless of their order, and objects that are merged on update
+        (like `typoTolerance`) only need their given keys to match.
+
+        Args:
+            current (Dict[str, Any]): The settings returned by Meilisearch
+
+        Returns:
+            MeilisearchSettings: The settings to send, empty if they are up to date
+        """
+        return {
+            key: value
+            for key, value in cls.SETTINGS.items()
+            if not _is_same_setting(key, current.get(key), value)
+        }  # ty: ignore
 
     # --------------------------------------------------
     # Indexing
     # --------------------------------------------------
     @classmethod
-    def index(cls, instance: M) -> None:
+    def index(cls, instance: M) -> TaskTracker:
         """Builds and indexes a single model instance."""
-        cls.index_multiple([instance])
+        return cls.index_multiple([instance])
 
     @classmethod
-    def index_multiple(cls, instances: Union[List[M], QuerySet[M]]) -> None:
-        """Builds and indexes multiple model instances."""
-        objects = [cls.build_object(instance) for instance in instances]
-        cls.meilisearch_client().index(cls.index_name()).add_documents(objects)
+    def index_multiple(cls, instances: Union[List[M], QuerySet[M]]) -> TaskTracker:
+        """
+        Builds and indexes multiple model instances.
+        Querysets are streamed and the objects are sent in payloads of `MAX_PAYLOAD_BYTES`.
+        """
+        if isinstance(instances, QuerySet):
+            instances = cls._apply_queryset_options(instances)
+            if cls.FIELDS is not None:
+                paths, build_row = cls._get_row_builder()
+                rows = instances.values_list(*paths)
+                rows = rows.iterator(chunk_size=cls.BATCH_SIZE)
+                objects = (build_row(row) for row in rows)
+                return cls._add_documents(objects, cls.index_name())
+            instances = instances.iterator(chunk_size=cls.BATCH_SIZE)
+        else:
+            cls._prefetch_related_objects(instances)
+        iterator = iter(instances)
+        chunks = iter(lambda: list(islice(iterator, cls.BATCH_SIZE)), [])
+        if cls.BUILD_PROCESSES > 1:
+            batches = cls._build_in_processes(_build_objects, chunks)
+        else:
+            batches = (cls._build_batch(chunk) for chunk in chunks)
+        return cls._add_documents(chain.from_iterable(batches), cls.index_name())
 
     @classmethod
-    def index_from_query(cls, query: Q) -> None:
+    def index_fields(
+        cls, instances: Union[List[M], QuerySet[M]], fields: List[str]
+    ) -> TaskTracker:
+        """
+        Partially updates the documents of the given instances with only the given fields,
+        using `update_documents`: the other fields of the documents are left untouched.
+        With `FIELDS`, querysets are built from `values_list` rows of the needed columns only.
+
+        Args:
+            instances (Union[List[M], QuerySet[M]]): The instances to update
+            fields (List[str]): The document fields to send. The primary key is always sent.
+        """
+        fields = cls._get_partial_fields(fields)
+        if isinstance(instances, QuerySet):
+            instances = cls._apply_queryset_options(instances)
+            if cls.FIELDS is not None:
+                paths, build_row = cls._get_row_builder(fields)
+                rows = instances.values_list(*paths)
+                rows = rows.iterator(chunk_size=cls.BATCH_SIZE)
+                objects = (build_row(row) for row in rows)
+                return cls._add_documents(objects, cls.index_name(), partial=True)
+            instances = instances.iterator(chunk_size=cls.BATCH_SIZE)
+        else:
+            cls._prefetch_related_objects(instances)
+        objects = (cls.build_fields(instance, fields) for instance in instances)
+        return cls._add_documents(objects, cls.index_name(), partial=True)
+
+    @classmethod
+    def index_from_query(cls, query: Q) -> TaskTracker:
         """Builds and indexes all the instances of the model matching the query."""
-        cls._index_from_query(query, cls.index_name())
+        return cls._index_from_query(query, cls.index_name())
 
     @classmethod
-    def index_all(cls) -> None:
+    def index_all(cls) -> TaskTracker:
         """Builds and indexes all the instances of the model."""
-        cls._index_from_query(Q(), cls.index_name())
+        return cls._index_from_query(Q(), cls.index_name())
 
     @classmethod
-    def index_all_atomically(cls) -> None:
+    def index_all_atomically(cls) -> TaskTracker:
         """
         Builds and indexes all the instances of the model atomically.
         It will build another index and swap it with the current one once it's ready.
+        The rows are sent by chunks of `REBUILD_CHECKPOINT_ROWS`, up to `REBUILD_CONCURRENCY`
+        at once, and the indexes are only swapped once all their tasks succeeded.
+        With `django_meilisearch_indexer` in `INSTALLED_APPS`, a checkpoint is stored once
+        the tasks of each chunk succeeded, so an interrupted rebuild can be continued
+        with `resume_rebuild` or cleaned up with `abort_rebuild`.
+        Otherwise, the temporary index is deleted on error.
+
+        Returns:
+            TaskTracker: The tasks swapping the indexes and deleting the temporary one
         """
+        rebuild_id = uuid4()
+        if not apps.is_installed("django_meilisearch_indexer"):
+            tmp_index_name = cls._create_tmp_index(rebuild_id)
+            try:
+                start, task_uids = None, []
+                while True:
+                    queries, start = cls._get_rebuild_chunks(start)
+                    task_uids += cls._index_chunks(queries, tmp_index_name)[0]
+                    if start is None:
+                        break
+                cls._wait_for_tasks(task_uids)
+            except BaseException:
+                cls.meilisearch_client().delete_index(tmp_index_name)
+                raise
+            return cls._swap_tmp_index(tmp_index_name)
+
+        from django_meilisearch_indexer.models import MeilisearchRebuild
+
+        rebuild = MeilisearchRebuild.objects.create(
+            rebuild_id=rebuild_id,
+            index_name=cls.index_name(),
+            tmp_index_name=cls._get_tmp_index_name(rebuild_id),
+        )
+        cls._create_tmp_index(rebuild_id)
+        return cls._run_rebuild(rebuild)
+
+    @classmethod
+    def resume_rebuild(cls) -> bool:
+        """
+        Continues the latest interrupted `index_all_atomically` from its last checkpoint,
+        then swaps the indexes. The chunk sent before the interruption is only sent again
+        if its tasks did not succeed. Requires `django_meilisearch_indexer` in `INSTALLED_APPS`.
+
+        Returns:
+            bool: Whether there was a rebuild to resume
+        """
+        from django_meilisearch_indexer.models import MeilisearchRebuild
+
+        rebuild = (
+            MeilisearchRebuild.objects.filter(
+                index_name=cls.index_name(), status=MeilisearchRebuild.Status.RUNNING
+            )
+            .order_by("-created_at", "-pk")
+            .first()
+        )
+        if rebuild is None:
+            return False
         client = cls.meilisearch_client()
-        # Create temporary index
-        tmp_index_name = f"{cls.index_name()}_tmp"
-        client.create_index(tmp_index_name, {"primaryKey": cls.PRIMARY_KEY})
-        client.index(tmp_index_name).update_settings(cls.SETTINGS)
-        # Index all objects on it
-        cls._index_from_query(Q(), tmp_index_name)
-        # Swap indexes and cleanup
-        client.swap_indexes([{"indexes": [cls.index_name(), tmp_index_name]}])
-        client.delete_index(tmp_index_name)
+        try:
+            client.get_index(rebuild.tmp_index_name)
+        except MeilisearchApiError as error:
+            if error.code != "index_not_found":
+                raise
+            # The checkpoints are meaningless without their index
+            rebuild.confirmed_pk, rebuild.last_pk = None, None
+            rebuild.task_uids, rebuild.indexed_rows = [], 0
+            cls._create_tmp_index(rebuild.rebuild_id)
+        cls._run_rebuild(rebuild)
+        return True
 
     @classmethod
-    def unindex(cls, id_: int) -> None:
+    def abort_rebuild(cls) -> List[str]:
+        """
+        Deletes the temporary indexes of the unfinished rebuilds of the index,
+        including the ones left by crashed runs, and marks their checkpoints as aborted.
+        It must not be called while a rebuild is running.
+
+        Returns:
+            List[str]: The names of the deleted indexes
+        """
+        client = cls.meilisearch_client()
+        pattern = re.compile(rf"{re.escape(cls.index_name())}_tmp(_[0-9a-f]{{32}})?")
+        names = sorted(
+            name for name in _get_index_names(client) if pattern.fullmatch(name)
+        )
+        for name in names:
+            client.delete_index(name)
+        if apps.is_installed("django_meilisearch_indexer"):
+            from django_meilisearch_indexer.models import MeilisearchRebuild
+
+            MeilisearchRebuild.objects.filter(
+                index_name=cls.index_name(), status=MeilisearchRebuild.Status.RUNNING
+            ).update(status=MeilisearchRebuild.Status.ABORTED)
+        return names
+
+    @classmethod
+    def index_changed_since(cls, since: datetime) -> TaskTracker:
+        """Builds and indexes the instances whose `UPDATED_AT_FIELD` is after the given date."""
+        return cls._index_from_query(
+            cls._get_changed_since_query(since), cls.index_name()
+        )
+
+    @classmethod
+    def sync_incremental(cls) -> datetime:
+        """
+        Indexes the instances modified since the previous call, waits up to `TASK_TIMEOUT`
+        for the tasks, then stores the new watermark once they all succeeded.
+        The first call indexes all the instances. Each run goes back `SYNC_OVERLAP` before
+        the stored watermark to catch rows written by late transactions or skewed clocks.
+        Deleted rows are not detected: unindex them separately.
+
+        Returns:
+            datetime: The new watermark, taken before the rows were read
+
+        Raises:
+            MeilisearchTaskError: If one of the tasks failed, in which case
+                the watermark is not stored and the next call sends the rows again
+            MeilisearchTimeoutError: If some tasks are still pending after `TASK_TIMEOUT`
+        """
+        # The watermark requires `django_meilisearch_indexer` in `INSTALLED_APPS`
+        from django_meilisearch_indexer.models import MeilisearchSyncState
+
+        synced_at = timezone.now()
+        state = MeilisearchSyncState.objects.filter(index_name=cls.index_name()).first()
+        since = None if state is None else state.synced_at - cls.SYNC_OVERLAP
+        query = cls._get_changed_since_query(since)
+        cls._index_from_query(query, cls.index_name()).wait(cls.TASK_TIMEOUT)
+        MeilisearchSyncState.objects.update_or_create(
+            index_name=cls.index_name(), defaults={"synced_at": synced_at}
+        )
+        return synced_at
+
+    @classmethod
+    def unindex(cls, id_: int) -> TaskTracker:
         """Deletes from the index the object corresponding to the given id."""
-        cls.unindex_multiple([id_])
+        return cls.unindex_multiple([id_])
 
     @classmethod
-    def unindex_multiple(cls, ids: Union[List[int], List[str]]) -> None:
+    def unindex_multiple(cls, ids: Union[List[int], List[str]]) -> TaskTracker:
         """Deletes from the index the objects corresponding to the given ids."""
-        cls.meilisearch_client().index(cls.index_name()).delete_documents(ids)
+        task = cls.meilisearch_client().index(cls.index_name()).delete_documents(ids)
+        tracker = TaskTracker([task])
+        cls._invalidate_search_cache(tracker)
+        cls._forget_hashes(ids)
+        return tracker
+
+    @classmethod
+    def unindex_by_filter(cls, filters: SearchFilter) -> TaskTracker:
+        """
+        Deletes from the index the documents matching the filters, in a single request
+        to the delete-by-filter endpoint, without loading their ids.
+        The filtered attributes must be in the `filterableAttributes` of `SETTINGS`.
+        As the deleted ids are unknown, all the digests of `DOCUMENT_HASH_CACHE` are forgotten.
+
+        Args:
+            filters (SearchFilter): The filters, as keyword lists or a `Filter` expression,
+                like for `search`
+
+        Raises:
+            ValueError: If the filters are empty, as they would match every document
+        """
+        filter_ = cls._compile_search_filter(filters)
+        if filter_ is None:
+            raise ValueError("Empty filters would delete every document of the index")
+        index = cls.meilisearch_client().index(cls.index_name())
+        tracker = TaskTracker([index.delete_documents(filter=filter_)])
+        cls._invalidate_search_cache(tracker)
+        cls.clear_document_hashes()
+        return tracker
+
+    @classmethod
+    def unindex_from_query(cls, query: Q) -> TaskTracker:
+        """
+        Deletes from the index the documents of the rows matching the query.
+        The rows are read from the default manager rather than `get_queryset`,
+        so rows that are filtered out of the index can still be matched.
+        Their primary keys are streamed in batches of `BATCH_SIZE` with a primary key cursor,
+        and each batch is deleted with its own request.
+        """
+        tracker = TaskTracker()
+        index = cls.meilisearch_client().index(cls.index_name())
+        queryset = cls.MODEL_CLASS._default_manager.filter(query).values_list(
+            "pk", flat=True
+        )
+        for ids in cls._iter_batches(queryset, pk_getter=lambda pk: pk):
+            tracker.add(index.delete_documents(ids))
+            cls._forget_hashes(ids)
+        if len(tracker) > 0:
+            cls._invalidate_search_cache(tracker)
+        return tracker
+
+    @classmethod
+    def clear_document_hashes(cls) -> None:
+        """
+        Forgets the digests stored in `DOCUMENT_HASH_CACHE`, so the next indexing
+        sends every document again. Call it when the index is modified by other means.
+        """
+        if cls.DOCUMENT_HASH_CACHE is not None:
+            generation_key = f"django_meilisearch_indexer:{cls.index_name()}:generation"
+            caches[cls.DOCUMENT_HASH_CACHE].set(generation_key, uuid4().hex)
+
+    @classmethod
+    def sync_multiple(cls, ids: Union[List[int], List[str]]) -> TaskTracker:
+        """
+        Indexes the given ids that match `get_queryset` and unindexes the others.
+        Useful when the ids come from changes that may have deleted or filtered out some rows.
+        """
+        tracker = TaskTracker()
+        queryset = cls.get_queryset().filter(pk__in=ids)
+        existing_ids = set(queryset.values_list("pk", flat=True))
+        if len(existing_ids) > 0:
+            tracker.add(cls.index_from_query(Q(pk__in=existing_ids)))
+        missing_ids = [id_ for id_ in ids if id_ not in existing_ids]
+        if len(missing_ids) > 0:
+            tracker.add(cls.unindex_multiple(missing_ids))
+        return tracker
+
+    @classmethod
+    def sync_fields(
+        cls, ids: Union[List[int], List[str]], fields: List[str]
+    ) -> TaskTracker:
+        """
+        Like `sync_multiple`, but only sends the given fields of the existing ids
+        with `index_fields`, for the rows whose document is already in the index.
+        The other rows are indexed with `index_from_query`, as a partial update
+        would create documents with only the given fields.
+        """
+        tracker = TaskTracker()
+        queryset = cls.get_queryset().filter(pk__in=ids)
+        existing_ids = set(queryset.values_list("pk", flat=True))
+        if len(existing_ids) > 0 and len(fields) > 0:
+            indexed_ids = cls._get_indexed_ids(existing_ids)
+            if len(indexed_ids) > 0:
+                tracker.add(
+                    cls.index_fields(queryset.filter(pk__in=indexed_ids), fields)
+                )
+            new_ids = existing_ids - indexed_ids
+            if len(new_ids) > 0:
+                tracker.add(cls.index_from_query(Q(pk__in=new_ids)))
+        missing_ids = [id_ for id_ in ids if id_ not in existing_ids]
+        if len(missing_ids) > 0:
+            tracker.add(cls.unindex_multiple(missing_ids))
+        return tracker
+
+    @classmethod
+    def get_document_fields(cls, model_fields: Iterable[str]) -> Optional[List[str]]:
+        """
+        Returns the document fields computed from the given model fields,
+        such as the `update_fields` given to `save()`. Relations are followed from their
+        first field, so `"user"` matches `"user__email"`.
+
+        Args:
+            model_fields (Iterable[str]): Names or attnames of `MODEL_CLASS` fields
+
+        Returns:
+            Optional[List[str]]: The document fields, or None if `FIELDS` is not set
+        """
+        if cls.FIELDS is None:
+            return None
+        opts = cls.MODEL_CLASS._meta  # ty: ignore
+        names = {opts.get_field(name).name for name in model_fields}
+        document_fields = []
+        for key, source in cls.FIELDS.items():
+            path = source if isinstance(source, str) else source[0]
+            name = path.split(LOOKUP_SEP, 1)[0]
+            if name == "pk" or name == opts.pk.name:
+                continue
+            if name in names:
+                document_fields.append(key)
+        return document_fields
+
+    @classmethod
+    def enqueue_index(cls, ids: Union[List[int], List[str]]) -> None:
+        """
+        Writes outbox entries to index the given ids later, with `outbox.drain_outbox`.
+        Inside a transaction, the entries are only committed with it.
+        """
+        # The outbox requires `django_meilisearch_indexer` in `INSTALLED_APPS`
+        from django_meilisearch_indexer import outbox
+        from django_meilisearch_indexer.models import MeilisearchOutboxEntry
+
+        outbox.enqueue(cls, ids, MeilisearchOutboxEntry.Operation.INDEX)
+
+    @classmethod
+    def enqueue_unindex(cls, ids: Union[List[int], List[str]]) -> None:
+        """
+        Writes outbox entries to unindex the given ids later, with `outbox.drain_outbox`.
+        Inside a transaction, the entries are only committed with it.
+        """
+        # The outbox requires `django_meilisearch_indexer` in `INSTALLED_APPS`
+        from django_meilisearch_indexer import outbox
+        from django_meilisearch_indexer.models import MeilisearchOutboxEntry
+
+        outbox.enqueue(cls, ids, MeilisearchOutboxEntry.Operation.UNINDEX)
+
+    @classmethod
+    def connect_signals(
+        cls, use_outbox: bool = False, use_update_fields: bool = False
+    ) -> None:
+        """
+        Automatically indexes the instances of `MODEL_CLASS` when they are saved or deleted.
+        Changes made inside a transaction are collected and sent once it is committed,
+        as a single `index_from_query` and a single `unindex_multiple`.
+
+        Args:
+            use_outbox (bool): Whether to write outbox entries in the same transaction instead,
+                to be applied later by `outbox.drain_outbox`. Defaults to False.
+            use_update_fields (bool): Whether saves with `update_fields` should only send
+                the matching document fields with `sync_fields`. Requires `FIELDS`.
+                Defaults to False.
+        """
+        signals.connect(cls, use_outbox=use_outbox, use_update_fields=use_update_fields)
+
+    @classmethod
+    def disconnect_signals(cls) -> None:
+        """Stops the automatic indexing enabled by `connect_signals`."""
+        signals.disconnect(cls)
 
     # --------------------------------------------------
     # Searching
@@ -148,7 +642,7 @@ class MeilisearchModelIndexer(ABC, Generic[M]):
         cls,
         query: str = "",
         only_hits: bool = False,
-        filters: Optional[MeilisearchFilters] = None,
+        filters: Optional[SearchFilter] = None,
         **params: Unpack[MeilisearchSearchParameters],
     ) -> Union[MeilisearchSearchHits, MeilisearchSearchResults]:
         """
@@ -157,51 +651,1112 @@ class MeilisearchModelIndexer(ABC, Generic[M]):
         Args:
             query (str): The text to search in the searchable fields. Defaults to "".
             only_hits (bool, optional): Whether to return only the hits. Defaults to False.
-            filters (MeilisearchFilters, optional): The various extra filters to apply. Defaults to None.
+            filters (SearchFilter, optional): The filters to apply, as keyword lists or a `Filter`
+                expression. Defaults to None.
 
         Returns:
             Union[MeilisearchSearchHits, MeilisearchSearchResults]: Either the complete results or only the hits.
         """
-        filters = filters or {}  # ty: ignore
-        params["filter"] = cls._build_search_filter(**filters) or None
-        response: MeilisearchSearchResults = (
-            cls.meilisearch_client().index(cls.index_name()).search(query, params)
-        )
+        params["filter"] = cls._compile_search_filter(filters)
+        if cls.SEARCH_CACHE is None:
+            response: MeilisearchSearchResults = (
+                cls.meilisearch_search_client()
+                .index(cls.index_name())
+                .search(query, params)
+            )
+        else:
+            response = cls._cached_search(cls.SEARCH_CACHE, query, dict(params))
         if only_hits:
             return {"hits": response["hits"]}  # ty: ignore
         return response
 
+    @classmethod
+    def search_queryset(
+        cls,
+        query: str = "",
+        filters: Optional[SearchFilter] = None,
+        queryset: Optional[QuerySet[M]] = None,
+        **params: Unpack[MeilisearchSearchParameters],
+    ) -> QuerySet[M]:
+        """
+        Performs a search and returns the matching rows, ordered by ranking.
+        Only the primary keys are retrieved from Meilisearch, and the returned
+        queryset can still be filtered or annotated before being evaluated.
+
+        Args:
+            query (str): The text to search in the searchable fields. Defaults to "".
+            filters (SearchFilter, optional): The filters to apply, as keyword lists or a `Filter`
+                expression. Defaults to None.
+            queryset (QuerySet[M], optional): The queryset to fetch the rows from,
+                for example with `select_related`. Defaults to all the rows of the model.
+
+        Returns:
+            QuerySet[M]: The rows of the hits, in ranking order
+        """
+        queryset = cls._get_search_queryset(queryset)
+        params.setdefault("attributesToRetrieve", [cls.PRIMARY_KEY])
+        results: MeilisearchSearchResults = cls.search(  # ty: ignore
+            query, filters=filters, **params
+        )
+        ids = cls._get_hit_ids(results)
+        if len(ids) == 0:
+            return queryset.none()
+        ranking = Case(
+            *(When(pk=id_, then=Value(rank)) for rank, id_ in enumerate(ids)),
+            output_field=IntegerField(),
+        )
+        return queryset.filter(pk__in=ids).order_by(ranking)
+
+    @classmethod
+    def search_instances(
+        cls,
+        query: str = "",
+        filters: Optional[SearchFilter] = None,
+        queryset: Optional[QuerySet[M]] = None,
+        **params: Unpack[MeilisearchSearchParameters],
+    ) -> SearchInstances[M]:
+        """
+        Returns a lazy list of the instances matching the search, ordered by ranking.
+        It also gives access to `total_hits`, `facet_distribution`, and `facet_stats`.
+
+        Args:
+            query (str): The text to search in the searchable fields. Defaults to "".
+            filters (SearchFilter, optional): The filters to apply, as keyword lists or a `Filter`
+                expression. Defaults to None.
+            queryset (QuerySet[M], optional): The queryset to fetch the rows from,
+                for example with `select_related`. Defaults to all the rows of the model.
+
+        Returns:
+            SearchInstances[M]: The lazy instances of the hits
+        """
+        params.setdefault("attributesToRetrieve", [cls.PRIMARY_KEY])
+        return SearchInstances(
+            cls, cls._get_search_queryset(queryset), query, filters, params
+        )
+
+    @classmethod
+    def iter_search(
+        cls,
+        query: str = "",
+        filters: Optional[SearchFilter] = None,
+        page_size: int = 1000,
+        **params: Unpack[MeilisearchSearchParameters],
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Lazily yields all the hits of the search, in ranking order, fetching them
+        by pages of `page_size` while the next page is prefetched in a thread.
+        Searches can't go past the `pagination.maxTotalHits` setting of the index:
+        use `iter_documents` when the ranking is not needed. `SEARCH_CACHE` is not used.
+
+        Args:
+            query (str): The text to search in the searchable fields. Defaults to "".
+            filters (SearchFilter, optional): The filters to apply, as keyword lists or a `Filter`
+                expression. Defaults to None.
+            page_size (int): The number of hits per request. Defaults to 1,000.
+
+        Yields:
+            Dict[str, Any]: The next hit
+        """
+        params["filter"] = cls._compile_search_filter(filters)
+        for key in ("offset", "limit", "page", "hitsPerPage"):
+            params.pop(key, None)
+        index = cls.meilisearch_search_client().index(cls.index_name())
+
+        def fetch_page(offset: int) -> List[Dict[str, Any]]:
+            page_params = {**params, "offset": offset, "limit": page_size}
+            return index.search(query, page_params)["hits"]
+
+        return _iter_prefetched_pages(fetch_page, page_size)
+
+    @classmethod
+    def iter_documents(
+        cls,
+        filters: Optional[SearchFilter] = None,
+        fields: Optional[List[str]] = None,
+        page_size: int = 1000,
+        ids: Optional[Iterable[Any]] = None,
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Lazily yields all the documents of the index matching the filters, fetching them
+        from the documents endpoint by pages of `page_size` while the next page
+        is prefetched in a thread. Unlike searches, it is not limited by `maxTotalHits`.
+        The documents are in the internal order of Meilisearch.
+
+        Args:
+            filters (SearchFilter, optional): The filters to apply, as keyword lists or a `Filter`
+                expression. Defaults to None.
+            fields (List[str], optional): The fields to retrieve. Defaults to all of them.
+            page_size (int): The number of documents per request. Defaults to 1,000.
+            ids (Iterable[Any], optional): Only fetch the documents with these ids,
+                which requires Meilisearch 1.12. Defaults to None.
+
+        Yields:
+            Dict[str, Any]: The next document
+        """
+        base_params: Dict[str, Any] = {"limit": page_size}
+        filter_ = cls._compile_search_filter(filters)
+        if filter_ is not None:
+            base_params["filter"] = filter_
+        if fields is not None:
+            base_params["fields"] = fields
+        if ids is not None:
+            base_params["ids"] = [str(id_) for id_ in ids]
+        index = cls.meilisearch_search_client().index(cls.index_name())
+        # Posted directly, as the `Document` wrappers of `get_documents` vary across SDK versions
+        path = f"{index.config.paths.index}/{index.uid}/{index.config.paths.document}/fetch"
+
+        def fetch_page(offset: int) -> List[Dict[str, Any]]:
+            return index.http.post(path, {**base_params, "offset": offset})["results"]
+
+        return _iter_prefetched_pages(fetch_page, page_size)
+
+    # --------------------------------------------------
+    # Async
+    # --------------------------------------------------
+    @classmethod
+    async def aindex_exists(cls) -> bool:
+        """Async version of `index_exists`."""
+        try:
+            await cls.async_meilisearch_client().get_index(cls.index_name())
+            return True
+        except MeilisearchApiError as error:
+            if error.code == "index_not_found":
+                return False
+            raise
+
+    @classmethod
+    async def amaybe_create_index(cls) -> TaskTracker:
+        """Async version of `maybe_create_index`."""
+        client = cls.async_meilisearch_client()
+        try:
+            current = await client.get_settings(cls.index_name())
+        except MeilisearchApiError as error:
+            if error.code != "index_not_found":
+                raise
+            options = {"primaryKey": cls.PRIMARY_KEY}
+            task = await client.create_index(cls.index_name(), options)
+            return TaskTracker([task]).add(await cls.aupdate_settings())
+        diff = cls.get_settings_diff(current)
+        if len(diff) == 0:
+            return TaskTracker()
+        return TaskTracker([await client.update_settings(cls.index_name(), diff)])
+
+    @classmethod
+    async def aupdate_settings(cls) -> TaskTracker:
+        """Async version of `update_settings`."""
+        task = await cls.async_meilisearch_client().update_settings(
+            cls.index_name(), cls.SETTINGS
+        )
+        return TaskTracker([task])
+
+    @classmethod
+    async def aindex_multiple(
+        cls, instances: Union[List[M], QuerySet[M]]
+    ) -> TaskTracker:
+        """
+        Async version of `index_multiple`.
+        Querysets are streamed with `aiterator`. Model instances are built in batches
+        through `sync_to_async`, as `build_object` may use the ORM, while `FIELDS` rows
+        and the JSON encoding run on a worker thread, to keep the CPU work
+        off the event loop. `BUILD_PROCESSES` is not used.
+        """
+        if isinstance(instances, QuerySet):
+            batches = cls._aiter_object_batches(instances)
+        else:
+            batches = _aiter_one(await sync_to_async(cls._build_instances)(instances))
+        return await cls._aadd_documents(batches, cls.index_name())
+
+    @classmethod
+    async def aindex_from_query(cls, query: Q) -> TaskTracker:
+        """Async version of `index_from_query`."""
+        queryset = cls.get_queryset().filter(query).order_by("pk")
+        batches = cls._aiter_object_batches(queryset)
+        return await cls._aadd_documents(batches, cls.index_name())
+
+    @classmethod
+    async def aunindex_multiple(cls, ids: Union[List[int], List[str]]) -> TaskTracker:
+        """Async version of `unindex_multiple`."""
+        client = cls.async_meilisearch_client()
+        tracker = TaskTracker([await client.delete_documents(cls.index_name(), ids)])
+        if cls.SEARCH_CACHE is not None:
+            await cls.SEARCH_CACHE.abump_version(cls.index_name())
+            tracker.add_done_callback(cls._invalidate_search_cache)
+        if cls.DOCUMENT_HASH_CACHE is not None:
+            await sync_to_async(cls._forget_hashes)(ids)
+        return tracker
+
+    @classmethod
+    async def asearch(
+        cls,
+        query: str = "",
+        only_hits: bool = False,
+        filters: Optional[SearchFilter] = None,
+        **params: Unpack[MeilisearchSearchParameters],
+    ) -> Union[MeilisearchSearchHits, MeilisearchSearchResults]:
+        """
+        Async version of `search`, with the same arguments.
+        Uses the async methods of `SEARCH_CACHE`.
+        """
+        params["filter"] = cls._compile_search_filter(filters)
+        client = cls.async_meilisearch_client()
+        cache = cls.SEARCH_CACHE
+        if cache is None:
+            response = await client.search(cls.index_name(), query, dict(params))
+        else:
+            version = await cache.aget_version(cls.index_name())
+            key = cls._get_search_cache_key(version, query, dict(params))
+            response = await cache.aget(key)
+            cache.record(hit=response is not None)
+            if response is None:
+                response = await client.search(cls.index_name(), query, dict(params))
+                await cache.aset(key, response)  # ty: ignore
+        if only_hits:
+            return {"hits": response["hits"]}  # ty: ignore
+        return response  # ty: ignore
+
     # --------------------------------------------------
     # Utils
     # --------------------------------------------------
+    @classmethod
+    def async_meilisearch_client(cls) -> "AsyncMeilisearchClient":
+        """
+        Returns the async Meilisearch client of the running event loop.
+        Requires `httpx`, installed with the `async` extra.
+        """
+        from django_meilisearch_indexer.async_client import get_async_client
+
+        return get_async_client(settings.MEILISEARCH_HOST, settings.MEILISEARCH_API_KEY)
+
     @classmethod
     def meilisearch_client(cls) -> Client:
-        """Returns the Meilisearch client. Cached property."""
-        if cls._meilisearch_client is None:
-            cls._meilisearch_client = Client(
-                settings.MEILISEARCH_HOST, settings.MEILISEARCH_API_KEY
-            )
-        return cls._meilisearch_client
+        """
+        Returns the Meilisearch client, shared by all the indexers.
+        Its connection pool, timeouts, and retries are configured by `MEILISEARCH_TRANSPORT`.
+        """
+        return get_transport().client
+
+    @classmethod
+    def meilisearch_search_client(cls) -> Client:
+        """Returns the Meilisearch client used for searches, on one of the `SEARCH_HOSTS`."""
+        return get_transport().search_client()
 
     # --------------------------------------------------
     # Private utils
     # --------------------------------------------------
     @classmethod
-    def _index_from_query(cls, query: Q, index_name: str) -> None:
+    def _cached_search(
+        cls, cache: SearchCache, query: str, params: Dict[str, Any]
+    ) -> MeilisearchSearchResults:
+        """
+        Returns the results from the search cache, or searches and caches them.
+        The key contains the index version, the query, and the normalized parameters
+        (including the compiled filter), so it changes whenever the index is written to.
+
+        Args:
+            cache (SearchCache): The search cache
+            query (str): The text to search
+            params (Dict[str, Any]): The search parameters, with the compiled filter
+
+        Returns:
+            MeilisearchSearchResults: The search results
+        """
+        index_name = cls.index_name()
+        version = cache.get_version(index_name)
+        key = cls._get_search_cache_key(version, query, params)
+        response = cache.get(key)
+        cache.record(hit=response is not None)
+        if response is None:
+            index = cls.meilisearch_search_client().index(index_name)
+            response = index.search(query, params)
+            cache.set(key, response)
+        return response
+
+    @classmethod
+    def _get_search_cache_key(
+        cls, version: str, query: str, params: Dict[str, Any]
+    ) -> str:
+        """Returns the search cache key of a query on the given version of the index."""
+        encoded = json.dumps([query, params], cls=DjangoJSONEncoder, sort_keys=True)
+        digest = hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
+        return f"{cls.index_name()}:{version}:{digest}"
+
+    @classmethod
+    def _get_search_queryset(cls, queryset: Optional[QuerySet[M]]) -> QuerySet[M]:
+        """Returns the queryset to fetch the rows of the hits from."""
+        if queryset is None:
+            return cls.MODEL_CLASS._default_manager.all()
+        return queryset
+
+    @classmethod
+    def _get_hit_ids(cls, results: MeilisearchSearchResults) -> List[Any]:
+        """Returns the primary keys of the hits, converted to the type of the model primary key."""
+        pk_field = cls.MODEL_CLASS._meta.pk
+        return [pk_field.to_python(hit[cls.PRIMARY_KEY]) for hit in results["hits"]]  # ty: ignore
+
+    @classmethod
+    def _invalidate_search_cache(cls, tracker: Optional[TaskTracker] = None) -> None:
+        """
+        Bumps the index version of `SEARCH_CACHE`, if any.
+        With a tracker, the version is bumped again once its tasks are finished,
+        so the results cached while they were processed are not served afterwards.
+        """
+        if cls.SEARCH_CACHE is not None:
+            cls.SEARCH_CACHE.bump_version(cls.index_name())
+            if tracker is not None:
+                tracker.add_done_callback(cls._invalidate_search_cache)
+
+    @classmethod
+    def _get_indexed_ids(cls, ids: Iterable[Any]) -> Set[Any]:
+        """
+        Returns the given ids whose document is in the index,
+        fetching only their primary key with `iter_documents` in a single request.
+        """
+        pk_field = cls.MODEL_CLASS._meta.pk  # ty: ignore
+        ids = list(ids)
+        documents = cls.iter_documents(
+            fields=[cls.PRIMARY_KEY], page_size=len(ids) + 1, ids=ids
+        )
+        try:
+            return {pk_field.to_python(doc[cls.PRIMARY_KEY]) for doc in documents}
+        except MeilisearchApiError as error:
+            if error.code != "index_not_found":
+                raise
+            return set()
+
+    @classmethod
+    def _get_tmp_index_name(cls, rebuild_id: UUID) -> str:
+        """Returns the name of the temporary index of a rebuild, unique to each run."""
+        return f"{cls.index_name()}_tmp_{rebuild_id.hex}"
+
+    @classmethod
+    def _create_tmp_index(cls, rebuild_id: Optional[UUID] = None) -> str:
+        """Creates the temporary index of an atomic reindex, and returns its name."""
+        client = cls.meilisearch_client()
+        tmp_index_name = cls._get_tmp_index_name(rebuild_id or uuid4())
+        client.create_index(tmp_index_name, {"primaryKey": cls.PRIMARY_KEY})
+        client.index(tmp_index_name).update_settings(cls.SETTINGS)
+        return tmp_index_name
+
+    @classmethod
+    def _swap_tmp_index(cls, tmp_index_name: str) -> TaskTracker:
+        """Swaps the temporary index with the current one, then deletes it."""
+        client = cls.meilisearch_client()
+        tracker = TaskTracker(
+            [
+                client.swap_indexes([{"indexes": [cls.index_name(), tmp_index_name]}]),
+                client.delete_index(tmp_index_name),
+            ]
+        )
+        cls.clear_document_hashes()
+        cls._invalidate_search_cache(tracker)
+        return tracker
+
+    @classmethod
+    def _run_rebuild(cls, rebuild: "MeilisearchRebuild") -> TaskTracker:
+        """
+        Indexes the rows after the checkpoint of the rebuild, then swaps the indexes.
+        The next chunks are sent while the tasks of the previous ones are still processed,
+        and the checkpoint only moves past chunks once their tasks succeeded.
+        The indexes are only swapped once every task succeeded:
+        a failed task aborts the rebuild and deletes its temporary index.
+        """
+        from django_meilisearch_indexer.models import MeilisearchRebuild
+
+        if len(rebuild.task_uids) > 0:  # ty: ignore
+            try:
+                cls._wait_for_tasks(rebuild.task_uids)
+            except MeilisearchTaskError:
+                pass  # The chunks are sent again
+            else:
+                rebuild.confirmed_pk = rebuild.last_pk
+        rebuild.last_pk, rebuild.task_uids = rebuild.confirmed_pk, []
+        pk_field = cls.get_queryset().model._meta.pk
+        try:
+            while True:
+                start = rebuild.last_pk
+                if start is not None:
+                    start = pk_field.to_python(start)
+                queries, end = cls._get_rebuild_chunks(start)
+                task_uids, rows = cls._index_chunks(queries, rebuild.tmp_index_name)
+                rebuild.indexed_rows += rows  # ty: ignore
+                if end is None:
+                    cls._wait_for_tasks(rebuild.task_uids + task_uids)
+                    break
+                cls._wait_for_tasks(rebuild.task_uids)
+                rebuild.confirmed_pk = rebuild.last_pk
+                rebuild.last_pk, rebuild.task_uids = str(end), task_uids
+                rebuild.save()
+        except MeilisearchTaskError:
+            cls.meilisearch_client().delete_index(rebuild.tmp_index_name)
+            rebuild.status = MeilisearchRebuild.Status.ABORTED
+            rebuild.save()
+            raise
+        tracker = cls._swap_tmp_index(rebuild.tmp_index_name)
+        rebuild.confirmed_pk, rebuild.task_uids = rebuild.last_pk, []
+        rebuild.status = MeilisearchRebuild.Status.COMPLETED
+        rebuild.save()
+        return tracker
+
+    @classmethod
+    def _get_rebuild_chunks(cls, start: Optional[Any]) -> Tuple[List[Q], Optional[Any]]:
+        """
+        Returns the queries of the next `REBUILD_CONCURRENCY` chunks of
+        `REBUILD_CHECKPOINT_ROWS` rows after the given primary key, and the last primary key
+        of the last chunk, which is None when the chunks reach the end of the table.
+        """
+        pks = cls.get_queryset().order_by("pk").values_list("pk", flat=True)
+        size = cls.REBUILD_CHECKPOINT_ROWS
+        queries: List[Q] = []
+        for _ in range(max(1, cls.REBUILD_CONCURRENCY)):
+            query = Q() if start is None else Q(pk__gt=start)
+            ends = list(pks.filter(query)[size - 1 : size])
+            if len(ends) == 0:
+                queries.append(query)
+                return queries, None
+            queries.append(query & Q(pk__lte=ends[0]))
+            start = ends[0]
+        return queries, start
+
+    @classmethod
+    def _index_chunks(cls, queries: List[Q], index_name: str) -> Tuple[List[int], int]:
+        """
+        Indexes the rows matching each query on the given index,
+        from a thread pool when there are several queries.
+
+        Returns:
+            Tuple[List[int], int]: The uids of the enqueued tasks, and the number of rows sent
+        """
+        uploads: List[Tuple[int, int]] = []
+
+        def on_upload(payload: bytes, task: TaskInfo) -> None:
+            uploads.append((task.task_uid, payload.count(b"\n")))
+
+        def index_chunk(query: Q) -> None:
+            try:
+                cls._index_from_query(query, index_name, on_upload=on_upload)
+            finally:
+                connections.close_all()
+
+        if len(queries) == 1:
+            cls._index_from_query(queries[0], index_name, on_upload=on_upload)
+        else:
+            with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+                futures = [executor.submit(index_chunk, query) for query in queries]
+                for future in futures:
+                    future.result()
+        return [uid for uid, _ in uploads], sum(rows for _, rows in uploads)
+
+    @classmethod
+    def _wait_for_tasks(cls, task_uids: List[int]) -> None:
+        """Waits up to `TASK_TIMEOUT` for the tasks, and raises if one did not succeed."""
+        wait_for_tasks(cls.meilisearch_client(), task_uids, cls.TASK_TIMEOUT)
+
+    @classmethod
+    def _sync_index(cls, exists: Optional[bool] = None) -> TaskTracker:
+        """
+        Creates the index if needed, and sends the settings that differ.
+
+        Args:
+            exists (Optional[bool]): Whether the index is known to exist,
+                to skip fetching the settings of a missing index. Defaults to None.
+
+        Returns:
+            TaskTracker: The tasks creating the index or updating its settings, if any
+        """
+        client = cls.meilisearch_client()
+        index = client.index(cls.index_name())
+        if exists is not False:
+            try:
+                diff = cls.get_settings_diff(index.get_settings())
+            except MeilisearchApiError as error:
+                if error.code != "index_not_found":
+                    raise
+            else:
+                if len(diff) == 0:
+                    return TaskTracker()
+                return TaskTracker([index.update_settings(diff)])  # ty: ignore
+        return TaskTracker(
+            [
+                client.create_index(cls.index_name(), {"primaryKey": cls.PRIMARY_KEY}),
+                index.update_settings(cls.SETTINGS),  # ty: ignore
+            ]
+        )
+
+    @classmethod
+    def _index_from_query(
+        cls,
+        query: Q,
+        index_name: str,
+        on_upload: Optional[Callable[[bytes, TaskInfo], None]] = None,
+    ) -> TaskTracker:
         """
         Indexes all the objects matching the query on the given index.
 
         Args:
             query (Q): The django query object to apply
             index_name (str): The target index name
+            on_upload (Optional[Callable[[bytes, TaskInfo], None]]): Called with each payload
+                and its task once its upload was accepted. Defaults to None.
         """
-        queryset = cls.MODEL_CLASS.objects.filter(query)
-        paginator = Paginator(queryset, 500)
-        for page in paginator.page_range:
-            instances = paginator.page(page).object_list
+        queryset = cls.get_queryset().filter(query)
+        if cls.BUILD_PROCESSES > 1:
+            pks = cls._iter_batches(
+                queryset.values_list("pk", flat=True), pk_getter=lambda pk: pk
+            )
+            batches = cls._build_in_processes(_build_objects_from_pks, pks)
+            objects = chain.from_iterable(batches)
+        else:
+            objects = cls._iter_query_objects(queryset)
+        return cls._add_documents(objects, index_name, on_upload=on_upload)
+
+    @classmethod
+    def _iter_query_objects(cls, queryset: QuerySet[M]) -> Iterator[Dict[str, Any]]:
+        """Streams the queryset in batches and builds their objects in this process."""
+        if cls.FIELDS is not None:
+            paths, build_row = cls._get_row_builder()
+            rows = cls._iter_batches(
+                queryset.values_list(*paths), pk_getter=itemgetter(0)
+            )
+            return (build_row(row) for batch in rows for row in batch)
+        batches = (
+            cls._build_batch(instances) for instances in cls._iter_batches(queryset)
+        )
+        return chain.from_iterable(batches)
+
+    @classmethod
+    def _get_changed_since_query(cls, since: Optional[datetime]) -> Q:
+        """Returns the query matching the rows modified since the given date, if any."""
+        if cls.UPDATED_AT_FIELD is None:
+            raise ImproperlyConfigured(
+                f"{cls.__name__} must set `UPDATED_AT_FIELD` to index changed rows"
+            )
+        if since is None:
+            return Q()
+        return Q(**{f"{cls.UPDATED_AT_FIELD}__gte": since})
+
+    @classmethod
+    def _apply_queryset_options(cls, queryset: QuerySet[M]) -> QuerySet[M]:
+        """Applies `SELECT_RELATED`, `PREFETCH_RELATED`, and `ONLY` to the queryset."""
+        if cls.SELECT_RELATED:
+            queryset = queryset.select_related(*cls.SELECT_RELATED)
+        if cls.PREFETCH_RELATED:
+            queryset = queryset.prefetch_related(*cls.PREFETCH_RELATED)
+        if cls.ONLY:
+            queryset = queryset.only(*cls.ONLY)
+        return queryset
+
+    @classmethod
+    def _prefetch_related_objects(cls, instances: List[M]) -> None:
+        """Loads the `SELECT_RELATED` and `PREFETCH_RELATED` relations of already fetched instances."""
+        lookups = [*(cls.SELECT_RELATED or []), *(cls.PREFETCH_RELATED or [])]
+        if len(instances) > 0 and len(lookups) > 0:
+            prefetch_related_objects(instances, *lookups)
+
+    @classmethod
+    def _build_batch(cls, instances: List[M]) -> List[Dict[str, Any]]:
+        """
+        Builds the objects of a batch of instances.
+        With `DEBUG_QUERIES`, counts the SQL queries made by `build_object` and warns
+        when there is at least one per instance, which indicates an N+1 problem.
+
+        Args:
+            instances (List[M]): The instances to build
+
+        Returns:
+            List[Dict[str, Any]]: The built objects
+        """
+        if not cls.DEBUG_QUERIES:
+            return [cls.build_object(instance) for instance in instances]
+        connection = connections[router.db_for_read(cls.MODEL_CLASS)]
+        with CaptureQueriesContext(connection) as context:
             objects = [cls.build_object(instance) for instance in instances]
-            if len(objects) > 0:
-                cls.meilisearch_client().index(index_name).add_documents(objects)
+        query_count = len(context.captured_queries)
+        if len(instances) > 1 and query_count >= len(instances):
+            warnings.warn(
+                f"{cls.__name__}.build_object made {query_count} queries "
+                f"for a batch of {len(instances)} instances. "
+                "Consider using SELECT_RELATED or PREFETCH_RELATED.",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+        return objects
+
+    @classmethod
+    def _build_instances(
+        cls, instances: List[M], lookups: Optional[Sequence[Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Loads the relations of already fetched instances, then builds them.
+
+        Args:
+            instances (List[M]): The instances to build
+            lookups (Optional[Sequence[Any]]): The relations to prefetch.
+                Defaults to `SELECT_RELATED` and `PREFETCH_RELATED`.
+
+        Returns:
+            List[Dict[str, Any]]: The built objects
+        """
+        if lookups is None:
+            cls._prefetch_related_objects(instances)
+        elif len(instances) > 0 and len(lookups) > 0:
+            prefetch_related_objects(instances, *lookups)
+        return cls._build_batch(instances)
+
+    @classmethod
+    async def _aiter_object_batches(
+        cls, queryset: QuerySet[M]
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Streams the queryset and yields its objects by `BATCH_SIZE`.
+        Instances are fetched with `aiterator`, and prefetched per batch as `aiterator`
+        only supports prefetches from Django 5.0. `FIELDS` rows are fetched with
+        a primary key cursor, as `values_list` querysets run their query
+        as soon as `aiterator` starts iterating, outside of `sync_to_async`.
+
+        Args:
+            queryset (QuerySet[M]): The queryset to build
+
+        Yields:
+            List[Dict[str, Any]]: The next batch of built objects
+        """
+        queryset = cls._apply_queryset_options(queryset)
+        if cls.FIELDS is not None:
+            paths, build_row = cls._get_row_builder()
+            rows = queryset.values_list(*paths).order_by("pk")
+
+            def build_rows(batch: List[Sequence[Any]]) -> List[Dict[str, Any]]:
+                return [build_row(row) for row in batch]
+
+            last_pk = None
+            while True:
+                page = rows if last_pk is None else rows.filter(pk__gt=last_pk)
+                batch = await sync_to_async(list)(page[: cls.BATCH_SIZE])
+                if len(batch) == 0:
+                    return
+                # The rows don't use the ORM, so they can be built on any thread
+                yield await sync_to_async(build_rows, thread_sensitive=False)(batch)
+                if len(batch) < cls.BATCH_SIZE:
+                    return
+                last_pk = batch[-1][0]
+        lookups = queryset._prefetch_related_lookups
+        instances: List[M] = []
+        async for instance in queryset.prefetch_related(None).aiterator(
+            chunk_size=cls.BATCH_SIZE
+        ):
+            instances.append(instance)
+            if len(instances) >= cls.BATCH_SIZE:
+                yield await sync_to_async(cls._build_instances)(instances, lookups)
+                instances = []
+        if len(instances) > 0:
+            yield await sync_to_async(cls._build_instances)(instances, lookups)
+
+    @classmethod
+    def _get_row_builder(
+        cls, fields: Optional[List[str]] = None
+    ) -> Tuple[List[str], Callable[[Sequence[Any]], Dict[str, Any]]]:
+        """
+        Compiles the `FIELDS` map into a function building an object from a `values_list` row.
+        The result is cached on the class until `FIELDS` changes, unless `fields` is given.
+
+        Args:
+            fields (Optional[List[str]]): Only build these fields. Defaults to None.
+
+        Returns:
+            Tuple[List[str], Callable[[Sequence[Any]], Dict[str, Any]]]:
+                The paths to pass to `values_list` (starting with `pk`) and the row builder
+        """
+        cached = cls.__dict__.get("_row_builder")
+        if fields is None and cached is not None and cached[0] is cls.FIELDS:
+            return cached[1], cached[2]
+        if cls.FIELDS is None:
+            raise ImproperlyConfigured(f"{cls.__name__}.FIELDS is not set")
+        paths = ["pk"]
+        getters = []
+        for key, source in cls.FIELDS.items():
+            if fields is not None and key not in fields:
+                continue
+            path, transform = (source, None) if isinstance(source, str) else source
+            _check_single_valued_path(cls.MODEL_CLASS, path)
+            if path not in paths:
+                paths.append(path)
+            getters.append((key, paths.index(path), transform))
+
+        def build_row(row: Sequence[Any]) -> Dict[str, Any]:
+            return {
+                key: row[i] if transform is None else transform(row[i])
+                for key, i, transform in getters
+            }
+
+        if fields is None:
+            cls._row_builder = (cls.FIELDS, paths, build_row)
+        return paths, build_row
+
+    @classmethod
+    def _get_partial_fields(cls, fields: List[str]) -> List[str]:
+        """Returns the fields of a partial update, starting with `PRIMARY_KEY`."""
+        if cls.FIELDS is not None:
+            unknown = [key for key in fields if key not in cls.FIELDS]
+            if len(unknown) > 0:
+                raise ValueError(f"Unknown fields for {cls.__name__}: {unknown}")
+        return [cls.PRIMARY_KEY] + [key for key in fields if key != cls.PRIMARY_KEY]
+
+    @classmethod
+    def _build_in_processes(
+        cls,
+        build: Callable[[Any, List[Any]], List[Dict[str, Any]]],
+        chunks: Iterable[List[Any]],
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Runs `build_object` on a pool of `BUILD_PROCESSES` worker processes.
+        The connections of the caller are left open, so it can run in a transaction,
+        and each worker drops the handles it inherited to open its own.
+        At most 2 chunks per process are pending at once,
+        and the batches are yielded in the same order as the chunks.
+
+        Args:
+            build (Callable): Module-level function building a chunk in a worker
+            chunks (Iterable[List[Any]]): The chunks (instances or pks) to send to the workers
+
+        Yields:
+            List[Dict[str, Any]]: The built objects of each chunk
+        """
+        with ProcessPoolExecutor(
+            max_workers=cls.BUILD_PROCESSES,
+            mp_context=_process_context(),
+            initializer=_setup_process,
+        ) as executor:
+            pending: Deque[Future] = deque()
+            for chunk in chunks:
+                if len(pending) >= cls.BUILD_PROCESSES * 2:
+                    yield pending.popleft().result()
+                pending.append(executor.submit(build, cls, chunk))
+            while pending:
+                yield pending.popleft().result()
+
+    @classmethod
+    def _add_documents(
+        cls,
+        objects: Iterable[Dict[str, Any]],
+        index_name: str,
+        partial: bool = False,
+        on_upload: Optional[Callable[[bytes, TaskInfo], None]] = None,
+    ) -> TaskTracker:
+        """
+        Uploads the built objects to the given index as NDJSON payloads.
+        When `INDEXING_CONCURRENCY` is greater than 1, up to that many uploads are kept
+        in flight on a thread pool while the next payloads are fetched and built.
+        Once the limit is reached, we wait for the oldest upload before building more.
+        The version of `SEARCH_CACHE` is bumped afterwards, even if an upload failed,
+        and again once the tasks are finished, when the returned tracker is waited for.
+        With `DOCUMENT_HASH_CACHE`, the digests of the documents are only stored once
+        the returned tracker is waited for, for the tasks that succeeded.
+
+        Args:
+            objects (Iterable[Dict[str, Any]]): The objects to index
+            index_name (str): The target index name
+            partial (bool): Whether to merge the objects into the existing documents
+                with `update_documents`. Defaults to False.
+            on_upload (Optional[Callable[[bytes, TaskInfo], None]]): Called with each payload
+                and its task once its upload was accepted. Defaults to None.
+
+        Returns:
+            TaskTracker: The tasks of the uploads
+        """
+        tracker = TaskTracker()
+        hashes: Optional[Deque[Tuple[str, Optional[str]]]] = None
+        uploaded_hashes: Dict[int, Dict[str, str]] = {}
+        if cls.DOCUMENT_HASH_CACHE is not None and index_name == cls.index_name():
+            hashes = deque()
+            objects = cls._skip_unchanged(objects, hashes, partial)
+            tracker.add_done_callback(lambda: cls._store_hashes(uploaded_hashes))
+
+        def track(payload: bytes, task: TaskInfo) -> None:
+            tracker.add(task)
+            if hashes is not None:
+                uploaded_hashes[task.task_uid] = cls._pop_hashes(payload, hashes)
+            if on_upload is not None:
+                on_upload(payload, task)
+
+        try:
+            cls._upload_documents(objects, index_name, partial, track)
+        finally:
+            if index_name == cls.index_name():
+                cls._invalidate_search_cache(tracker)
+        return tracker
+
+    @classmethod
+    def _upload_documents(
+        cls,
+        objects: Iterable[Dict[str, Any]],
+        index_name: str,
+        partial: bool,
+        on_upload: Optional[Callable[[bytes, TaskInfo], None]] = None,
+    ) -> None:
+        """Uploads the objects for `_add_documents`."""
+        payloads = cls._iter_payloads(objects)
+        if cls.INDEXING_CONCURRENCY <= 1:
+            for payload in payloads:
+                index = cls.meilisearch_client().index(index_name)
+                if partial:
+                    task = index.update_documents_ndjson(payload)
+                else:
+                    task = index.add_documents_ndjson(payload)
+                if on_upload is not None:
+                    on_upload(payload, task)
+            return
+        with ThreadPoolExecutor(max_workers=cls.INDEXING_CONCURRENCY) as executor:
+            in_flight: Deque[Tuple[Future, bytes]] = deque()
+
+            def wait_oldest() -> None:
+                future, payload = in_flight.popleft()
+                task = future.result()
+                if on_upload is not None:
+                    on_upload(payload, task)
+
+            try:
+                for payload in payloads:
+                    if len(in_flight) >= cls.INDEXING_CONCURRENCY:
+                        wait_oldest()
+                    index = cls.meilisearch_client().index(index_name)
+                    upload = (
+                        index.update_documents_ndjson
+                        if partial
+                        else index.add_documents_ndjson
+                    )
+                    future = executor.submit(upload, payload)
+                    in_flight.append((future, payload))
+                while in_flight:
+                    wait_oldest()
+            finally:
+                for future, _ in in_flight:
+                    future.cancel()
+
+    @classmethod
+    async def _aadd_documents(
+        cls,
+        batches: AsyncIterator[List[Dict[str, Any]]],
+        index_name: str,
+        partial: bool = False,
+    ) -> TaskTracker:
+        """
+        Async version of `_add_documents`, uploading the batches of objects as NDJSON payloads.
+        Up to `INDEXING_CONCURRENCY` uploads are kept in flight while the next batches
+        are fetched and built.
+
+        Args:
+            batches (AsyncIterator[List[Dict[str, Any]]]): The batches of objects to index
+            index_name (str): The target index name
+            partial (bool): Whether to merge the objects into the existing documents.
+                Defaults to False.
+
+        Returns:
+            TaskTracker: The tasks of the uploads
+        """
+        client = cls.async_meilisearch_client()
+        tracker = TaskTracker()
+        hashes: Optional[Deque[Tuple[str, Optional[str]]]] = None
+        uploaded_hashes: Dict[int, Dict[str, str]] = {}
+        if cls.DOCUMENT_HASH_CACHE is not None and index_name == cls.index_name():
+            hashes = deque()
+            tracker.add_done_callback(lambda: cls._store_hashes(uploaded_hashes))
+        buffer = _PayloadBuffer(cls.MAX_PAYLOAD_BYTES, cls.MAX_BATCH_DOCUMENTS)
+        in_flight: Deque[Tuple[asyncio.Task, bytes]] = deque()
+
+        async def wait_oldest() -> None:
+            task, payload = in_flight.popleft()
+            info = await task
+            tracker.add(info)
+            if hashes is not None:
+                uploaded_hashes[info["taskUid"]] = await sync_to_async(cls._pop_hashes)(
+                    payload, hashes
+                )
+
+        async def upload(payload: bytes) -> None:
+            if len(in_flight) >= max(cls.INDEXING_CONCURRENCY, 1):
+                await wait_oldest()
+            coroutine = client.add_documents_ndjson(index_name, payload, partial)
+            in_flight.append((asyncio.ensure_future(coroutine), payload))
+
+        def encode(objects: List[Dict[str, Any]]) -> List[bytes]:
+            # Awaited before the next upload, so `buffer` and `hashes` are never shared
+            if hashes is not None:
+                objects = list(cls._skip_unchanged(objects, hashes, partial))
+            payloads = (buffer.add(obj) for obj in objects)
+            return [payload for payload in payloads if payload is not None]
+
+        try:
+            async for objects in batches:
+                encoded = await sync_to_async(encode, thread_sensitive=False)(objects)
+                for payload in encoded:
+                    await upload(payload)
+            payload = buffer.flush()
+            if payload is not None:
+                await upload(payload)
+            while in_flight:
+                await wait_oldest()
+        finally:
+            for task, _ in in_flight:
+                task.cancel()
+            if index_name == cls.index_name() and cls.SEARCH_CACHE is not None:
+                await cls.SEARCH_CACHE.abump_version(index_name)
+                tracker.add_done_callback(cls._invalidate_search_cache)
+        return tracker
+
+    @classmethod
+    def _skip_unchanged(
+        cls,
+        objects: Iterable[Dict[str, Any]],
+        hashes: Deque[Tuple[str, Optional[str]]],
+        partial: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Drops the objects whose digest matches the one stored in `DOCUMENT_HASH_CACHE`.
+        The cache is read in batches of `BATCH_SIZE` objects. The key and digest
+        of each yielded object are appended to `hashes`, to be stored once their task succeeded.
+        Partial objects are never dropped: their digest is None, to be deleted once uploaded.
+
+        Args:
+            objects (Iterable[Dict[str, Any]]): The built objects
+            hashes (Deque[Tuple[str, Optional[str]]]): Receives the key and digest
+                of the yielded objects
+            partial (bool): Whether the objects only hold some fields. Defaults to False.
+
+        Yields:
+            Dict[str, Any]: The objects that changed since their last upload
+        """
+        cache = caches[cls.DOCUMENT_HASH_CACHE]  # ty: ignore
+        prefix = cls._get_hash_key_prefix()
+        if partial:
+            for obj in objects:
+                hashes.append((f"{prefix}{obj[cls.PRIMARY_KEY]}", None))
+                yield obj
+            return
+        iterator = iter(objects)
+        for batch in iter(lambda: list(islice(iterator, cls.BATCH_SIZE)), []):
+            keys = [f"{prefix}{obj[cls.PRIMARY_KEY]}" for obj in batch]
+            stored = cache.get_many(keys)
+            for key, obj in zip(keys, batch):
+                digest = _get_document_digest(obj)
+                if stored.get(key) != digest:
+                    hashes.append((key, digest))
+                    yield obj
+
+    @classmethod
+    def _pop_hashes(
+        cls, payload: bytes, hashes: Deque[Tuple[str, Optional[str]]]
+    ) -> Dict[str, str]:
+        """
+        Returns the digests of the documents of an uploaded payload, to be stored
+        once its task succeeded, and deletes those of the partial documents right away.
+        Payloads are uploaded in order and each NDJSON line holds one document,
+        so they are the first `n` entries of `hashes`.
+        """
+        cache = caches[cls.DOCUMENT_HASH_CACHE]  # ty: ignore
+        uploaded = [hashes.popleft() for _ in range(payload.count(b"\n"))]
+        cache.delete_many([key for key, digest in uploaded if digest is None])
+        return {key: digest for key, digest in uploaded if digest is not None}
+
+    @classmethod
+    def _store_hashes(cls, uploaded_hashes: Dict[int, Dict[str, str]]) -> None:
+        """
+        Stores the digests of the payloads whose task succeeded, by task uid.
+        The others are dropped, so their documents are sent again by the next call.
+        Called once the tasks are finished, so their statuses are fetched in one request.
+        """
+        cache = caches[cls.DOCUMENT_HASH_CACHE]  # ty: ignore
+        tasks = TaskTracker(uploaded_hashes).wait(raise_on_failure=False)
+        for task in tasks:
+            if task.status == "succeeded":
+                cache.set_many(uploaded_hashes[task.uid])
+
+    @classmethod
+    def _forget_hashes(cls, ids: Union[List[int], List[str]]) -> None:
+        """Deletes the digests of the given ids from `DOCUMENT_HASH_CACHE`, if set."""
+        if cls.DOCUMENT_HASH_CACHE is not None:
+            prefix = cls._get_hash_key_prefix()
+            keys = [f"{prefix}{id_}" for id_ in ids]
+            caches[cls.DOCUMENT_HASH_CACHE].delete_many(keys)
+
+    @classmethod
+    def _get_hash_key_prefix(cls) -> str:
+        """
+        Returns the cache key prefix of the document digests of the index.
+        It contains a generation token that `clear_document_hashes` replaces.
+        """
+        cache = caches[cls.DOCUMENT_HASH_CACHE]  # ty: ignore
+        generation_key = f"django_meilisearch_indexer:{cls.index_name()}:generation"
+        generation = cache.get(generation_key)
+        if generation is None:
+            cache.add(generation_key, uuid4().hex)
+            generation = cache.get(generation_key)
+        return f"django_meilisearch_indexer:{cls.index_name()}:{generation}:"
+
+    @classmethod
+    def _iter_payloads(cls, objects: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+        """
+        Encodes the objects as NDJSON and groups them into payloads of at most
+        `MAX_PAYLOAD_BYTES` bytes and `MAX_BATCH_DOCUMENTS` documents.
+        An object larger than `MAX_PAYLOAD_BYTES` is sent on its own.
+
+        Args:
+            objects (Iterable[Dict[str, Any]]): The objects to encode
+
+        Yields:
+            bytes: The next NDJSON payload
+        """
+        buffer = _PayloadBuffer(cls.MAX_PAYLOAD_BYTES, cls.MAX_BATCH_DOCUMENTS)
+        for obj in objects:
+            payload = buffer.add(obj)
+            if payload is not None:
+                yield payload
+        payload = buffer.flush()
+        if payload is not None:
+            yield payload
+
+    @classmethod
+    def _iter_batches(
+        cls,
+        queryset: QuerySet,
+        pk_getter: Callable[[Any], Any] = attrgetter("pk"),
+    ) -> Iterator[List[Any]]:
+        """
+        Streams the queryset in batches of `BATCH_SIZE` instances using a primary key cursor.
+        Each batch is fetched with `pk > last_pk ORDER BY pk LIMIT n`, which avoids
+        the `COUNT(*)` and the growing `OFFSET` scans of a paginator, and stays consistent
+        when rows are inserted or deleted during the run.
+
+        Args:
+            queryset (QuerySet): The queryset to stream
+            pk_getter (Callable[[Any], Any]): Returns the primary key of a row. Defaults to `row.pk`.
+
+        Yields:
+            List[Any]: The next batch of rows
+        """
+        queryset = queryset.order_by("pk")
+        last_pk = None
+        while True:
+            page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            instances = list(page[: cls.BATCH_SIZE])
+            if len(instances) == 0:
+                return
+            yield instances
+            if len(instances) < cls.BATCH_SIZE:
+                return
+            last_pk = pk_getter(instances[-1])
+
+    @classmethod
+    def _compile_search_filter(cls, filters: Optional[SearchFilter]) -> Optional[str]:
+        """
+        Returns the filter string of the search, or None without filters.
+        With `VALIDATE_FILTERS`, the attributes are first checked against the
+        `filterableAttributes` of `SETTINGS`, to fail before sending the request.
+        """
+        if not filters:
+            return None
+        filterable_attributes = cls.SETTINGS.get("filterableAttributes")
+        if cls.VALIDATE_FILTERS and filterable_attributes is not None:
+            check_filterable(get_filter_attributes(filters), filterable_attributes)
+        return render_filter(filters) or None
 
     @staticmethod
     def _build_search_filter(
@@ -219,37 +1774,231 @@ class MeilisearchModelIndexer(ABC, Generic[M]):
         lt: Optional[List[Tuple[str, MeilisearchFilterValue]]] = None,
         lte: Optional[List[Tuple[str, MeilisearchFilterValue]]] = None,
     ) -> str:
-        """Builds a search filter string for Meilisearch using the provided supported filters."""
-        filters = []
-        if is_empty is not None:
-            filters.extend([f"{field} IS EMPTY" for field in is_empty])
-        if is_not_empty is not None:
-            filters.extend([f"{field} IS NOT EMPTY" for field in is_not_empty])
-        if is_null is not None:
-            filters.extend([f"{field} IS NULL" for field in is_null])
-        if is_not_null is not None:
-            filters.extend([f"{field} IS NOT NULL" for field in is_not_null])
-        if one_of is not None:
-            for field, values in one_of:
-                value_str = ", ".join([str(v) for v in values])
-                filters.append(f"{field} IN [{value_str}]")
-        if none_of is not None:
-            for field, values in none_of:
-                value_str = ", ".join([str(v) for v in values])
-                filters.append(f"{field} NOT IN [{value_str}]")
-        if all_of is not None:
-            for field, values in all_of:
-                filters.extend([f"{field} = {value}" for value in values])
-        if eq is not None:
-            filters.extend([f"{field} = {value}" for field, value in eq])
-        if neq is not None:
-            filters.extend([f"{field} != {value}" for field, value in neq])
-        if gt is not None:
-            filters.extend([f"{field} > {value}" for field, value in gt])
-        if gte is not None:
-            filters.extend([f"{field} >= {value}" for field, value in gte])
-        if lt is not None:
-            filters.extend([f"{field} < {value}" for field, value in lt])
-        if lte is not None:
-            filters.extend([f"{field} <= {value}" for field, value in lte])
-        return " AND ".join(filters)
+        """
+        Builds a search filter string for Meilisearch using the provided supported filters.
+        String values are quoted and escaped when needed.
+        """
+        return build_filter(
+            {
+                "is_empty": is_empty,
+                "is_not_empty": is_not_empty,
+                "is_null": is_null,
+                "is_not_null": is_not_null,
+                "one_of": one_of,
+                "none_of": none_of,
+                "all_of": all_of,
+                "eq": eq,
+                "neq": neq,
+                "gt": gt,
+                "gte": gte,
+                "lt": lt,
+                "lte": lte,
+            }  # ty: ignore
+        )
+
+
+# --------------------------------------------------
+# Batching helpers
+# --------------------------------------------------
+class _PayloadBuffer:
+    """
+    Encodes objects as NDJSON lines and groups them into payloads
+    of at most `max_bytes` bytes and `max_documents` documents.
+    """
+
+    def __init__(self, max_bytes: int, max_documents: Optional[int]) -> None:
+        self.max_bytes = max_bytes
+        self.max_documents = max_documents
+        self.lines: List[bytes] = []
+        self.size = 0
+
+    def add(self, obj: Dict[str, Any]) -> Optional[bytes]:
+        """Adds an object, and returns the previous payload if it is full."""
+        line = json.dumps(obj, cls=DjangoJSONEncoder).encode() + b"\n"
+        is_full = (
+            self.max_documents is not None and len(self.lines) >= self.max_documents
+        )
+        payload = None
+        if len(self.lines) > 0 and (self.size + len(line) > self.max_bytes or is_full):
+            payload = self.flush()
+        self.lines.append(line)
+        self.size += len(line)
+        return payload
+
+    def flush(self) -> Optional[bytes]:
+        """Returns the pending payload, if any, and empties the buffer."""
+        if len(self.lines) == 0:
+            return None
+        payload = b"".join(self.lines)
+        self.lines, self.size = [], 0
+        return payload
+
+
+def _iter_prefetched_pages(
+    fetch_page: Callable[[int], List[Any]], page_size: int
+) -> Generator[Any, None, None]:
+    """
+    Yields the items of the pages returned by `fetch_page(offset)`, until a short page.
+    The next page is fetched in a thread while the items of the current one are consumed.
+    Closing the generator waits for the pending fetch.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        offset = 0
+        future = executor.submit(fetch_page, offset)
+        while True:
+            items = future.result()
+            offset += len(items)
+            if len(items) < page_size:
+                yield from items
+                return
+            future = executor.submit(fetch_page, offset)
+            yield from items
+
+
+async def _aiter_one(item: Any) -> AsyncIterator[Any]:
+    yield item
+
+
+# --------------------------------------------------
+# Process pool workers
+# --------------------------------------------------
+def _process_context() -> BaseContext:
+    """Prefers `fork` so that workers inherit the already configured django project."""
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def _setup_process() -> None:
+    """
+    Sets up django in worker processes that were not forked from a ready project.
+    Forked workers drop the database connections inherited from the parent without
+    closing them, as closing would end the session (and transaction) of the parent.
+    In-memory SQLite databases are kept, as another connection would not see them.
+    """
+    if not apps.ready:
+        django.setup()
+    for connection in connections.all(initialized_only=True):
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():
+            continue
+        connection.connection = None
+
+
+def _build_objects(
+    indexer: Type[MeilisearchModelIndexer], instances: List[Any]
+) -> List[Dict[str, Any]]:
+    """Builds the objects of pickled model instances."""
+    return indexer._build_batch(instances)
+
+
+def _build_objects_from_pks(
+    indexer: Type[MeilisearchModelIndexer], pks: List[Any]
+) -> List[Dict[str, Any]]:
+    """Fetches the rows matching the primary keys and builds their objects."""
+    queryset = indexer.get_queryset().filter(pk__in=pks).order_by("pk")
+    if indexer.FIELDS is not None:
+        paths, build_row = indexer._get_row_builder()
+        return [build_row(row) for row in queryset.values_list(*paths)]
+    return indexer._build_batch(list(queryset))
+
+
+# --------------------------------------------------
+# Settings helpers
+# --------------------------------------------------
+def _get_index_names(client: Client, page_size: int = 1000) -> Set[str]:
+    """Returns the names of all the existing indexes."""
+    names: Set[str] = set()
+    offset = 0
+    while True:
+        response: Dict[str, Any] = client.get_raw_indexes(  # ty: ignore
+            {"offset": offset, "limit": page_size}
+        )
+        names.update(index["uid"] for index in response["results"])
+        offset += page_size
+        if offset >= response["total"]:
+            return names
+
+
+_UNORDERED_SETTINGS = {
+    "filterableAttributes",
+    "sortableAttributes",
+    "stopWords",
+    "nonSeparatorTokens",
+    "separatorTokens",
+    "dictionary",
+    "disableOnWords",
+    "disableOnAttributes",
+}
+_MERGED_SETTINGS = {"typoTolerance", "faceting", "pagination"}
+
+
+def _is_same_setting(
+    key: str, current: Any, desired: Any, merged: bool = False
+) -> bool:
+    """Whether the desired value of a setting matches its current value."""
+    if isinstance(desired, dict):
+        if not isinstance(current, dict):
+            return False
+        merged = merged or key in _MERGED_SETTINGS
+        if not merged and current.keys() != desired.keys():
+            return False
+        return all(
+            _is_same_setting(sub_key, current.get(sub_key), value, merged)
+            for sub_key, value in desired.items()
+        )
+    if isinstance(desired, (list, tuple)):
+        if not isinstance(current, list):
+            return False
+        if key in _UNORDERED_SETTINGS:
+            return sorted(map(_setting_sort_key, current)) == sorted(
+                map(_setting_sort_key, desired)
+            )
+        return current == list(desired)
+    return current == desired
+
+
+def _setting_sort_key(value: Any) -> str:
+    return json.dumps(value, sort_keys=True)
+
+
+# --------------------------------------------------
+# Field map helpers
+# --------------------------------------------------
+def _get_document_digest(obj: Dict[str, Any]) -> str:
+    """Returns a stable digest of a built object, independent of its key order."""
+    encoded = json.dumps(obj, cls=DjangoJSONEncoder, sort_keys=True).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def _get_path_value(instance: "Model", path: str) -> Any:
+    """
+    Resolves a `values_list`-style path (like `author__name`) on a model instance.
+    Like `values_list`, a foreign key at the end of the path returns the related id.
+    """
+    *relations, attribute = path.split(LOOKUP_SEP)
+    obj: Any = instance
+    for relation in relations:
+        obj = getattr(obj, relation)
+        if obj is None:
+            return None
+    try:
+        field = obj._meta.get_field(attribute)  # ty: ignore
+    except FieldDoesNotExist:
+        return getattr(obj, attribute)
+    return getattr(obj, getattr(field, "attname", None) or attribute)
+
+
+def _check_single_valued_path(model: Type["Model"], path: str) -> None:
+    """Rejects paths through many-to-many or reverse relations, which would duplicate rows."""
+    for part in path.split(LOOKUP_SEP):
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return
+        if field.many_to_many or field.one_to_many:
+            raise ImproperlyConfigured(
+                f"'{path}' goes through a multi-valued relation and cannot be used in FIELDS"
+            )
+        if not field.is_relation:
+            return
+        model = field.related_model
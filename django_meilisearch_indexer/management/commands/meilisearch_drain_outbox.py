@@ -0,0 +1,44 @@
+from argparse import ArgumentParser
+from time import sleep
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from django_meilisearch_indexer.outbox import drain_outbox
+
+
+class Command(BaseCommand):
+    help = "Applies the pending Meilisearch outbox entries"
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Maximum number of entries claimed per transaction",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep draining the outbox until the process is stopped",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the outbox is empty, with --loop",
+        )
+        parser.add_argument(
+            "--database",
+            default=None,
+            help="Database alias of the outbox. Defaults to the write database",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        while True:
+            count = drain_outbox(options["batch_size"], using=options["database"])
+            if count > 0:
+                self.stdout.write(f"Applied {count} outbox entries")
+            if not options["loop"]:
+                return
+            sleep(options["interval"])
@@ -0,0 +1,46 @@
+from argparse import ArgumentParser
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from django_meilisearch_indexer.bootstrap import get_indexers_by_name
+from django_meilisearch_indexer.reconcile import FETCH_PAGE_SIZE, reconcile
+
+
+class Command(BaseCommand):
+    help = "Unindexes the orphan documents and indexes the missing rows of Meilisearch indexes"
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "indexers",
+            nargs="*",
+            help="Indexer class names, dotted paths, or index names. Defaults to all of them",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the drift, without fixing it",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=FETCH_PAGE_SIZE,
+            help="Number of document ids fetched per request",
+        )
+        parser.add_argument(
+            "--wait",
+            action="store_true",
+            help="Wait for the tasks fixing the drift to succeed",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        for indexer in get_indexers_by_name(options["indexers"]):
+            report = reconcile(
+                indexer, dry_run=options["dry_run"], page_size=options["page_size"]
+            )
+            if options["wait"]:
+                report.tracker.wait(indexer.TASK_TIMEOUT)
+            style = self.style.SUCCESS
+            if report.orphans > 0 or report.missing > 0:
+                style = self.style.WARNING
+            self.stdout.write(style(f"{indexer.__name__}: {report}"))
@@ -0,0 +1,72 @@
+from argparse import ArgumentParser
+import os
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from django_meilisearch_indexer.bootstrap import get_indexers_by_name
+from django_meilisearch_indexer.reindex import ReindexProgress, reindex
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds Meilisearch indexes, sharded by primary key across worker processes"
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "indexers",
+            nargs="*",
+            help="Indexer class names, dotted paths, or index names. Defaults to all of them",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of worker processes, defaults to the number of CPUs",
+        )
+        parser.add_argument(
+            "--shards",
+            type=int,
+            default=None,
+            help="Number of primary key ranges per indexer, defaults to 4 per process",
+        )
+        parser.add_argument(
+            "--atomic",
+            action="store_true",
+            help="Index into a temporary index, swapped with the current one when done",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only build and encode the documents, to measure the build throughput",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds between two progress reports",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        for indexer in get_indexers_by_name(options["indexers"]):
+
+            def report(progress: ReindexProgress) -> None:
+                self.stdout.write(f"{indexer.__name__}: {progress}")  # noqa: B023
+
+            progress = reindex(
+                indexer,
+                processes=options["processes"],
+                shards=options["shards"],
+                atomic=options["atomic"],
+                dry_run=options["dry_run"],
+                on_progress=report,
+                interval=options["interval"],
+            )
+            verb = "Built" if options["dry_run"] else "Indexed"
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{verb} {progress.rows:,} rows of {indexer.__name__} "
+                    f"in {progress.elapsed:.1f}s"
+                )
+            )
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="MeilisearchOutboxEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("indexer", models.CharField(max_length=255)),
+                ("object_pk", models.CharField(max_length=255)),
+                (
+                    "operation",
+                    models.CharField(
+                        choices=[("index", "Index"), ("unindex", "Unindex")],
+                        max_length=10,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("claimed_until", models.DateTimeField(blank=True, null=True)),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default="")),
+            ],
+            options={
+                "verbose_name": "Meilisearch outbox entry",
+                "verbose_name_plural": "Meilisearch outbox entries",
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_meilisearch_indexer", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MeilisearchSyncState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("index_name", models.CharField(max_length=255, unique=True)),
+                ("synced_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Meilisearch sync state",
+                "verbose_name_plural": "Meilisearch sync states",
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_meilisearch_indexer", "0002_meilisearchsyncstate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MeilisearchRebuild",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("rebuild_id", models.UUIDField(unique=True)),
+                ("index_name", models.CharField(db_index=True, max_length=255)),
+                ("tmp_index_name", models.CharField(max_length=255)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("running", "Running"),
+                            ("completed", "Completed"),
+                            ("aborted", "Aborted"),
+                        ],
+                        default="running",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "confirmed_pk",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                ("last_pk", models.CharField(blank=True, max_length=255, null=True)),
+                ("task_uids", models.JSONField(blank=True, default=list)),
+                ("indexed_rows", models.PositiveBigIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Meilisearch rebuild",
+                "verbose_name_plural": "Meilisearch rebuilds",
+            },
+        ),
+    ]
@@ -0,0 +1,86 @@
+from django.db import models
+
+
+class MeilisearchOutboxEntry(models.Model):
+    """
+    A pending indexing operation, written in the same transaction as the change it reflects.
+    Entries are claimed and applied in bulk by `outbox.drain_outbox`.
+    Failed entries keep their number of `attempts` and their `last_error`,
+    and are no longer claimed once they reach `outbox.MAX_ATTEMPTS`.
+    """
+
+    class Operation(models.TextChoices):
+        INDEX = "index", "Index"
+        UNINDEX = "unindex", "Unindex"
+
+    indexer = models.CharField(max_length=255)
+    object_pk = models.CharField(max_length=255)
+    operation = models.CharField(max_length=10, choices=Operation.choices)
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_until = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+
+    objects = models.Manager()
+
+    class Meta:
+        verbose_name = "Meilisearch outbox entry"
+        verbose_name_plural = "Meilisearch outbox entries"
+
+    def __str__(self) -> str:
+        return f"{self.operation} {self.indexer} {self.object_pk}"
+
+
+class MeilisearchSyncState(models.Model):
+    """
+    The high-water mark of an index, updated by `sync_incremental`.
+    Rows modified after `synced_at` (minus `SYNC_OVERLAP`) are sent on the next run.
+    """
+
+    index_name = models.CharField(max_length=255, unique=True)
+    synced_at = models.DateTimeField()
+
+    objects = models.Manager()
+
+    class Meta:
+        verbose_name = "Meilisearch sync state"
+        verbose_name_plural = "Meilisearch sync states"
+
+    def __str__(self) -> str:
+        return f"{self.index_name} synced at {self.synced_at}"
+
+
+class MeilisearchRebuild(models.Model):
+    """
+    The checkpoint of an atomic rebuild, written after each confirmed chunk
+    by `index_all_atomically` so `resume_rebuild` can continue after a crash.
+    Rows up to `confirmed_pk` are known to be indexed in `tmp_index_name`,
+    and the rows up to `last_pk` were sent in the tasks of `task_uids`.
+    """
+
+    class Status(models.TextChoices):
+        RUNNING = "running", "Running"
+        COMPLETED = "completed", "Completed"
+        ABORTED = "aborted", "Aborted"
+
+    rebuild_id = models.UUIDField(unique=True)
+    index_name = models.CharField(max_length=255, db_index=True)
+    tmp_index_name = models.CharField(max_length=255)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.RUNNING
+    )
+    confirmed_pk = models.CharField(max_length=255, null=True, blank=True)
+    last_pk = models.CharField(max_length=255, null=True, blank=True)
+    task_uids = models.JSONField(default=list, blank=True)
+    indexed_rows = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = models.Manager()
+
+    class Meta:
+        verbose_name = "Meilisearch rebuild"
+        verbose_name_plural = "Meilisearch rebuilds"
+
+    def __str__(self) -> str:
+        return f"{self.index_name} rebuild {self.rebuild_id} ({self.status})"
@@ -0,0 +1,161 @@
+from collections import defaultdict
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Type
+
+from django.db import router, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from django_meilisearch_indexer.models import MeilisearchOutboxEntry
+from django_meilisearch_indexer.tasks import MeilisearchTaskError, TaskTracker
+
+if TYPE_CHECKING:
+    from django_meilisearch_indexer.indexers import MeilisearchModelIndexer
+
+# Claimed entries are skipped by the other workers until then, and retried after it if they failed
+CLAIM_TIMEOUT = timedelta(minutes=5)
+# Entries that failed this many times are kept as dead letters, and no longer claimed
+MAX_ATTEMPTS = 5
+
+
+def enqueue(
+    indexer: Type["MeilisearchModelIndexer"],
+    pks: Iterable[Any],
+    operation: str,
+    using: Optional[str] = None,
+) -> None:
+    """
+    Writes outbox entries for the given primary keys.
+    When called inside a transaction, the entries are committed (or rolled back) with it.
+
+    Args:
+        indexer (Type[MeilisearchModelIndexer]): The indexer to apply the operation with
+        pks (Iterable[Any]): The primary keys of the instances
+        operation (str): Either `index` or `unindex`
+        using (Optional[str]): The database alias. Defaults to None.
+    """
+    label = f"{indexer.__module__}.{indexer.__qualname__}"
+    entries = [
+        MeilisearchOutboxEntry(indexer=label, object_pk=str(pk), operation=operation)
+        for pk in pks
+    ]
+    MeilisearchOutboxEntry.objects.using(using).bulk_create(entries)
+
+
+def drain_outbox_batch(
+    batch_size: int = 1000,
+    max_attempts: int = MAX_ATTEMPTS,
+    using: Optional[str] = None,
+) -> int:
+    """
+    Claims up to `batch_size` outbox entries and applies them.
+    Entries are claimed in a short transaction with `SELECT ... FOR UPDATE SKIP LOCKED`,
+    which sets their `claimed_until` and increments their `attempts`, so several workers
+    can drain the outbox concurrently without holding locks while Meilisearch is called.
+    Repeated primary keys are collapsed, the most recent operation wins,
+    and each indexer receives a single batch per operation.
+    Each indexer is handled on its own: its entries are deleted once its tasks succeeded.
+    Otherwise, its error is stored in `last_error`, and its entries are claimed again
+    once `CLAIM_TIMEOUT` expired, until they reach `max_attempts` and are kept as dead letters.
+
+    Args:
+        batch_size (int): The maximum number of entries to claim. Defaults to 1000.
+        max_attempts (int): The number of attempts after which entries are no longer
+            claimed. Defaults to `MAX_ATTEMPTS`.
+        using (Optional[str]): The database alias the entries were written to,
+            like for `enqueue`. Defaults to the write database of the router.
+
+    Returns:
+        int: The number of claimed entries
+    """
+    using = using or router.db_for_write(MeilisearchOutboxEntry)
+    entries = _claim_entries(batch_size, max_attempts, using)
+    if len(entries) == 0:
+        return 0
+    groups: Dict[str, List[MeilisearchOutboxEntry]] = defaultdict(list)
+    for entry in entries:
+        groups[entry.indexer].append(entry)
+    trackers: Dict[str, TaskTracker] = {}
+    errors: Dict[str, str] = {}
+    for label, group in groups.items():
+        try:
+            trackers[label] = _apply_entries(label, group)
+        except Exception as error:
+            errors[label] = repr(error)
+    tracker = TaskTracker(trackers.values())
+    tracker.wait(raise_on_failure=False)
+    failed = {task.uid: task for task in tracker.failed}
+    for label, label_tracker in trackers.items():
+        failed_tasks = [failed[uid] for uid in label_tracker if uid in failed]
+        if len(failed_tasks) > 0:
+            errors[label] = str(MeilisearchTaskError(failed_tasks[0]))
+    outbox_entries = MeilisearchOutboxEntry.objects.using(using)
+    outbox_entries.filter(
+        pk__in=[
+            entry.pk
+            for label, group in groups.items()
+            if label not in errors
+            for entry in group
+        ]
+    ).delete()
+    for label, error in errors.items():
+        outbox_entries.filter(pk__in=[entry.pk for entry in groups[label]]).update(
+            last_error=error
+        )
+    return len(entries)
+
+
+def drain_outbox(batch_size: int = 1000, using: Optional[str] = None) -> int:
+    """
+    Applies outbox entries batch by batch until the outbox is empty.
+
+    Args:
+        batch_size (int): The maximum number of entries per batch. Defaults to 1000.
+        using (Optional[str]): The database alias of the outbox. Defaults to None.
+
+    Returns:
+        int: The total number of applied entries
+    """
+    total = 0
+    while True:
+        count = drain_outbox_batch(batch_size, using=using)
+        total += count
+        if count == 0:
+            return total
+
+
+def _claim_entries(
+    batch_size: int, max_attempts: int, using: str
+) -> List[MeilisearchOutboxEntry]:
+    now = timezone.now()
+    outbox_entries = MeilisearchOutboxEntry.objects.using(using)
+    with transaction.atomic(using=using):
+        queryset = outbox_entries.select_for_update(skip_locked=True)
+        queryset = queryset.filter(
+            Q(claimed_until__isnull=True) | Q(claimed_until__lte=now),
+            attempts__lt=max_attempts,
+        )
+        entries = list(queryset.order_by("pk")[:batch_size])
+        outbox_entries.filter(pk__in=[entry.pk for entry in entries]).update(
+            claimed_until=now + CLAIM_TIMEOUT, attempts=F("attempts") + 1
+        )
+    return entries
+
+
+def _apply_entries(label: str, entries: List[MeilisearchOutboxEntry]) -> TaskTracker:
+    indexer: Type["MeilisearchModelIndexer"] = import_string(label)
+    to_python = indexer.MODEL_CLASS._meta.pk.to_python  # ty: ignore
+    operations = {entry.object_pk: entry.operation for entry in entries}
+    index_pks, unindex_pks = set(), set()
+    for pk, operation in operations.items():
+        if operation == MeilisearchOutboxEntry.Operation.UNINDEX:
+            unindex_pks.add(to_python(pk))
+        else:
+            index_pks.add(to_python(pk))
+    tracker = TaskTracker()
+    if len(index_pks) > 0:
+        tracker.add(indexer.sync_multiple(list(index_pks)))
+    if len(unindex_pks) > 0:
+        tracker.add(indexer.unindex_multiple(list(unindex_pks)))
+    return tracker
@@ -0,0 +1,289 @@
+import heapq
+from itertools import chain, islice
+import pickle
+import tempfile
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Set,
+    Tuple,
+    Type,
+)
+
+from django.db.models import IntegerField, Q
+
+from django_meilisearch_indexer.indexers import MeilisearchModelIndexer
+from django_meilisearch_indexer.tasks import TaskTracker
+
+# Documents per `documents/fetch` request
+FETCH_PAGE_SIZE = 10_000
+# Integer ids above it are kept in a set, so sparse ids don't allocate a huge bitmap
+BITMAP_MAX_ID = 1 << 30
+# Non-integer ids sorted in memory at once, before being spilled to a temporary file
+SORT_RUN_SIZE = 1_000_000
+
+
+class ReconcileReport(NamedTuple):
+    """The drift found between the database and the index, and the tasks fixing it."""
+
+    documents: int
+    rows: int
+    orphans: int
+    missing: int
+    tracker: TaskTracker
+
+    def __str__(self) -> str:
+        return (
+            f"{self.documents:,} documents, {self.rows:,} rows, "
+            f"{self.orphans:,} orphans, {self.missing:,} missing"
+        )
+
+
+class IdSet:
+    """
+    A set of document ids with a compact representation for large indexes.
+    Integers from 0 to `BITMAP_MAX_ID` are stored in a bitmap, one bit per possible id,
+    so 50M ids up to 50M take about 6MB instead of gigabytes of Python ints.
+    Other ids, such as negative or larger integers, are stored in a regular set.
+    `reconcile` only uses it for integer primary keys, and compares sorted ids otherwise.
+    """
+
+    def __init__(self) -> None:
+        self._bitmap = bytearray()
+        self._others: Set[Any] = set()
+        self._count = 0
+
+    def add(self, id_: Any) -> None:
+        if not _is_bitmap_id(id_):
+            self._others.add(id_)
+            return
+        byte, bit = divmod(id_, 8)
+        if byte >= len(self._bitmap):
+            # Grows geometrically, to amortize the copies
+            size = max(byte + 1, len(self._bitmap) * 2)
+            self._bitmap.extend(bytes(size - len(self._bitmap)))
+        if not self._bitmap[byte] & (1 << bit):
+            self._bitmap[byte] |= 1 << bit
+            self._count += 1
+
+    def discard(self, id_: Any) -> bool:
+        """Removes the id, and returns whether it was in the set."""
+        if not _is_bitmap_id(id_):
+            if id_ in self._others:
+                self._others.remove(id_)
+                return True
+            return False
+        byte, bit = divmod(id_, 8)
+        if byte >= len(self._bitmap) or not self._bitmap[byte] & (1 << bit):
+            return False
+        self._bitmap[byte] &= ~(1 << bit)
+        self._count -= 1
+        return True
+
+    def __len__(self) -> int:
+        return self._count + len(self._others)
+
+    def __iter__(self) -> Iterator[Any]:
+        for byte, value in enumerate(self._bitmap):
+            if value == 0:
+                continue
+            for bit in range(8):
+                if value & (1 << bit):
+                    yield byte * 8 + bit
+        yield from self._others
+
+
+def iter_document_ids(
+    indexer: Type[MeilisearchModelIndexer], page_size: int = FETCH_PAGE_SIZE
+) -> Iterator[Any]:
+    """
+    Streams the ids of all the documents of the index with `iter_documents`,
+    fetching only the primary key of the documents, by pages of `page_size`.
+
+    Args:
+        indexer (Type[MeilisearchModelIndexer]): The indexer
+        page_size (int): The number of documents per request. Defaults to 10,000.
+
+    Yields:
+        Any: The next document id, converted to the type of the model primary key
+    """
+    pk_field = indexer.MODEL_CLASS._meta.pk  # ty: ignore
+    documents = indexer.iter_documents(
+        fields=[indexer.PRIMARY_KEY], page_size=page_size
+    )
+    for document in documents:
+        yield pk_field.to_python(document[indexer.PRIMARY_KEY])
+
+
+def reconcile(
+    indexer: Type[MeilisearchModelIndexer],
+    dry_run: bool = False,
+    page_size: int = FETCH_PAGE_SIZE,
+) -> ReconcileReport:
+    """
+    Finds the drift between the rows of `get_queryset` and the documents of the index,
+    then unindexes the orphan documents and indexes the missing rows.
+    With an integer primary key, the document ids are loaded into an `IdSet`, then the
+    primary keys of the rows are streamed with a primary key cursor and removed from it:
+    the rows that were not in the set are missing, and the ids left in the set are orphans.
+    Other primary keys, such as strings or UUIDs, are sorted on both sides with `iter_sorted`,
+    then compared in a single pass, so only `SORT_RUN_SIZE` ids are held in memory.
+    Both are sent in batches of `BATCH_SIZE`.
+    Documents written while reconciling may be reported as drift, so run it when
+    the index is otherwise up to date, for example after draining the outbox.
+
+    Args:
+        indexer (Type[MeilisearchModelIndexer]): The indexer
+        dry_run (bool): Whether to only count the drift, without fixing it. Defaults to False.
+        page_size (int): The number of document ids per request. Defaults to 10,000.
+
+    Returns:
+        ReconcileReport: The drift counts, and the tasks fixing it
+    """
+    tracker = TaskTracker()
+    orphans = missing = 0
+
+    def on_missing(pks: List[Any]) -> None:
+        nonlocal missing
+        missing += len(pks)
+        if not dry_run:
+            # Their digests may be stale, as their documents are gone
+            indexer._forget_hashes(pks)
+            tracker.add(indexer.index_from_query(Q(pk__in=pks)))
+
+    def on_orphans(ids: List[Any]) -> None:
+        nonlocal orphans
+        orphans += len(ids)
+        if not dry_run:
+            tracker.add(indexer.unindex_multiple(ids))
+
+    document_ids = iter_document_ids(indexer, page_size)
+    queryset = indexer.get_queryset().values_list("pk", flat=True)
+    row_batches = indexer._iter_batches(queryset, pk_getter=lambda pk: pk)
+    diff = _diff_with_bitmap if _has_integer_pk(indexer) else _diff_sorted
+    documents, rows = diff(
+        document_ids, row_batches, indexer.BATCH_SIZE, on_missing, on_orphans
+    )
+    return ReconcileReport(documents, rows, orphans, missing, tracker)
+
+
+def iter_sorted(items: Iterable[Any], run_size: int = SORT_RUN_SIZE) -> Iterator[Any]:
+    """
+    Yields the items in ascending order with an external merge sort: runs of `run_size`
+    items are sorted in memory and spilled to temporary files, then merged lazily,
+    so at most one run is held in memory.
+
+    Args:
+        items (Iterable[Any]): The items, which must be comparable and picklable
+        run_size (int): The number of items sorted in memory at once.
+            Defaults to `SORT_RUN_SIZE`.
+
+    Yields:
+        Any: The next item, in ascending order
+    """
+    runs: List[IO[bytes]] = []
+    try:
+        for chunk in _iter_chunks(items, run_size):
+            chunk.sort()
+            run = tempfile.TemporaryFile()
+            for page in _iter_chunks(chunk, FETCH_PAGE_SIZE):
+                pickle.dump(page, run)
+            run.seek(0)
+            runs.append(run)
+        yield from heapq.merge(*[_iter_run(run) for run in runs])
+    finally:
+        for run in runs:
+            run.close()
+
+
+def _diff_with_bitmap(
+    document_ids: Iterable[Any],
+    row_batches: Iterable[List[Any]],
+    batch_size: int,
+    on_missing: Callable[[List[Any]], None],
+    on_orphans: Callable[[List[Any]], None],
+) -> Tuple[int, int]:
+    documents = IdSet()
+    for id_ in document_ids:
+        documents.add(id_)
+    document_count = len(documents)
+    rows = 0
+    for pks in row_batches:
+        rows += len(pks)
+        missing_pks = [pk for pk in pks if not documents.discard(pk)]
+        if len(missing_pks) > 0:
+            on_missing(missing_pks)
+    for ids in _iter_chunks(documents, batch_size):
+        on_orphans(ids)
+    return document_count, rows
+
+
+def _diff_sorted(
+    document_ids: Iterable[Any],
+    row_batches: Iterable[List[Any]],
+    batch_size: int,
+    on_missing: Callable[[List[Any]], None],
+    on_orphans: Callable[[List[Any]], None],
+) -> Tuple[int, int]:
+    documents = iter_sorted(document_ids, SORT_RUN_SIZE)
+    rows = iter_sorted(chain.from_iterable(row_batches), SORT_RUN_SIZE)
+    document_count = row_count = 0
+    missing: List[Any] = []
+    orphans: List[Any] = []
+    document, row = next(documents, _END), next(rows, _END)
+    while document is not _END or row is not _END:
+        if row is _END or (document is not _END and document < row):
+            orphans.append(document)
+            document_count += 1
+            document = next(documents, _END)
+        elif document is _END or row < document:
+            missing.append(row)
+            row_count += 1
+            row = next(rows, _END)
+        else:
+            document_count += 1
+            row_count += 1
+            document, row = next(documents, _END), next(rows, _END)
+        if len(missing) == batch_size:
+            on_missing(missing)
+            missing = []
+        if len(orphans) == batch_size:
+            on_orphans(orphans)
+            orphans = []
+    if len(missing) > 0:
+        on_missing(missing)
+    if len(orphans) > 0:
+        on_orphans(orphans)
+    return document_count, row_count
+
+
+def _has_integer_pk(indexer: Type[MeilisearchModelIndexer]) -> bool:
+    return isinstance(indexer.MODEL_CLASS._meta.pk, IntegerField)  # ty: ignore
+
+
+def _iter_run(run: IO[bytes]) -> Iterator[Any]:
+    while True:
+        try:
+            yield from pickle.load(run)
+        except EOFError:
+            return
+
+
+def _is_bitmap_id(id_: Any) -> bool:
+    return (
+        isinstance(id_, int) and not isinstance(id_, bool) and 0 <= id_ < BITMAP_MAX_ID
+    )
+
+
+# Marks the end of an iterator in `_diff_sorted`
+_END: Any = object()
+
+
+def _iter_chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    return iter(lambda: list(islice(iterator, size)), [])
@@ -0,0 +1,304 @@
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+from datetime import timedelta
+import multiprocessing
+from time import monotonic
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, Optional, Type
+
+from django.db.models import Q, QuerySet
+from meilisearch.models.task import TaskInfo
+
+from django_meilisearch_indexer.indexers import (
+    MeilisearchModelIndexer,
+    _process_context,
+    _setup_process,
+)
+
+
+class PkRange(NamedTuple):
+    """A shard of the primary key space, `start <= pk < end`, where None is unbounded."""
+
+    start: Optional[Any]
+    end: Optional[Any]
+
+    def as_q(self) -> Q:
+        """Returns the query matching the rows of the shard."""
+        query = Q()
+        if self.start is not None:
+            query &= Q(pk__gte=self.start)
+        if self.end is not None:
+            query &= Q(pk__lt=self.end)
+        return query
+
+
+class ReindexProgress:
+    """
+    The live counters of a reindex, shared with the worker processes.
+
+    Args:
+        total_rows (int): The number of rows to index
+        context (Optional[Any]): The multiprocessing context of the workers. Defaults to None.
+    """
+
+    def __init__(self, total_rows: int, context: Optional[Any] = None) -> None:
+        context = context or multiprocessing.get_context()
+        self.total_rows = total_rows
+        self._rows = context.Value("q", 0)
+        self._bytes = context.Value("q", 0)
+        self.started_at = monotonic()
+
+    @property
+    def rows(self) -> int:
+        """The number of rows built so far."""
+        return self._rows.value
+
+    @property
+    def bytes(self) -> int:
+        """The number of NDJSON bytes uploaded (or encoded, in a dry run) so far."""
+        return self._bytes.value
+
+    @property
+    def elapsed(self) -> float:
+        """The seconds since the start of the reindex."""
+        return monotonic() - self.started_at
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = self.elapsed
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        elapsed = self.elapsed
+        return self.bytes / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[timedelta]:
+        """The estimated remaining time, at the current rate."""
+        rate = self.rows_per_second
+        if rate <= 0:
+            return None
+        remaining = max(self.total_rows - self.rows, 0)
+        return timedelta(seconds=round(remaining / rate))
+
+    def add(self, rows: int = 0, bytes_: int = 0) -> None:
+        """Adds to the counters, from any process."""
+        if rows:
+            with self._rows.get_lock():
+                self._rows.value += rows
+        if bytes_:
+            with self._bytes.get_lock():
+                self._bytes.value += bytes_
+
+    def __str__(self) -> str:
+        percent = self.rows * 100 // self.total_rows if self.total_rows > 0 else 100
+        eta = self.eta
+        return (
+            f"{self.rows:,}/{self.total_rows:,} rows ({percent}%), "
+            f"{self.rows_per_second:,.0f} rows/s, "
+            f"{self.bytes_per_second / 1_000_000:,.1f} MB/s, "
+            f"ETA {eta if eta is not None else '?'}"
+        )
+
+
+def get_pk_ranges(
+    queryset: QuerySet, shards: int, total: Optional[int] = None
+) -> List[PkRange]:
+    """
+    Splits the primary keys of the queryset into shards with about the same number of rows,
+    whatever the gaps in the keys. The first and last shards are unbounded,
+    so rows created during the reindex are still covered.
+    The edges are picked in a single pass over the sorted primary keys,
+    rather than with an `OFFSET` query per edge.
+
+    Args:
+        queryset (QuerySet): The rows to split
+        shards (int): The number of shards
+        total (Optional[int]): The number of rows, if already counted. Defaults to None.
+
+    Returns:
+        List[PkRange]: The shards, in primary key order, empty if there are no rows
+    """
+    total = queryset.count() if total is None else total
+    if total == 0:
+        return []
+    shards = max(1, min(shards, total))
+    positions = {total * i // shards for i in range(1, shards)}
+    edges: List[Optional[Any]] = [None]
+    if len(positions) > 0:
+        pks = queryset.order_by("pk").values_list("pk", flat=True)
+        for position, pk in enumerate(pks.iterator()):
+            if position in positions:
+                edges.append(pk)
+                if len(edges) == shards:
+                    break
+    edges.append(None)
+    return [PkRange(edges[i], edges[i + 1]) for i in range(len(edges) - 1)]
+
+
+def reindex(
+    indexer: Type[MeilisearchModelIndexer],
+    processes: int = 1,
+    shards: Optional[int] = None,
+    atomic: bool = False,
+    dry_run: bool = False,
+    on_progress: Optional[Callable[[ReindexProgress], None]] = None,
+    interval: float = 1.0,
+) -> ReindexProgress:
+    """
+    Indexes all the rows of `get_queryset`, split into primary key shards
+    that are built and uploaded by a pool of worker processes.
+
+    Args:
+        indexer (Type[MeilisearchModelIndexer]): The indexer
+        processes (int): The number of worker processes. 1 runs the shards in this process.
+            Defaults to 1.
+        shards (Optional[int]): The number of shards. Defaults to 4 per process,
+            so fast workers pick up the remaining shards.
+        atomic (bool): Whether to index into a temporary index, swapped with the current one
+            once the tasks of every shard succeeded. Defaults to False.
+        dry_run (bool): Whether to only build and encode the documents, without sending them,
+            to measure the throughput of `build_object`. Defaults to False.
+        on_progress (Optional[Callable[[ReindexProgress], None]]): Called every `interval`
+            seconds, and once at the end. Defaults to None.
+        interval (float): The seconds between two `on_progress` calls. Defaults to 1.
+
+    Returns:
+        ReindexProgress: The final counters
+    """
+    queryset = indexer.get_queryset()
+    total = queryset.count()
+    ranges = get_pk_ranges(queryset, shards or processes * 4, total)
+    context = _process_context()
+    progress = ReindexProgress(total, context)
+    index_name = indexer.index_name()
+    if atomic and not dry_run:
+        index_name = indexer._create_tmp_index()
+    task_uids: List[int] = []
+    try:
+        if processes <= 1:
+            _init_worker(progress)
+            for pk_range in ranges:
+                task_uids += _reindex_shard(indexer, pk_range, index_name, dry_run)
+                if on_progress is not None:
+                    on_progress(progress)
+        else:
+            task_uids = _run_in_processes(
+                indexer,
+                ranges,
+                index_name,
+                dry_run,
+                processes,
+                progress,
+                on_progress,
+                interval,
+            )
+        if index_name != indexer.index_name():
+            indexer._wait_for_tasks(task_uids)
+    except BaseException:
+        if index_name != indexer.index_name():
+            indexer.meilisearch_client().delete_index(index_name)
+        raise
+    if index_name != indexer.index_name():
+        indexer._swap_tmp_index(index_name)
+    if on_progress is not None:
+        on_progress(progress)
+    return progress
+
+
+def _run_in_processes(
+    indexer: Type[MeilisearchModelIndexer],
+    ranges: List[PkRange],
+    index_name: str,
+    dry_run: bool,
+    processes: int,
+    progress: ReindexProgress,
+    on_progress: Optional[Callable[[ReindexProgress], None]],
+    interval: float,
+) -> List[int]:
+    """
+    Runs the shards on a process pool, reporting the progress while waiting,
+    and returns the uids of the enqueued tasks.
+    """
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=_process_context(),
+        initializer=_init_worker,
+        initargs=(progress,),
+    ) as executor:
+        pending = {
+            executor.submit(_reindex_shard, indexer, pk_range, index_name, dry_run)
+            for pk_range in ranges
+        }
+        task_uids: List[int] = []
+        try:
+            while pending:
+                done, pending = wait(
+                    pending, timeout=interval, return_when=FIRST_EXCEPTION
+                )
+                for future in done:
+                    task_uids += future.result()
+                if on_progress is not None and pending:
+                    on_progress(progress)
+        finally:
+            for future in pending:
+                future.cancel()
+    return task_uids
+
+
+# --------------------------------------------------
+# Process pool workers
+# --------------------------------------------------
+_progress: Optional[ReindexProgress] = None
+
+
+def _init_worker(progress: ReindexProgress) -> None:
+    global _progress
+    _setup_process()
+    _progress = progress
+
+
+def _reindex_shard(
+    indexer: Type[MeilisearchModelIndexer],
+    pk_range: PkRange,
+    index_name: str,
+    dry_run: bool,
+) -> List[int]:
+    """
+    Builds the rows of a shard and uploads them, or only encodes them in a dry run.
+    Returns the uids of the enqueued tasks.
+    """
+    progress = _progress
+    assert progress is not None
+    queryset = indexer.get_queryset().filter(pk_range.as_q())
+    counter = _RowCounter(progress)
+    objects = counter.count(indexer._iter_query_objects(queryset))
+    task_uids: List[int] = []
+
+    def on_upload(payload: bytes, task: TaskInfo) -> None:
+        task_uids.append(task.task_uid)
+        counter.flush(len(payload))
+
+    if dry_run:
+        for payload in indexer._iter_payloads(objects):
+            counter.flush(len(payload))
+    else:
+        indexer._add_documents(objects, index_name, on_upload=on_upload)
+    counter.flush(0)
+    return task_uids
+
+
+class _RowCounter:
+    """Counts the built rows locally, and adds them to the shared progress with each payload."""
+
+    def __init__(self, progress: ReindexProgress) -> None:
+        self.progress = progress
+        self.rows = 0
+
+    def count(self, objects: Iterable[Any]) -> Iterator[Any]:
+        for obj in objects:
+            self.rows += 1
+            yield obj
+
+    def flush(self, bytes_: int) -> None:
+        rows, self.rows = self.rows, 0
+        self.progress.add(rows, bytes_)
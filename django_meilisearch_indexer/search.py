@@ -0,0 +1,200 @@
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+    overload,
+)
+
+from django.db.models import QuerySet
+
+from django_meilisearch_indexer.filters import SearchFilter
+from django_meilisearch_indexer.types import (
+    MeilisearchFederatedSearchResults,
+    MeilisearchFederation,
+    MeilisearchSearchParameters,
+    MeilisearchSearchResults,
+)
+
+if TYPE_CHECKING:
+    from django.db.models import Model
+
+    from django_meilisearch_indexer.indexers import MeilisearchModelIndexer
+
+
+M = TypeVar("M", bound="Model")
+
+
+class MultiSearchQuery(NamedTuple):
+    """One search of a `multi_search`, with the same arguments as `indexer.search`."""
+
+    indexer: Type["MeilisearchModelIndexer"]
+    query: str = ""
+    filters: Optional[SearchFilter] = None
+    params: Optional[MeilisearchSearchParameters] = None
+
+
+class SearchInstances(Generic[M]):
+    """
+    The model instances matching a search, in the ranking order of Meilisearch.
+    Nothing is sent until the results are accessed: then a single search fetches
+    the primary keys, and a single `in_bulk` query fetches the rows.
+    Hits whose row no longer exists are skipped, and listed in `missing_ids`.
+
+    Args:
+        indexer (Type[MeilisearchModelIndexer]): The indexer to search with
+        queryset (QuerySet[M]): The queryset to fetch the rows from
+        query (str): The text to search
+        filters (Optional[SearchFilter]): The filters of the search
+        params (MeilisearchSearchParameters): The other search parameters
+    """
+
+    def __init__(
+        self,
+        indexer: Type["MeilisearchModelIndexer[M]"],
+        queryset: QuerySet[M],
+        query: str,
+        filters: Optional[SearchFilter],
+        params: MeilisearchSearchParameters,
+    ) -> None:
+        self.indexer = indexer
+        self.queryset = queryset
+        self.query = query
+        self.filters = filters
+        self.params = params
+        self._results: Optional[MeilisearchSearchResults] = None
+        self._instances: Optional[List[M]] = None
+        self._missing_ids: List[Any] = []
+
+    @property
+    def results(self) -> MeilisearchSearchResults:
+        """The raw search results, with only the primary key of each hit."""
+        if self._results is None:
+            self._results = self.indexer.search(  # ty: ignore
+                self.query, filters=self.filters, **self.params
+            )
+        return self._results  # ty: ignore
+
+    @property
+    def total_hits(self) -> int:
+        """The total number of hits, exact with pages, or estimated otherwise."""
+        results = self.results
+        return results.get("totalHits", results.get("estimatedTotalHits", 0))
+
+    @property
+    def facet_distribution(self) -> Dict[str, Dict[str, int]]:
+        """The number of hits per value of the requested `facets`."""
+        return self.results.get("facetDistribution", {})
+
+    @property
+    def facet_stats(self) -> Dict[str, Dict[str, int]]:
+        """The min and max of the requested numeric `facets`."""
+        return self.results.get("facetStats", {})
+
+    @property
+    def missing_ids(self) -> List[Any]:
+        """The primary keys of the hits without a matching row, i.e. stale documents."""
+        self._fetch()
+        return self._missing_ids
+
+    def __iter__(self) -> Iterator[M]:
+        return iter(self._fetch())
+
+    def __len__(self) -> int:
+        return len(self._fetch())
+
+    @overload
+    def __getitem__(self, index: int) -> M: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[M]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[M, List[M]]:
+        return self._fetch()[index]
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.indexer.__name__} {self.query!r}>"
+
+    def _fetch(self) -> List[M]:
+        """Fetches the rows of the hits once, keeping the ranking order."""
+        if self._instances is None:
+            ids = self.indexer._get_hit_ids(self.results)
+            rows = self.queryset.in_bulk(ids)
+            self._instances = [rows[id_] for id_ in ids if id_ in rows]
+            self._missing_ids = [id_ for id_ in ids if id_ not in rows]
+        return self._instances
+
+
+def multi_search(
+    searches: Sequence[Union[MultiSearchQuery, tuple]],
+    federation: Optional[MeilisearchFederation] = None,
+) -> Union[List[MeilisearchSearchResults], MeilisearchFederatedSearchResults]:
+    """
+    Performs several searches, possibly on different indexes, in a single request.
+
+    Args:
+        searches (Sequence[Union[MultiSearchQuery, tuple]]): The searches to perform,
+            as `(indexer, query, filters, params)` tuples. Only the indexer is required.
+        federation (Optional[MeilisearchFederation]): If set, merges the hits of all
+            the searches into a single ranked list. Defaults to None.
+
+    Returns:
+        Union[List[MeilisearchSearchResults], MeilisearchFederatedSearchResults]:
+            The results of each search, in order, or the federated results
+    """
+    if len(searches) == 0:
+        return _empty_results(federation)
+    queries = _build_queries(searches)
+    client = MultiSearchQuery(*searches[0]).indexer.meilisearch_search_client()
+    if federation is None:
+        return client.multi_search(queries)["results"]  # ty: ignore
+    return client.multi_search(queries, federation)  # ty: ignore
+
+
+async def amulti_search(
+    searches: Sequence[Union[MultiSearchQuery, tuple]],
+    federation: Optional[MeilisearchFederation] = None,
+) -> Union[List[MeilisearchSearchResults], MeilisearchFederatedSearchResults]:
+    """Async version of `multi_search`, with the same arguments."""
+    if len(searches) == 0:
+        return _empty_results(federation)
+    queries = _build_queries(searches)
+    client = MultiSearchQuery(*searches[0]).indexer.async_meilisearch_client()
+    response = await client.multi_search(queries, federation)
+    if federation is None:
+        return response["results"]
+    return response  # ty: ignore
+
+
+def _build_queries(
+    searches: Sequence[Union[MultiSearchQuery, tuple]],
+) -> List[Dict[str, Any]]:
+    """Builds the multi-search queries, with the index name and filter of each indexer."""
+    queries = []
+    for search in searches:
+        indexer, query, filters, params = MultiSearchQuery(*search)
+        queries.append(
+            {
+                **(params or {}),
+                "indexUid": indexer.index_name(),
+                "q": query,
+                "filter": indexer._compile_search_filter(filters),
+            }
+        )
+    return queries
+
+
+def _empty_results(
+    federation: Optional[MeilisearchFederation],
+) -> Union[List[MeilisearchSearchResults], MeilisearchFederatedSearchResults]:
+    if federation is None:
+        return []
+    return {"hits": [], "offset": 0, "limit": 0, "estimatedTotalHits": 0}
@@ -0,0 +1,169 @@
+from collections import defaultdict
+from threading import local
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+from weakref import WeakValueDictionary
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+if TYPE_CHECKING:
+    from django.db.models import Model
+
+    from django_meilisearch_indexer.indexers import MeilisearchModelIndexer
+
+
+class PendingChanges:
+    """
+    Collects the primary keys touched by an indexer during a transaction.
+    Registered with `transaction.on_commit`, it indexes or unindexes all of them at once.
+    If the transaction is rolled back, Django discards the callback and the changes with it.
+    Rows only saved with `update_fields` are kept apart with the document fields to send.
+    """
+
+    def __init__(self, indexer: Type["MeilisearchModelIndexer"]) -> None:
+        self.indexer = indexer
+        self.pks: Set[Any] = set()
+        self.fields: Dict[Any, Set[str]] = {}
+        self._key: Optional[Tuple[str, Type["MeilisearchModelIndexer"]]] = None
+
+    def __call__(self) -> None:
+        """Syncs the touched rows with the index."""
+        if self._key is not None and _get_registry().get(self._key) is self:
+            # Changes made from here on belong to another transaction
+            del _get_registry()[self._key]
+        if len(self.pks) > 0:
+            self.indexer.sync_multiple(list(self.pks))
+        groups: Dict[FrozenSet[str], List[Any]] = defaultdict(list)
+        for pk, fields in self.fields.items():
+            groups[frozenset(fields)].append(pk)
+        for fields, pks in groups.items():
+            self.indexer.sync_fields(pks, sorted(fields))
+
+    def add(self, pk: Any, fields: Optional[List[str]] = None) -> None:
+        """
+        Marks a row as changed.
+
+        Args:
+            pk (Any): The primary key of the row
+            fields (Optional[List[str]]): Only these document fields changed.
+                Defaults to None, meaning the whole document.
+        """
+        if fields is None:
+            self.pks.add(pk)
+            self.fields.pop(pk, None)
+        elif pk not in self.pks:
+            self.fields.setdefault(pk, set()).update(fields)
+
+    @classmethod
+    def for_transaction(
+        cls, indexer: Type["MeilisearchModelIndexer"], using: Optional[str] = None
+    ) -> "PendingChanges":
+        """
+        Returns the pending changes of the indexer for the current transaction,
+        registering a new one with `transaction.on_commit` if needed.
+        They are tracked per thread, database and indexer, and only weakly referenced:
+        when a transaction or savepoint is rolled back, Django drops its callbacks,
+        so the next change registers new pending changes.
+
+        Args:
+            indexer (Type[MeilisearchModelIndexer]): The indexer
+            using (Optional[str]): The database alias. Defaults to None.
+
+        Returns:
+            PendingChanges: The pending changes of the current transaction
+        """
+        connection = transaction.get_connection(using)
+        registry = _get_registry()
+        key = (connection.alias, indexer)
+        changes = registry.get(key)
+        if changes is None:
+            changes = cls(indexer)
+            changes._key = key
+            transaction.on_commit(changes, using=connection.alias)
+            registry[key] = changes
+        return changes
+
+
+def connect(
+    indexer: Type["MeilisearchModelIndexer"],
+    use_outbox: bool = False,
+    use_update_fields: bool = False,
+) -> None:
+    """
+    Connects the `post_save` and `post_delete` signals of the indexer model.
+
+    Args:
+        indexer (Type[MeilisearchModelIndexer]): The indexer
+        use_outbox (bool): Whether to write outbox entries instead of indexing on commit.
+            Defaults to False.
+        use_update_fields (bool): Whether saves with `update_fields` should only send
+            the matching document fields. Ignored with the outbox. Defaults to False.
+    """
+
+    def on_change(
+        sender: Type["Model"], instance: "Model", using: str, **kwargs: Any
+    ) -> None:
+        if kwargs.get("raw", False):
+            return
+        if use_outbox:
+            # The outbox requires `django_meilisearch_indexer` in `INSTALLED_APPS`
+            from django_meilisearch_indexer import outbox
+            from django_meilisearch_indexer.models import MeilisearchOutboxEntry
+
+            operation = (
+                MeilisearchOutboxEntry.Operation.INDEX
+                if kwargs["signal"] is post_save
+                else MeilisearchOutboxEntry.Operation.UNINDEX
+            )
+            outbox.enqueue(indexer, [instance.pk], operation, using=using)
+            return
+        fields = None
+        update_fields = kwargs.get("update_fields")
+        if use_update_fields and update_fields is not None:
+            fields = indexer.get_document_fields(update_fields)
+        if transaction.get_connection(using).in_atomic_block:
+            PendingChanges.for_transaction(indexer, using).add(instance.pk, fields)
+        else:
+            changes = PendingChanges(indexer)
+            changes.add(instance.pk, fields)
+            changes()
+
+    dispatch_uid = _dispatch_uid(indexer)
+    post_save.connect(
+        on_change, sender=indexer.MODEL_CLASS, weak=False, dispatch_uid=dispatch_uid
+    )
+    post_delete.connect(
+        on_change, sender=indexer.MODEL_CLASS, weak=False, dispatch_uid=dispatch_uid
+    )
+
+
+def disconnect(indexer: Type["MeilisearchModelIndexer"]) -> None:
+    """Disconnects the signals connected by `connect`."""
+    dispatch_uid = _dispatch_uid(indexer)
+    post_save.disconnect(sender=indexer.MODEL_CLASS, dispatch_uid=dispatch_uid)
+    post_delete.disconnect(sender=indexer.MODEL_CLASS, dispatch_uid=dispatch_uid)
+
+
+_pending = local()
+
+
+def _get_registry() -> "WeakValueDictionary[Tuple[str, Any], PendingChanges]":
+    """Returns the pending changes registered by the current thread."""
+    registry = getattr(_pending, "registry", None)
+    if registry is None:
+        registry = _pending.registry = WeakValueDictionary()
+    return registry
+
+
+def _dispatch_uid(indexer: Type["MeilisearchModelIndexer"]) -> str:
+    return f"django_meilisearch_indexer:{indexer.__module__}.{indexer.__qualname__}"
@@ -0,0 +1,258 @@
+import asyncio
+from datetime import timedelta
+from time import monotonic, sleep
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from meilisearch import Client
+from meilisearch.errors import MeilisearchError, MeilisearchTimeoutError
+from meilisearch.models.task import Task, TaskInfo
+
+from django_meilisearch_indexer.transport import get_transport
+
+if TYPE_CHECKING:
+    from django_meilisearch_indexer.async_client import AsyncMeilisearchClient
+
+# Task uids per `GET /tasks` request, to keep the URLs short
+POLL_BATCH_SIZE = 500
+MIN_POLL_INTERVAL = 0.05
+MAX_POLL_INTERVAL = 1.0
+DEFAULT_TIMEOUT = timedelta(minutes=10)
+
+FINISHED_STATUSES = {"succeeded", "failed", "canceled"}
+
+
+class MeilisearchTaskError(MeilisearchError):
+    """Raised when a Meilisearch task failed or was canceled."""
+
+    def __init__(self, task: Task) -> None:
+        self.task = task
+        super().__init__(f"Task {task.uid} {task.status}: {task.error}")
+
+
+class TaskTracker:
+    """
+    Collects the tasks enqueued by write operations, to wait for all of them at once
+    with a single polling loop over `GET /tasks?uids=...` instead of one request per task.
+    The interval between two polls starts at `MIN_POLL_INTERVAL` and doubles
+    up to `MAX_POLL_INTERVAL` while tasks are pending.
+    The write methods of the indexers return a tracker, and trackers can be merged with `add`.
+    Callbacks registered with `add_done_callback` are called once all the tasks are finished,
+    when `wait` or `async_wait` notices it.
+
+    Args:
+        tasks (Iterable[Union[int, TaskInfo, Dict[str, Any], TaskTracker]]): The tasks
+            to track, as uids, `TaskInfo`, task dicts of the async client, or trackers.
+            Defaults to none.
+    """
+
+    def __init__(
+        self, tasks: Iterable[Union[int, TaskInfo, Dict[str, Any], "TaskTracker"]] = ()
+    ) -> None:
+        self.task_uids: List[int] = []
+        self.tasks: Dict[int, Task] = {}
+        self._callbacks: List[Callable[[], None]] = []
+        for task in tasks:
+            self.add(task)
+
+    def add(
+        self, task: Union[int, TaskInfo, Dict[str, Any], "TaskTracker"]
+    ) -> "TaskTracker":
+        """Tracks another task, or the tasks of another tracker, and returns the tracker."""
+        if isinstance(task, TaskTracker):
+            uids = task.task_uids
+            self.tasks.update(task.tasks)
+            for callback in task._callbacks:
+                self.add_done_callback(callback)
+        elif isinstance(task, TaskInfo):
+            uids = [task.task_uid]
+        elif isinstance(task, dict):
+            uids = [task["taskUid"]]
+        else:
+            uids = [task]
+        known = set(self.task_uids)
+        self.task_uids.extend(uid for uid in uids if uid not in known)
+        return self
+
+    def add_done_callback(self, callback: Callable[[], None]) -> "TaskTracker":
+        """
+        Calls `callback` once all the tasks are finished, whether they succeeded or not,
+        the first time `wait` or `async_wait` notices it. Returns the tracker.
+        A callback that was already registered is only called once.
+        """
+        if callback not in self._callbacks:
+            self._callbacks.append(callback)
+        return self
+
+    def __len__(self) -> int:
+        return len(self.task_uids)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.task_uids)
+
+    def __repr__(self) -> str:
+        return f"<TaskTracker: {len(self.tasks)}/{len(self.task_uids)} finished>"
+
+    @property
+    def done(self) -> bool:
+        """Whether all the tasks are finished."""
+        return len(self.tasks) == len(self.task_uids)
+
+    @property
+    def failed(self) -> List[Task]:
+        """The finished tasks that failed or were canceled."""
+        return [task for task in self.tasks.values() if task.status != "succeeded"]
+
+    @property
+    def errors(self) -> Dict[int, Dict[str, Any]]:
+        """The errors of the failed tasks, by uid."""
+        return {task.uid: task.error or {} for task in self.failed}
+
+    @property
+    def durations(self) -> Dict[int, timedelta]:
+        """The processing time of the finished tasks, by uid."""
+        return {
+            task.uid: task.finished_at - task.started_at
+            for task in self.tasks.values()
+            if task.started_at is not None and task.finished_at is not None
+        }
+
+    @property
+    def latencies(self) -> Dict[int, timedelta]:
+        """The time between the enqueuing and the end of the finished tasks, by uid."""
+        return {
+            task.uid: task.finished_at - task.enqueued_at
+            for task in self.tasks.values()
+            if task.finished_at is not None
+        }
+
+    def wait(
+        self,
+        timeout: timedelta = DEFAULT_TIMEOUT,
+        raise_on_failure: bool = True,
+        client: Optional[Client] = None,
+    ) -> List[Task]:
+        """
+        Waits for all the pending tasks.
+
+        Args:
+            timeout (timedelta): How long to wait for all of them. Defaults to 10 minutes.
+            raise_on_failure (bool): Whether to raise as soon as a task failed.
+                Otherwise, failed tasks are returned like the others. Defaults to True.
+            client (Optional[Client]): The client to use. Defaults to the shared one.
+
+        Returns:
+            List[Task]: The finished tasks, in the order they were added
+
+        Raises:
+            MeilisearchTaskError: If `raise_on_failure` and a task failed or was canceled
+            MeilisearchTimeoutError: If some tasks are still pending after the timeout
+        """
+        client = client or get_transport().client
+        deadline = monotonic() + timeout.total_seconds()
+        interval = MIN_POLL_INTERVAL
+        while True:
+            for params in self._get_poll_params():
+                results = client.get_tasks(params).results
+                self._update(results, raise_on_failure)
+            if self.done:
+                self._run_callbacks()
+                return [self.tasks[uid] for uid in self.task_uids]
+            sleep(self._get_delay(deadline, interval, timeout))
+            interval = min(interval * 2, MAX_POLL_INTERVAL)
+
+    async def async_wait(
+        self,
+        timeout: timedelta = DEFAULT_TIMEOUT,
+        raise_on_failure: bool = True,
+        client: Optional["AsyncMeilisearchClient"] = None,
+    ) -> List[Task]:
+        """
+        Async version of `wait`, using the async client of the running event loop.
+        Requires `httpx`, installed with the `async` extra.
+        """
+        from django_meilisearch_indexer.async_client import get_async_client
+
+        client = client or get_async_client(
+            settings.MEILISEARCH_HOST, settings.MEILISEARCH_API_KEY
+        )
+        deadline = monotonic() + timeout.total_seconds()
+        interval = MIN_POLL_INTERVAL
+        while True:
+            for params in self._get_poll_params():
+                response = await client.get_tasks(params)
+                results = [Task(**task) for task in response["results"]]  # ty: ignore
+                self._update(results, raise_on_failure)
+            if self.done:
+                await sync_to_async(self._run_callbacks, thread_sensitive=False)()
+                return [self.tasks[uid] for uid in self.task_uids]
+            await asyncio.sleep(self._get_delay(deadline, interval, timeout))
+            interval = min(interval * 2, MAX_POLL_INTERVAL)
+
+    def _get_poll_params(self) -> List[Dict[str, Any]]:
+        """Returns the parameters of the requests polling the pending tasks."""
+        pending = [uid for uid in self.task_uids if uid not in self.tasks]
+        return [
+            {
+                "uids": [str(uid) for uid in pending[i : i + POLL_BATCH_SIZE]],
+                "limit": len(pending[i : i + POLL_BATCH_SIZE]),
+            }
+            for i in range(0, len(pending), POLL_BATCH_SIZE)
+        ]
+
+    def _update(self, results: List[Task], raise_on_failure: bool) -> None:
+        """Stores the finished tasks, and raises on failures if needed."""
+        for task in results:
+            if task.status not in FINISHED_STATUSES:
+                continue
+            self.tasks[task.uid] = task
+            if raise_on_failure and task.status != "succeeded":
+                raise MeilisearchTaskError(task)
+
+    def _run_callbacks(self) -> None:
+        """Calls the done callbacks, and forgets them so they are only called once."""
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def _get_delay(self, deadline: float, interval: float, timeout: timedelta) -> float:
+        """Returns the delay before the next poll, or raises if the deadline has passed."""
+        remaining = deadline - monotonic()
+        if remaining <= 0:
+            pending = len(self.task_uids) - len(self.tasks)
+            raise MeilisearchTimeoutError(
+                f"{pending} tasks still pending after {timeout}"
+            )
+        return min(interval, remaining)
+
+
+def wait_for_tasks(
+    client: Client, task_uids: Iterable[int], timeout: timedelta = DEFAULT_TIMEOUT
+) -> List[Task]:
+    """
+    Waits for all the tasks with a single polling loop, like `TaskTracker.wait`.
+
+    Args:
+        client (Client): The Meilisearch client
+        task_uids (Iterable[int]): The uids of the tasks
+        timeout (timedelta): How long to wait for all of them. Defaults to 10 minutes.
+
+    Returns:
+        List[Task]: The finished tasks, in the order of `task_uids`
+
+    Raises:
+        MeilisearchTaskError: If one of the tasks failed or was canceled
+        MeilisearchTimeoutError: If some tasks are still pending after the timeout
+    """
+    return TaskTracker(task_uids).wait(timeout, client=client)
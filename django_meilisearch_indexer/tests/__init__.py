@@ -0,0 +1,78 @@
+from typing import TYPE_CHECKING, List
+
+import django
+from django.conf import settings
+from django.core.management import call_command
+
+# --------------------------------------------------
+# Django setup
+# --------------------------------------------------
+settings.configure(
+    INSTALLED_APPS=[
+        "django_meilisearch_indexer",
+        "django_meilisearch_indexer.tests",
+    ],
+    DATABASES={
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            # Shared between threads, for the async ORM
+            "NAME": "file:django_meilisearch_indexer?mode=memory&cache=shared",
+        }
+    },
+    DEFAULT_AUTO_FIELD="django.db.models.AutoField",
+    MEILISEARCH_HOST="http://localhost:7700",
+    MEILISEARCH_API_KEY="meilisearch_local_master_key",
+)
+django.setup()
+
+# --------------------------------------------------
+# Django migrations
+# --------------------------------------------------
+call_command("makemigrations", "tests")
+call_command("migrate")
+
+if TYPE_CHECKING:
+    from django_meilisearch_indexer.tests.models import User
+
+
+# --------------------------------------------------
+# Helpers
+# --------------------------------------------------
+def wait_for_pending_tasks() -> None:
+    """
+    Waits for all the enqueued and processing tasks, for the writes
+    whose tasks are not returned, such as the cleanups after a failure.
+    """
+    from django_meilisearch_indexer.tasks import TaskTracker
+    from django_meilisearch_indexer.transport import get_transport
+
+    client = get_transport().client
+    tasks = client.get_tasks({"statuses": ["enqueued", "processing"]}).results
+    TaskTracker(task.uid for task in tasks).wait(raise_on_failure=False)
+
+
+def create_users(domain: str, count: int = 5, last_name: str = "Last") -> List["User"]:
+    """
+    Creates active users numbered from 0, with emails ending with `@{domain}.com`
+    so the test case can delete them in its teardown.
+
+    Args:
+        domain (str): The email domain, without the `.com` suffix
+        count (int): The number of users. Defaults to 5.
+        last_name (str): The last name prefix, for searches. Defaults to "Last".
+
+    Returns:
+        List[User]: The users, whose `age` is their number
+    """
+    from django_meilisearch_indexer.tests.models import User
+
+    return [
+        User.objects.create(  # ty: ignore
+            first_name=f"First {i}",
+            last_name=f"{last_name} {i}",
+            email=f"{i}@{domain}.com",
+            is_active=True,
+            age=i,
+        )
+        for i in range(count)
+    ]
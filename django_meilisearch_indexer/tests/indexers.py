@@ -0,0 +1,78 @@
+from typing import Any, Dict
+
+from django_meilisearch_indexer.indexers import MeilisearchModelIndexer
+from django_meilisearch_indexer.tests.models import Address, User
+
+
+class UserIndexer(MeilisearchModelIndexer[User]):
+    MODEL_CLASS = User
+    PRIMARY_KEY = "id"
+    SETTINGS = {
+        "filterableAttributes": ["is_active"],
+        "searchableAttributes": ["full_name"],
+        "sortableAttributes": ["age"],
+    }
+    UPDATED_AT_FIELD = "updated_at"
+
+    @classmethod
+    def build_object(cls, instance: User) -> Dict[str, Any]:
+        return {
+            "id": instance.id,  # ty: ignore
+            "full_name": instance.full_name,
+            "is_active": instance.is_active,
+            "age": instance.age,
+        }
+
+    @classmethod
+    def index_name(cls) -> str:
+        return "test_users"
+
+
+class UserFieldsIndexer(MeilisearchModelIndexer[User]):
+    MODEL_CLASS = User
+    PRIMARY_KEY = "id"
+    SETTINGS = UserIndexer.SETTINGS
+    FIELDS = {
+        "id": "id",
+        "first_name": "first_name",
+        "last_name": "last_name",
+        "email": ("email", str.upper),
+        "is_active": "is_active",
+        "age": "age",
+    }
+
+    @classmethod
+    def index_name(cls) -> str:
+        return "test_users"
+
+
+class UserAddressIndexer(MeilisearchModelIndexer[User]):
+    MODEL_CLASS = User
+    PRIMARY_KEY = "id"
+    SETTINGS = UserIndexer.SETTINGS
+    DEBUG_QUERIES = True
+
+    @classmethod
+    def build_object(cls, instance: User) -> Dict[str, Any]:
+        return {
+            "id": instance.id,  # ty: ignore
+            "cities": [address.city for address in instance.addresses.all()],  # ty: ignore
+        }
+
+    @classmethod
+    def index_name(cls) -> str:
+        return "test_users"
+
+
+class AddressIndexer(MeilisearchModelIndexer[Address]):
+    MODEL_CLASS = Address
+    PRIMARY_KEY = "id"
+    SETTINGS = {
+        "filterableAttributes": ["user_id"],
+        "searchableAttributes": ["city"],
+    }
+    FIELDS = {"id": "id", "city": "city", "user_id": "user_id"}
+
+    @classmethod
+    def index_name(cls) -> str:
+        return "test_addresses"
@@ -0,0 +1,25 @@
+from django.db import models
+
+
+class User(models.Model):
+    first_name = models.CharField(max_length=255)
+    last_name = models.CharField(max_length=255)
+    email = models.CharField(max_length=255)
+    is_active = models.BooleanField()
+    age = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name} {self.last_name}"
+
+    class Meta:
+        app_label = "tests"
+
+
+class Address(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="addresses")
+    city = models.CharField(max_length=255)
+
+    class Meta:
+        app_label = "tests"
@@ -0,0 +1,161 @@
+import asyncio
+from typing import Any, Dict, List
+from unittest import IsolatedAsyncioTestCase, skipIf
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Q
+from meilisearch import Client
+
+from django_meilisearch_indexer.async_client import close_async_clients, httpx
+from django_meilisearch_indexer.cache import LocalSearchCache
+from django_meilisearch_indexer.tests import create_users
+from django_meilisearch_indexer.tests.indexers import (
+    UserAddressIndexer,
+    UserFieldsIndexer,
+    UserIndexer,
+)
+from django_meilisearch_indexer.tests.models import Address, User
+
+
+@skipIf(httpx is None, "httpx is not installed")
+class AsyncIndexerTestCase(IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.meilisearch_client = Client(
+            settings.MEILISEARCH_HOST, settings.MEILISEARCH_API_KEY
+        )
+        cls.users = create_users("async", last_name="Async")
+        # Every other user is inactive, for the filters
+        for user in cls.users[1::2]:
+            user.is_active = False
+        User.objects.bulk_update(cls.users, ["is_active"])  # ty: ignore
+        for user in cls.users:
+            Address.objects.create(user=user, city=f"City {user.age}")  # ty: ignore
+        return super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        User.objects.filter(email__endswith="@async.com").delete()  # ty: ignore
+        return super().tearDownClass()
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.meilisearch_client.delete_index(UserIndexer.index_name())
+
+    async def asyncTearDown(self) -> None:
+        await close_async_clients()
+        await super().asyncTearDown()
+
+    def tearDown(self) -> None:
+        self.meilisearch_client.delete_index(UserIndexer.index_name())
+        super().tearDown()
+
+    def _get_documents(self) -> Dict[int, Dict[str, Any]]:
+        index = self.meilisearch_client.index(UserIndexer.index_name())
+        results = index.get_documents({"limit": 1000})
+        return {document.id: dict(document) for document in results.results}
+
+    @property
+    def user_ids(self) -> List[int]:
+        return [user.pk for user in self.users]
+
+    async def test_async_wait(self) -> None:
+        tracker = await UserIndexer.amaybe_create_index()
+        tracker.add(await UserIndexer.aindex_multiple(self.users))
+        tasks = await tracker.async_wait()
+        self.assertEqual([task.uid for task in tasks], tracker.task_uids)
+        self.assertTrue(all(task.status == "succeeded" for task in tasks))
+        self.assertEqual(len(self._get_documents()), len(self.users))
+
+    async def test_amaybe_create_index(self) -> None:
+        self.assertFalse(await UserIndexer.aindex_exists())
+        await (await UserIndexer.amaybe_create_index()).async_wait()
+        self.assertTrue(await UserIndexer.aindex_exists())
+        index = self.meilisearch_client.index(UserIndexer.index_name())
+        self.assertEqual(index.get_settings()["sortableAttributes"], ["age"])
+
+    async def test_aindex_multiple_instances(self) -> None:
+        tracker = await UserIndexer.amaybe_create_index()
+        tracker.add(await UserIndexer.aindex_multiple(self.users))
+        await tracker.async_wait()
+        documents = await sync_to_async(self._get_documents)()
+        self.assertEqual(sorted(documents), self.user_ids)
+        self.assertEqual(documents[self.users[0].pk]["full_name"], "First 0 Async 0")
+
+    async def test_aindex_multiple_queryset(self) -> None:
+        tracker = await UserIndexer.amaybe_create_index()
+        queryset = User.objects.filter(email__endswith="@async.com")  # ty: ignore
+        with patch.multiple(UserIndexer, BATCH_SIZE=2, MAX_BATCH_DOCUMENTS=1):
+            tracker.add(await UserIndexer.aindex_multiple(queryset))
+        await tracker.async_wait()
+        documents = await sync_to_async(self._get_documents)()
+        self.assertEqual(sorted(documents), self.user_ids)
+
+    async def test_aindex_from_query_with_fields(self) -> None:
+        tracker = await UserFieldsIndexer.amaybe_create_index()
+        query = Q(email__endswith="@async.com", is_active=True)
+        with patch.multiple(UserFieldsIndexer, BATCH_SIZE=2, INDEXING_CONCURRENCY=2):
+            tracker.add(await UserFieldsIndexer.aindex_from_query(query))
+        await tracker.async_wait()
+        documents = await sync_to_async(self._get_documents)()
+        self.assertEqual(sorted(documents), self.user_ids[::2])
+        self.assertEqual(documents[self.users[0].pk]["email"], "0@ASYNC.COM")
+
+    async def test_aindex_from_query_with_prefetch(self) -> None:
+        tracker = await UserAddressIndexer.amaybe_create_index()
+        query = Q(email__endswith="@async.com")
+        with patch.multiple(
+            UserAddressIndexer, BATCH_SIZE=2, PREFETCH_RELATED=["addresses"]
+        ):
+            tracker.add(await UserAddressIndexer.aindex_from_query(query))
+        await tracker.async_wait()
+        documents = await sync_to_async(self._get_documents)()
+        self.assertEqual(sorted(documents), self.user_ids)
+        self.assertEqual(documents[self.users[1].pk]["cities"], ["City 1"])
+
+    async def test_aunindex_multiple(self) -> None:
+        tracker = await UserIndexer.amaybe_create_index()
+        tracker.add(await UserIndexer.aindex_multiple(self.users))
+        tracker.add(await UserIndexer.aunindex_multiple(self.user_ids[:2]))
+        await tracker.async_wait()
+        documents = await sync_to_async(self._get_documents)()
+        self.assertEqual(sorted(documents), self.user_ids[2:])
+
+    async def test_asearch(self) -> None:
+        tracker = await UserIndexer.amaybe_create_index()
+        tracker.add(await UserIndexer.aindex_multiple(self.users))
+        await tracker.async_wait()
+        results = await UserIndexer.asearch(
+            "Async", filters={"eq": [("is_active", True)]}, sort=["age:desc"]
+        )
+        self.assertEqual(
+            [hit["id"] for hit in results["hits"]],
+            [self.users[4].pk, self.users[2].pk, self.users[0].pk],
+        )
+        hits = await UserIndexer.asearch("Async 3", only_hits=True)
+        self.assertEqual(list(hits), ["hits"])
+
+    async def test_asearch_cache(self) -> None:
+        cache = LocalSearchCache()
+        await (await UserIndexer.amaybe_create_index()).async_wait()
+        with patch.object(UserIndexer, "SEARCH_CACHE", cache):
+            await (await UserIndexer.aindex_multiple(self.users[:1])).async_wait()
+            first = await UserIndexer.asearch("Async")
+            second = await UserIndexer.asearch("Async")
+            await (await UserIndexer.aindex_multiple(self.users[1:])).async_wait()
+            third = await UserIndexer.asearch("Async")
+        self.assertEqual(first["hits"], second["hits"])  # ty: ignore
+        self.assertEqual(len(third["hits"]), 5)  # ty: ignore
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 2)
+
+    async def test_concurrent_searches(self) -> None:
+        tracker = await UserIndexer.amaybe_create_index()
+        tracker.add(await UserIndexer.aindex_multiple(self.users))
+        await tracker.async_wait()
+        results = await asyncio.gather(
+            *[UserIndexer.asearch(f"Async {i}", only_hits=True) for i in range(5)]
+        )
+        self.assertEqual(len(results), 5)
@@ -0,0 +1,167 @@
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import CommandError
+from meilisearch import Client
+from meilisearch.errors import MeilisearchApiError
+from meilisearch.index import Index
+
+from django_meilisearch_indexer import bootstrap
+from django_meilisearch_indexer.bootstrap import (
+    FINGERPRINT_CACHE_KEY,
+    bootstrap_indexes,
+    get_indexers,
+    get_indexers_by_name,
+    get_settings_fingerprint,
+)
+from django_meilisearch_indexer.indexers import MeilisearchModelIndexer
+from django_meilisearch_indexer.tasks import MeilisearchTaskError, TaskTracker
+from django_meilisearch_indexer.tests.indexers import (
+    AddressIndexer,
+    UserFieldsIndexer,
+    UserIndexer,
+)
+
+
+class SettingsDiffTestCase(TestCase):
+    def test_same_settings(self) -> None:
+        current = {
+            "filterableAttributes": ["age", "is_active"],
+            "searchableAttributes": ["full_name"],
+            "typoTolerance": {"enabled": True, "disableOnWords": ["a", "b"]},
+            "synonyms": {"nyc": ["new york"]},
+        }
+        with patch.object(
+            UserIndexer,
+            "SETTINGS",
+            {
+                "filterableAttributes": ["is_active", "age"],
+                "typoTolerance": {"disableOnWords": ["b", "a"]},
+                "synonyms": {"nyc": ["new york"]},
+            },
+        ):
+            self.assertEqual(UserIndexer.get_settings_diff(current), {})
+
+    def test_different_settings(self) -> None:
+        current = {
+            "searchableAttributes": ["first_name", "last_name"],
+            "sortableAttributes": ["age"],
+            "typoTolerance": {"enabled": True},
+            "synonyms": {"nyc": ["new york"], "sf": ["san francisco"]},
+        }
+        desired = {
+            "searchableAttributes": ["last_name", "first_name"],
+            "sortableAttributes": ["age", "created_at"],
+            "typoTolerance": {"enabled": False},
+            "synonyms": {"nyc": ["new york"]},
+            "distinctAttribute": "email",
+        }
+        with patch.object(UserIndexer, "SETTINGS", desired):
+            self.assertEqual(UserIndexer.get_settings_diff(current), desired)
+
+
+class IndexSetupTestCase(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.meilisearch_client = Client(
+            settings.MEILISEARCH_HOST, settings.MEILISEARCH_API_KEY
+        )
+        TaskTracker(
+            self.meilisearch_client.delete_index(indexer.index_name())
+            for indexer in [UserIndexer, AddressIndexer]
+        ).wait(raise_on_failure=False)
+        cache.delete(FINGERPRINT_CACHE_KEY)
+
+    def tearDown(self) -> None:
+        for indexer in [UserIndexer, AddressIndexer]:
+            self.meilisearch_client.delete_index(indexer.index_name())
+        super().tearDown()
+
+    def test_index_exists(self) -> None:
+        self.assertFalse(UserIndexer.index_exists())
+        UserIndexer.maybe_create_index().wait()
+        self.assertTrue(UserIndexer.index_exists())
+
+    def test_index_exists_error(self) -> None:
+        response = MagicMock(status_code=403, text='{"code": "invalid_api_key"}')
+        client = MagicMock()
+        client.get_index.side_effect = MeilisearchApiError("", response)
+        with patch.object(UserIndexer, "meilisearch_client", return_value=client):
+            with self.assertRaises(MeilisearchApiError):
+                UserIndexer.index_exists()
+
+    def test_maybe_create_index_diff(self) -> None:
+        UserIndexer.maybe_create_index().wait()
+        with patch.object(Index, "update_settings") as mock:
+            UserIndexer.maybe_create_index()
+        mock.assert_not_called()
+        settings_ = {**UserIndexer.SETTINGS, "sortableAttributes": ["age", "id"]}
+        with (
+            patch.object(UserIndexer, "SETTINGS", settings_),
+            patch.object(Index, "update_settings") as mock,
+        ):
+            UserIndexer.maybe_create_index()
+        mock.assert_called_once_with({"sortableAttributes": ["age", "id"]})
+
+    def test_bootstrap_indexes(self) -> None:
+        indexers = [UserIndexer, AddressIndexer]
+        self.assertEqual(bootstrap_indexes(indexers), ["test_users", "test_addresses"])
+        self.assertTrue(AddressIndexer.index_exists())
+        self.assertEqual(
+            self.meilisearch_client.index("test_addresses").get_settings()[
+                "filterableAttributes"
+            ],
+            ["user_id"],
+        )
+        self.assertEqual(bootstrap_indexes(indexers), [])
+        settings_ = {**AddressIndexer.SETTINGS, "sortableAttributes": ["city"]}
+        with patch.object(AddressIndexer, "SETTINGS", settings_):
+            self.assertEqual(bootstrap_indexes(indexers), ["test_addresses"])
+
+    def test_fingerprint(self) -> None:
+        indexers = [UserIndexer, AddressIndexer]
+        bootstrap_indexes(indexers, fingerprint_cache="default")
+        with patch.object(bootstrap, "_get_index_names") as mock:
+            self.assertEqual(
+                bootstrap_indexes(indexers, fingerprint_cache="default"), []
+            )
+        mock.assert_not_called()
+        fingerprint = get_settings_fingerprint(indexers)
+        settings_ = {**AddressIndexer.SETTINGS, "sortableAttributes": ["city"]}
+        with patch.object(AddressIndexer, "SETTINGS", settings_):
+            self.assertNotEqual(get_settings_fingerprint(indexers), fingerprint)
+            self.assertEqual(
+                bootstrap_indexes(indexers, fingerprint_cache="default"),
+                ["test_addresses"],
+            )
+
+    def test_fingerprint_failed_task(self) -> None:
+        error = MeilisearchTaskError(MagicMock(uid=1, status="failed"))
+        with patch.object(TaskTracker, "wait", side_effect=error):
+            with self.assertRaises(MeilisearchTaskError):
+                bootstrap_indexes([UserIndexer], fingerprint_cache="default")
+        self.assertIsNone(cache.get(FINGERPRINT_CACHE_KEY))
+
+    def test_get_indexers(self) -> None:
+        indexers = get_indexers(autodiscover=False)
+        self.assertIn(UserIndexer, indexers)
+        self.assertIn(AddressIndexer, indexers)
+        self.assertNotIn(UserFieldsIndexer, indexers)
+        self.assertNotIn(MeilisearchModelIndexer, indexers)
+
+    def test_get_indexers_by_name(self) -> None:
+        self.assertEqual(get_indexers_by_name([]), get_indexers())
+        self.assertEqual(
+            get_indexers_by_name(
+                [
+                    "UserIndexer",
+                    AddressIndexer.index_name(),
+                    "django_meilisearch_indexer.tests.indexers.UserFieldsIndexer",
+                ]
+            ),
+            [UserIndexer, AddressIndexer, UserFieldsIndexer],
+        )
+        with self.assertRaises(CommandError):
+            get_indexers_by_name(["UnknownIndexer"])
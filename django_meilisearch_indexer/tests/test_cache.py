@@ -0,0 +1,127 @@
+from typing import Any, Dict
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import caches
+
+from django_meilisearch_indexer.cache import DjangoSearchCache, LocalSearchCache
+from django_meilisearch_indexer.tests.indexers import UserFieldsIndexer, UserIndexer
+
+
+class LocalSearchCacheTestCase(TestCase):
+    def test_get_set(self) -> None:
+        cache = LocalSearchCache()
+        self.assertIsNone(cache.get("key"))
+        results: Dict[str, Any] = {"hits": [{"id": 1}]}
+        cache.set("key", results)  # ty: ignore
+        cached = cache.get("key")
+        self.assertEqual(cached, results)
+        cached["hits"].clear()  # ty: ignore
+        self.assertEqual(cache.get("key"), results)
+
+    def test_lru(self) -> None:
+        cache = LocalSearchCache(max_size=2)
+        cache.set("a", {"hits": []})  # ty: ignore
+        cache.set("b", {"hits": []})  # ty: ignore
+        cache.get("a")
+        cache.set("c", {"hits": []})  # ty: ignore
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_timeout(self) -> None:
+        cache = LocalSearchCache(timeout=10)
+        with patch("django_meilisearch_indexer.cache.monotonic", return_value=100):
+            cache.set("key", {"hits": []})  # ty: ignore
+        with patch("django_meilisearch_indexer.cache.monotonic", return_value=109):
+            self.assertIsNotNone(cache.get("key"))
+        with patch("django_meilisearch_indexer.cache.monotonic", return_value=110):
+            self.assertIsNone(cache.get("key"))
+
+    def test_version(self) -> None:
+        cache = LocalSearchCache()
+        version = cache.get_version("index")
+        self.assertEqual(cache.get_version("index"), version)
+        cache.bump_version("index")
+        self.assertNotEqual(cache.get_version("index"), version)
+        self.assertEqual(cache.get_version("other"), version)
+
+
+class DjangoSearchCacheTestCase(TestCase):
+    def tearDown(self) -> None:
+        caches["default"].clear()
+        super().tearDown()
+
+    def test_get_set(self) -> None:
+        cache = DjangoSearchCache()
+        self.assertIsNone(cache.get("key"))
+        cache.set("key", {"hits": [{"id": 1}]})  # ty: ignore
+        self.assertEqual(cache.get("key"), {"hits": [{"id": 1}]})
+
+    def test_version(self) -> None:
+        cache = DjangoSearchCache()
+        version = cache.get_version("index")
+        self.assertEqual(DjangoSearchCache().get_version("index"), version)
+        cache.bump_version("index")
+        self.assertNotEqual(DjangoSearchCache().get_version("index"), version)
+
+
+class IndexerSearchCacheTestCase(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.cache = LocalSearchCache()
+        self.client = MagicMock()
+        self.search_mock = self.client.index.return_value.search
+        self.search_mock.return_value = {"hits": [{"id": 1}], "query": "john"}
+        for indexer in [UserIndexer, UserFieldsIndexer]:
+            for method in ["meilisearch_client", "meilisearch_search_client"]:
+                patch.object(indexer, method, return_value=self.client).start()
+            patch.object(indexer, "SEARCH_CACHE", self.cache).start()
+        self.addCleanup(patch.stopall)
+
+    def test_search(self) -> None:
+        UserIndexer.search("john", filters={"eq": [("is_active", True)]})
+        results = UserIndexer.search("john", filters={"eq": [("is_active", True)]})
+        hits = UserIndexer.search(
+            "john", only_hits=True, filters={"eq": [("is_active", True)]}
+        )
+        self.assertEqual(results, {"hits": [{"id": 1}], "query": "john"})
+        self.assertEqual(hits, {"hits": [{"id": 1}]})
+        self.assertEqual(self.search_mock.call_count, 1)
+        self.assertEqual(
+            self.cache.stats(), {"hits": 2, "misses": 1, "hit_rate": 2 / 3}
+        )
+
+    def test_key(self) -> None:
+        UserIndexer.search("john", limit=10, offset=0)
+        UserIndexer.search("john", offset=0, limit=10)
+        UserIndexer.search("john", limit=20, offset=0)
+        UserIndexer.search("jane", limit=10, offset=0)
+        UserIndexer.search(
+            "john", limit=10, offset=0, filters={"eq": [("is_active", True)]}
+        )
+        self.assertEqual(self.search_mock.call_count, 4)
+
+    def test_invalidation(self) -> None:
+        UserIndexer.search("john")
+        UserIndexer._add_documents([{"id": 1}], UserIndexer.index_name())
+        UserIndexer.search("john")
+        UserIndexer.unindex_multiple([1])
+        UserIndexer.search("john")
+        UserIndexer._add_documents([{"id": 1}], "other_index")
+        UserIndexer.search("john")
+        self.assertEqual(self.search_mock.call_count, 3)
+
+    def test_shared_index(self) -> None:
+        UserIndexer.search("john")
+        UserFieldsIndexer.unindex_multiple([1])
+        UserIndexer.search("john")
+        self.assertEqual(self.search_mock.call_count, 2)
+
+    def test_failed_upload(self) -> None:
+        self.client.index.return_value.add_documents_ndjson.side_effect = ValueError
+        UserIndexer.search("john")
+        with self.assertRaises(ValueError):
+            UserIndexer._add_documents([{"id": 1}], UserIndexer.index_name())
+        UserIndexer.search("john")
+        self.assertEqual(self.search_mock.call_count, 2)
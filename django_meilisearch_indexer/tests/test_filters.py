@@ -0,0 +1,194 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from django.conf import settings
+from meilisearch import Client
+from meilisearch.errors import MeilisearchApiError
+
+from django_meilisearch_indexer.filters import (
+    Attribute,
+    Condition,
+    Filter,
+    Param,
+    _compile,
+    build_filter,
+    check_filterable,
+    format_value,
+)
+from django_meilisearch_indexer.tests.indexers import UserIndexer
+from django_meilisearch_indexer.tests.models import User
+
+
+class FormatValueTestCase(TestCase):
+    def test_safe_values(self) -> None:
+        self.assertEqual(format_value("paris"), "paris")
+        self.assertEqual(format_value("fr-FR.utf_8"), "fr-FR.utf_8")
+        self.assertEqual(format_value(12), "12")
+        self.assertEqual(format_value(-1.5), "-1.5")
+        self.assertEqual(format_value(True), "true")
+
+    def test_quoted_values(self) -> None:
+        self.assertEqual(format_value("New York"), '"New York"')
+        self.assertEqual(format_value('say "hi"'), '"say \\"hi\\""')
+        self.assertEqual(format_value("back\\slash"), '"back\\\\slash"')
+        self.assertEqual(format_value("AND"), '"AND"')
+        self.assertEqual(format_value(""), '""')
+
+    def test_invalid_values(self) -> None:
+        with self.assertRaises(ValueError):
+            format_value(None)
+        with self.assertRaises(ValueError):
+            format_value(float("nan"))
+
+
+class FilterExpressionTestCase(TestCase):
+    def test_conditions(self) -> None:
+        self.assertEqual((Attribute("age") >= 18).render(), "age >= 18")
+        self.assertEqual((Attribute("city") != "Le Mans").render(), 'city != "Le Mans"')
+        self.assertEqual(
+            Attribute("city").one_of(["Paris", "Le Mans"]).render(),
+            'city IN [Paris, "Le Mans"]',
+        )
+        self.assertEqual(Attribute("age").between(18, 30).render(), "age 18 TO 30")
+        self.assertEqual(Attribute("email").is_null().render(), "email IS NULL")
+        self.assertEqual(Attribute("tags").is_empty().render(), "tags IS EMPTY")
+        self.assertEqual(
+            Attribute("address.city").exists().render(), "address.city EXISTS"
+        )
+
+    def test_composition(self) -> None:
+        age = Attribute("age")
+        expression = (Attribute("is_active") == True) & (  # noqa: E712
+            (age < 18) | (age > 65)
+        )
+        self.assertEqual(
+            expression.render(), "is_active = true AND (age < 18 OR age > 65)"
+        )
+        expression = ~(age > 18) & ~(Attribute("a") == 1) & Attribute("b").is_null()
+        self.assertEqual(
+            expression.render(), "NOT age > 18 AND NOT a = 1 AND b IS NULL"
+        )
+        self.assertEqual(
+            (~((age > 1) & (age < 5)) | (age == 0)).render(),
+            "NOT (age > 1 AND age < 5) OR age = 0",
+        )
+        self.assertEqual(~~(age > 1), age > 1)
+
+    def test_params(self) -> None:
+        expression = (Attribute("city") == Param("city")) & Attribute("age").one_of(
+            Param("ages")
+        )
+        self.assertEqual(
+            expression.render(city="New York", ages=[18, 19]),
+            'city = "New York" AND age IN [18, 19]',
+        )
+        self.assertEqual(
+            expression.bind(city="Paris", ages=[]).render(),
+            "city = Paris AND age IN []",
+        )
+        with self.assertRaises(ValueError):
+            expression.render(city="Paris")
+        with self.assertRaises(ValueError):
+            expression.render(city="Paris", ages=[], other=1)
+
+    def test_template_cache(self) -> None:
+        def build(age: int) -> Filter:
+            return (Attribute("city") == Param("city")) & (Attribute("cache_age") > age)
+
+        self.assertEqual(build(18).compile().parts[0], "city = ")
+        # Cached by shape, whatever the literal values
+        info = _compile.cache_info()
+        self.assertEqual(
+            build(30).render(city="Paris"), "city = Paris AND cache_age > 30"
+        )
+        self.assertEqual(build(40).compile().params, {"city"})
+        self.assertEqual(_compile.cache_info().misses, info.misses)
+        self.assertEqual(_compile.cache_info().hits, info.hits + 2)
+
+    def test_list_values(self) -> None:
+        expression = Condition("tags", "IN", ["a", "b c"]) | Condition(
+            "age", "TO", [1, 2]
+        )
+        self.assertEqual(expression.render(), 'tags IN [a, "b c"] OR age 1 TO 2')
+
+    def test_invalid_attribute(self) -> None:
+        with self.assertRaises(ValueError):
+            Attribute("age OR 1")
+
+    def test_attributes(self) -> None:
+        expression = (Attribute("a") == 1) | ~Attribute("b.c").exists()
+        self.assertEqual(expression.attributes(), {"a", "b.c"})
+
+
+class BuildFilterTestCase(TestCase):
+    def test_escaping(self) -> None:
+        self.assertEqual(
+            build_filter({"eq": [("city", 'Le "Mans"')], "one_of": [("n", ["a b"])]}),
+            'n IN ["a b"] AND city = "Le \\"Mans\\""',
+        )
+
+    def test_template_cache(self) -> None:
+        build_filter({"eq": [("city", "Paris")]})
+        with patch(
+            "django_meilisearch_indexer.filters.FilterTemplate.__init__"
+        ) as mock:
+            self.assertEqual(build_filter({"eq": [("city", "Lyon")]}), "city = Lyon")
+        mock.assert_not_called()
+
+    def test_invalid_attribute(self) -> None:
+        with self.assertRaises(ValueError):
+            build_filter({"eq": [("a = 1 OR b", 1)]})
+
+
+class CheckFilterableTestCase(TestCase):
+    def test_check_filterable(self) -> None:
+        check_filterable(["a", "b.c", "tag_id"], ["a", "b", "*_id"])
+        check_filterable(["a"], [{"attributePatterns": ["a"]}])
+        with self.assertRaises(ValueError):
+            check_filterable(["ab"], ["a"])
+        with self.assertRaises(ValueError):
+            check_filterable(["a"], [])
+
+
+class SearchFilterTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.meilisearch_client = Client(
+            settings.MEILISEARCH_HOST, settings.MEILISEARCH_API_KEY
+        )
+        cls.meilisearch_client.delete_index(UserIndexer.index_name())
+        tracker = UserIndexer.maybe_create_index()
+        cls.user = User.objects.create(  # ty: ignore
+            first_name="John",
+            last_name="Filters",
+            email="john@filters.com",
+            is_active=True,
+            age=30,
+        )
+        tracker.add(UserIndexer.index(cls.user)).wait()
+        return super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.meilisearch_client.delete_index(UserIndexer.index_name())
+        User.objects.filter(email__endswith="@filters.com").delete()  # ty: ignore
+        return super().tearDownClass()
+
+    def test_expression(self) -> None:
+        active = Attribute("is_active") == Param("active")
+        results = UserIndexer.search("Filters", filters=active.bind(active=True))
+        self.assertEqual(len(results["hits"]), 1)
+        results = UserIndexer.search("Filters", filters=active.bind(active=False))
+        self.assertEqual(len(results["hits"]), 0)
+
+    def test_validation(self) -> None:
+        with patch.object(UserIndexer, "meilisearch_search_client") as mock:
+            with self.assertRaises(ValueError):
+                UserIndexer.search(filters=Attribute("age") > 18)
+            with self.assertRaises(ValueError):
+                UserIndexer.search(filters={"eq": [("age", 18)]})
+        mock.assert_not_called()
+        with patch.object(UserIndexer, "VALIDATE_FILTERS", False):
+            results = UserIndexer.search_instances(filters={"eq": [("age", 18)]})
+            with self.assertRaises(MeilisearchApiError):
+                list(results)
@@ -1,80 +1,41 @@
+from datetime import datetime, timedelta
+import json
+from threading import Lock
 from time import sleep
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, Iterable, List, Type, Union
 from unittest import TestCase
+from unittest.mock import MagicMock, patch
+import warnings
 
-import django
 from django.conf import settings
-from django.core.management import call_command
-from django.db import models
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
 from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from meilisearch import Client
+from meilisearch.models.task import TaskInfo
 
 from django_meilisearch_indexer.indexers import MeilisearchModelIndexer
+from django_meilisearch_indexer.models import MeilisearchSyncState
+from django_meilisearch_indexer.tasks import MeilisearchTaskError, TaskTracker
+from django_meilisearch_indexer.tests import create_users
+from django_meilisearch_indexer.tests.indexers import (
+    UserAddressIndexer,
+    UserFieldsIndexer,
+    UserIndexer,
+)
+from django_meilisearch_indexer.tests.models import Address, User
+from django_meilisearch_indexer.transport import PooledHttpRequests
 from django_meilisearch_indexer.types import (
     MeilisearchSearchHits,
     MeilisearchSearchResults,
 )
 
-# --------------------------------------------------
-# Django setup
-# --------------------------------------------------
-settings.configure(
-    INSTALLED_APPS=[
-        "django_meilisearch_indexer.tests",
-    ],
-    DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}},
-    DEFAULT_AUTO_FIELD="django.db.models.AutoField",
-    MEILISEARCH_HOST="http://localhost:7700",
-    MEILISEARCH_API_KEY="meilisearch_local_master_key",
-)
-django.setup()
-
-
-# --------------------------------------------------
-# App setup
-# --------------------------------------------------
-class User(models.Model):
-    first_name = models.CharField(max_length=255)
-    last_name = models.CharField(max_length=255)
-    email = models.CharField(max_length=255)
-    is_active = models.BooleanField()
-    age = models.IntegerField()
-
-    @property
-    def full_name(self) -> str:
-        return f"{self.first_name} {self.last_name}"
-
-    class Meta:
-        app_label = "tests"
-
-
-class UserIndexer(MeilisearchModelIndexer[User]):
-    MODEL_CLASS = User
-    PRIMARY_KEY = "id"
-    SETTINGS = {
-        "filterableAttributes": ["is_active"],
-        "searchableAttributes": ["full_name"],
-        "sortableAttributes": ["age"],
-    }
-
-    @classmethod
-    def build_object(cls, instance: User) -> Dict[str, Any]:
-        return {
-            "id": instance.id,  # ty: ignore
-            "full_name": instance.full_name,
-            "is_active": instance.is_active,
-            "age": instance.age,
-        }
-
-    @classmethod
-    def index_name(cls) -> str:
-        return "test_users"
-
-
 # --------------------------------------------------
 # Tests
 # --------------------------------------------------
-SLEEP_TIME = 0.1
 
 
 class UserIndexerTestCase(TestCase):
@@ -101,30 +62,30 @@ class UserIndexerTestCase(TestCase):
 
     def setUp(self) -> None:
         super().setUp()
-        self.meilisearch_client.delete_index(UserIndexer.index_name())
-        sleep(SLEEP_TIME)
+        task = self.meilisearch_client.delete_index(UserIndexer.index_name())
+        TaskTracker([task]).wait(raise_on_failure=False)
 
     def tearDown(self) -> None:
         self.meilisearch_client.delete_index(UserIndexer.index_name())
         super().tearDown()
 
+    def _create_index(self, indexer: Type[MeilisearchModelIndexer]) -> None:
+        task = self.meilisearch_client.create_index(indexer.index_name())
+        TaskTracker([task]).wait()
+
     def test_index_exists(self) -> None:
         self.assertFalse(UserIndexer.index_exists())
-        self.meilisearch_client.create_index(UserIndexer.index_name())
-        sleep(SLEEP_TIME)
+        self._create_index(UserIndexer)
         self.assertTrue(UserIndexer.index_exists())
 
     def test_maybe_create_index(self) -> None:
         self.assertFalse(UserIndexer.index_exists())
-        UserIndexer.maybe_create_index()
-        sleep(SLEEP_TIME)
+        UserIndexer.maybe_create_index().wait()
         self.assertTrue(UserIndexer.index_exists())
 
     def test_update_settings(self) -> None:
-        self.meilisearch_client.create_index(UserIndexer.index_name())
-        sleep(SLEEP_TIME)
-        UserIndexer.update_settings()
-        sleep(SLEEP_TIME)
+        self._create_index(UserIndexer)
+        UserIndexer.update_settings().wait()
         response = self.meilisearch_client.index(
             UserIndexer.index_name()
         ).get_settings()
@@ -132,99 +93,167 @@ class UserIndexerTestCase(TestCase):
             self.assertEqual(response[key], value)
 
     def test_index(self) -> None:
-        self.meilisearch_client.create_index(UserIndexer.index_name())
-        sleep(SLEEP_TIME)
+        self._create_index(UserIndexer)
         response = self.meilisearch_client.index(UserIndexer.index_name()).search(
             self.user_1.full_name
         )
         self.assertSearchHits(response, [])
-        UserIndexer.index(self.user_1)
-        sleep(SLEEP_TIME)
+        UserIndexer.index(self.user_1).wait()
         response = self.meilisearch_client.index(UserIndexer.index_name()).search(
             self.user_1.full_name
         )
         self.assertSearchHits(response, [self.user_1])
 
     def test_index_multiple(self) -> None:
-        self.meilisearch_client.create_index(UserIndexer.index_name())
-        sleep(SLEEP_TIME)
+        self._create_index(UserIndexer)
         response = self.meilisearch_client.index(UserIndexer.index_name()).search("")
         self.assertSearchHits(response, [])
-        UserIndexer.index_multiple([self.user_1, self.user_2])
-        sleep(SLEEP_TIME)
+        UserIndexer.index_multiple([self.user_1, self.user_2]).wait()
         response = self.meilisearch_client.index(UserIndexer.index_name()).search("")
         self.assertSearchHits(response, [self.user_1, self.user_2])
 
+    def test_index_multiple_in_payloads(self) -> None:
+        self._create_index(UserIndexer)
+        with patch.multiple(UserIndexer, BATCH_SIZE=1, MAX_BATCH_DOCUMENTS=1):
+            UserIndexer.index_multiple(User.objects.all()).wait()  # ty: ignore
+        response = self.meilisearch_client.index(UserIndexer.index_name()).search("")
+        self.assertSearchHits(response, [self.user_1, self.user_2])
+
+    def test_index_all_from_fields(self) -> None:
+        self._create_index(UserFieldsIndexer)
+        with patch.object(UserFieldsIndexer, "BATCH_SIZE", 1):
+            UserFieldsIndexer.index_all().wait()
+        response = self.meilisearch_client.index(UserIndexer.index_name()).search("")
+        self.assertSearchHits(response, [self.user_1, self.user_2])
+        hit = next(hit for hit in response["hits"] if hit["id"] == self.user_1.id)
+        self.assertEqual(hit["email"], "A@A.COM")
+
     def test_index_from_query(self) -> None:
-        self.meilisearch_client.create_index(UserIndexer.index_name())
-        sleep(SLEEP_TIME)
+        self._create_index(UserIndexer)
         response = self.meilisearch_client.index(UserIndexer.index_name()).search(
             self.user_1.full_name
         )
         self.assertSearchHits(response, [])
-        UserIndexer.index_from_query(Q(id=self.user_1.id))
-        sleep(SLEEP_TIME)
+        UserIndexer.index_from_query(Q(id=self.user_1.id)).wait()
         response = self.meilisearch_client.index(UserIndexer.index_name()).search(
             self.user_1.full_name
         )
         self.assertSearchHits(response, [self.user_1])
 
     def test_index_all(self) -> None:
-        self.meilisearch_client.create_index(UserIndexer.index_name())
-        sleep(SLEEP_TIME)
+        self._create_index(UserIndexer)
         response = self.meilisearch_client.index(UserIndexer.index_name()).search("")
         self.assertSearchHits(response, [])
-        UserIndexer.index_all()
-        sleep(SLEEP_TIME)
+        UserIndexer.index_all().wait()
+        response = self.meilisearch_client.index(UserIndexer.index_name()).search("")
+        self.assertSearchHits(response, [self.user_1, self.user_2])
+
+    def test_index_all_in_batches(self) -> None:
+        self._create_index(UserIndexer)
+        with patch.object(UserIndexer, "BATCH_SIZE", 1):
+            UserIndexer.index_all().wait()
+        response = self.meilisearch_client.index(UserIndexer.index_name()).search("")
+        self.assertSearchHits(response, [self.user_1, self.user_2])
+
+    def test_index_all_concurrently(self) -> None:
+        self._create_index(UserIndexer)
+        with patch.multiple(UserIndexer, BATCH_SIZE=1, INDEXING_CONCURRENCY=2):
+            UserIndexer.index_all().wait()
+        response = self.meilisearch_client.index(UserIndexer.index_name()).search("")
+        self.assertSearchHits(response, [self.user_1, self.user_2])
+
+    def test_index_with_processes(self) -> None:
+        self._create_index(UserIndexer)
+        with patch.multiple(UserIndexer, BATCH_SIZE=1, BUILD_PROCESSES=2):
+            UserIndexer.index_multiple([self.user_1]).wait()
+            response = self.meilisearch_client.index(UserIndexer.index_name()).search(
+                ""
+            )
+            self.assertSearchHits(response, [self.user_1])
+            UserIndexer.index_all().wait()
+        response = self.meilisearch_client.index(UserIndexer.index_name()).search("")
+        self.assertSearchHits(response, [self.user_1, self.user_2])
+
+    def test_index_with_processes_in_transaction(self) -> None:
+        self._create_index(UserIndexer)
+        on_commit = MagicMock()
+        with transaction.atomic():
+            transaction.on_commit(on_commit)
+            with (
+                patch.multiple(UserIndexer, BATCH_SIZE=1, BUILD_PROCESSES=2),
+                patch.object(connection, "close") as close,
+            ):
+                UserIndexer.index_all().wait()
+            close.assert_not_called()
+            self.assertTrue(connection.in_atomic_block)
+            self.assertTrue(User.objects.filter(pk=self.user_1.pk).exists())  # ty: ignore
+        on_commit.assert_called_once()
         response = self.meilisearch_client.index(UserIndexer.index_name()).search("")
         self.assertSearchHits(response, [self.user_1, self.user_2])
 
     def test_index_all_atomically(self) -> None:
-        self.meilisearch_client.create_index(UserIndexer.index_name())
-        sleep(SLEEP_TIME)
+        self._create_index(UserIndexer)
         response = self.meilisearch_client.index(UserIndexer.index_name()).search("")
         self.assertEqual(response["hits"], [])
-        UserIndexer.index_all_atomically()
-        sleep(SLEEP_TIME)
+        UserIndexer.index_all_atomically().wait()
         response = self.meilisearch_client.index(UserIndexer.index_name()).search("")
         self.assertSearchHits(response, [self.user_1, self.user_2])
 
     def test_unindex(self) -> None:
-        self.meilisearch_client.create_index(UserIndexer.index_name())
-        sleep(SLEEP_TIME)
-        UserIndexer.index(self.user_1)
-        sleep(SLEEP_TIME)
+        self._create_index(UserIndexer)
+        UserIndexer.index(self.user_1).wait()
         response = self.meilisearch_client.index(UserIndexer.index_name()).search(
             self.user_1.full_name
         )
         self.assertSearchHits(response, [self.user_1])
-        UserIndexer.unindex(self.user_1.id)
-        sleep(SLEEP_TIME)
+        UserIndexer.unindex(self.user_1.id).wait()
         response = self.meilisearch_client.index(UserIndexer.index_name()).search(
             self.user_1.full_name
         )
         self.assertSearchHits(response, [])
 
     def test_unindex_multiple(self) -> None:
-        self.meilisearch_client.create_index(UserIndexer.index_name())
-        sleep(SLEEP_TIME)
-        UserIndexer.index_multiple([self.user_1, self.user_2])
-        sleep(SLEEP_TIME)
+        self._create_index(UserIndexer)
+        UserIndexer.index_multiple([self.user_1, self.user_2]).wait()
         response = self.meilisearch_client.index(UserIndexer.index_name()).search("")
         self.assertSearchHits(response, [self.user_1, self.user_2])
-        UserIndexer.unindex_multiple([self.user_1.id, self.user_2.id])
-        sleep(SLEEP_TIME)
+        UserIndexer.unindex_multiple([self.user_1.id, self.user_2.id]).wait()
         response = self.meilisearch_client.index(UserIndexer.index_name()).search("")
         self.assertSearchHits(response, [])
 
+    def test_unindex_by_filter(self) -> None:
+        UserIndexer.maybe_create_index().add(
+            UserIndexer.index_multiple([self.user_1, self.user_2])
+        ).wait()
+        UserIndexer.unindex_by_filter({"eq": [("is_active", False)]}).wait()
+        response = self.meilisearch_client.index(UserIndexer.index_name()).search("")
+        self.assertSearchHits(response, [self.user_1])
+        with self.assertRaises(ValueError):
+            UserIndexer.unindex_by_filter({})
+        with self.assertRaises(ValueError):
+            UserIndexer.unindex_by_filter({"eq": [("age", 30)]})
+
+    def test_unindex_from_query(self) -> None:
+        UserIndexer.maybe_create_index().add(UserIndexer.index_all()).wait()
+        query = Q(pk__in=[self.user_1.id, self.user_2.id])
+        with patch.object(UserIndexer, "BATCH_SIZE", 1):
+            tracker = UserIndexer.unindex_from_query(query)
+        self.assertEqual(len(tracker), 2)
+        tracker.wait()
+        response = self.meilisearch_client.index(UserIndexer.index_name()).search(
+            "", {"limit": 1000}
+        )
+        ids = {hit["id"] for hit in response["hits"]}
+        self.assertNotIn(self.user_1.id, ids)
+        self.assertNotIn(self.user_2.id, ids)
+        self.assertEqual(len(UserIndexer.unindex_from_query(Q(pk=-1))), 0)
+
     def test_search(self) -> None:
-        self.meilisearch_client.create_index(UserIndexer.index_name())
+        self._create_index(UserIndexer)
         search_value = self.user_1.full_name
-        sleep(SLEEP_TIME)
         response = UserIndexer.search(search_value)
         self.assertSearchHits(response, [])
-        UserIndexer.index(self.user_1)
-        sleep(SLEEP_TIME)
+        UserIndexer.index(self.user_1).wait()
         response = UserIndexer.search(search_value)
         self.assertSearchHits(response, [self.user_1])
         self.assertEqual(response.get("limit"), 20)
@@ -249,6 +278,691 @@ class UserIndexerTestCase(TestCase):
         )
 
 
+class IterBatchesTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.users = create_users("batch")
+        return super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        User.objects.filter(email__endswith="@batch.com").delete()  # ty: ignore
+        return super().tearDownClass()
+
+    def test_batches_follow_pk_order(self) -> None:
+        queryset = User.objects.filter(email__endswith="@batch.com")  # ty: ignore
+        with patch.object(UserIndexer, "BATCH_SIZE", 2):
+            batches = list(UserIndexer._iter_batches(queryset.order_by("-age")))
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        pks = [user.pk for batch in batches for user in batch]
+        self.assertEqual(pks, [user.pk for user in self.users])
+
+    def test_uses_pk_cursor(self) -> None:
+        queryset = User.objects.filter(email__endswith="@batch.com")  # ty: ignore
+        with patch.object(UserIndexer, "BATCH_SIZE", 2):
+            with CaptureQueriesContext(connection) as context:
+                list(UserIndexer._iter_batches(queryset))
+        self.assertEqual(len(context.captured_queries), 3)
+        for query in context.captured_queries:
+            self.assertNotIn("COUNT(", query["sql"])
+            self.assertNotIn("OFFSET", query["sql"])
+
+    def test_stops_on_exact_multiple(self) -> None:
+        queryset = User.objects.filter(email__endswith="@batch.com")  # ty: ignore
+        with patch.object(UserIndexer, "BATCH_SIZE", 5):
+            with CaptureQueriesContext(connection) as context:
+                batches = list(UserIndexer._iter_batches(queryset))
+        self.assertEqual([len(batch) for batch in batches], [5])
+        self.assertEqual(len(context.captured_queries), 2)
+
+
+class AddDocumentsTestCase(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.lock = Lock()
+        self.uploads: List[bytes] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        client = MagicMock()
+        client.index.return_value.add_documents_ndjson.side_effect = self._upload
+        patcher = patch.object(UserIndexer, "meilisearch_client", return_value=client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _upload(self, payload: bytes) -> None:
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        sleep(0.01)
+        if payload == b'{"id": -1}\n':
+            raise ValueError("Upload failed")
+        with self.lock:
+            self.uploads.append(payload)
+            self.in_flight -= 1
+
+    def test_sequential(self) -> None:
+        objects = [{"id": i} for i in range(5)]
+        with patch.object(UserIndexer, "MAX_BATCH_DOCUMENTS", 1):
+            UserIndexer._add_documents(objects, "index")
+        self.assertEqual(self.uploads, [f'{{"id": {i}}}\n'.encode() for i in range(5)])
+        self.assertEqual(self.max_in_flight, 1)
+
+    def test_empty(self) -> None:
+        UserIndexer._add_documents([], "index")
+        self.assertEqual(self.uploads, [])
+
+    def test_concurrent(self) -> None:
+        objects = [{"id": i} for i in range(10)]
+        with patch.multiple(UserIndexer, MAX_BATCH_DOCUMENTS=1, INDEXING_CONCURRENCY=3):
+            UserIndexer._add_documents(objects, "index")
+        self.assertEqual(len(self.uploads), 10)
+        self.assertGreater(self.max_in_flight, 1)
+        self.assertLessEqual(self.max_in_flight, 3)
+
+    def test_concurrent_error(self) -> None:
+        objects = [{"id": -1}] + [{"id": i} for i in range(5)]
+        with patch.multiple(UserIndexer, MAX_BATCH_DOCUMENTS=1, INDEXING_CONCURRENCY=2):
+            with self.assertRaises(ValueError):
+                UserIndexer._add_documents(objects, "index")
+
+
+class DocumentHashCacheTestCase(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.meilisearch_client = Client(
+            settings.MEILISEARCH_HOST, settings.MEILISEARCH_API_KEY
+        )
+        self._reset_index({"primaryKey": "id"})
+        self.uploads: List[bytes] = []
+        self.client = MagicMock()
+        self.client.index.return_value.add_documents_ndjson.side_effect = self._upload
+        patch.object(
+            UserIndexer, "meilisearch_client", return_value=self.client
+        ).start()
+        patch.multiple(
+            UserIndexer, DOCUMENT_HASH_CACHE="default", MAX_BATCH_DOCUMENTS=2
+        ).start()
+        self.addCleanup(patch.stopall)
+        self.addCleanup(caches["default"].clear)
+
+    def _reset_index(self, options: Dict[str, Any]) -> None:
+        index_name = UserIndexer.index_name()
+        tracker = TaskTracker([self.meilisearch_client.delete_index(index_name)])
+        tracker.wait(raise_on_failure=False)
+        TaskTracker([self.meilisearch_client.create_index(index_name, options)]).wait()
+
+    def _upload(self, payload: bytes) -> TaskInfo:
+        if b'"fail": true' in payload:
+            raise ValueError("Upload failed")
+        self.uploads.append(payload)
+        index = self.meilisearch_client.index(UserIndexer.index_name())
+        return index.add_documents_ndjson(payload)
+
+    def _uploaded_ids(self) -> List[int]:
+        lines = b"".join(self.uploads).splitlines()
+        return [json.loads(line)["id"] for line in lines]
+
+    def test_skips_unchanged(self) -> None:
+        objects = [{"id": i, "age": i} for i in range(5)]
+        UserIndexer._add_documents(objects, UserIndexer.index_name()).wait()
+        self.assertEqual(self._uploaded_ids(), [0, 1, 2, 3, 4])
+        self.uploads.clear()
+        objects[1]["age"] = 10
+        objects[3] = {"age": 3, "id": 3}  # Key order does not matter
+        UserIndexer._add_documents(objects, UserIndexer.index_name()).wait()
+        self.assertEqual(self._uploaded_ids(), [1])
+
+    def test_stored_once_waited(self) -> None:
+        objects = [{"id": i} for i in range(3)]
+        tracker = UserIndexer._add_documents(objects, UserIndexer.index_name())
+        tracker.add(UserIndexer._add_documents(objects, UserIndexer.index_name()))
+        self.assertEqual(self._uploaded_ids(), [0, 1, 2, 0, 1, 2])
+        tracker.wait()
+        self.uploads.clear()
+        UserIndexer._add_documents(objects, UserIndexer.index_name()).wait()
+        self.assertEqual(self.uploads, [])
+
+    def test_concurrent(self) -> None:
+        objects = [{"id": i} for i in range(10)]
+        with patch.object(UserIndexer, "INDEXING_CONCURRENCY", 3):
+            UserIndexer._add_documents(objects, UserIndexer.index_name()).wait()
+            self.uploads.clear()
+            UserIndexer._add_documents(objects, UserIndexer.index_name()).wait()
+        self.assertEqual(self.uploads, [])
+
+    def test_failed_upload_is_not_stored(self) -> None:
+        objects = [{"id": 0}, {"id": 1}, {"id": 2, "fail": True}, {"id": 3}]
+        with self.assertRaises(ValueError):
+            UserIndexer._add_documents(objects, UserIndexer.index_name())
+        objects[2]["fail"] = False
+        self.uploads.clear()
+        UserIndexer._add_documents(objects, UserIndexer.index_name()).wait()
+        self.assertEqual(self._uploaded_ids(), [0, 1, 2, 3])
+
+    def test_failed_task_is_not_stored(self) -> None:
+        # The documents have no `uid`, so the tasks fail once processed
+        self._reset_index({"primaryKey": "uid"})
+        objects = [{"id": i} for i in range(3)]
+        tracker = UserIndexer._add_documents(objects, UserIndexer.index_name())
+        self.assertEqual(len(tracker.wait(raise_on_failure=False)), 2)
+        self.assertEqual(len(tracker.failed), 2)
+        self._reset_index({"primaryKey": "id"})
+        self.uploads.clear()
+        UserIndexer._add_documents(objects, UserIndexer.index_name()).wait()
+        self.assertEqual(self._uploaded_ids(), [0, 1, 2])
+
+    def test_other_index(self) -> None:
+        objects = [{"id": i} for i in range(3)]
+        UserIndexer._add_documents(objects, UserIndexer.index_name()).wait()
+        UserIndexer._add_documents(objects, "test_users_tmp").wait()
+        self.assertEqual(self._uploaded_ids(), [0, 1, 2, 0, 1, 2])
+
+    def test_partial(self) -> None:
+        self.client.index.return_value.update_documents_ndjson.side_effect = (
+            self._upload
+        )
+        objects = [{"id": i, "age": i} for i in range(3)]
+        UserIndexer._add_documents(objects, UserIndexer.index_name()).wait()
+        tracker = UserIndexer._add_documents(
+            [{"id": 1}], UserIndexer.index_name(), partial=True
+        )
+        tracker.wait()
+        index_mock = self.client.index.return_value
+        index_mock.update_documents_ndjson.assert_called_once_with(b'{"id": 1}\n')
+        self.uploads.clear()
+        UserIndexer._add_documents(objects, UserIndexer.index_name()).wait()
+        self.assertEqual(self._uploaded_ids(), [1])
+
+    def test_unindex_and_clear(self) -> None:
+        objects = [{"id": i} for i in range(3)]
+        UserIndexer._add_documents(objects, UserIndexer.index_name()).wait()
+        UserIndexer.unindex_multiple([1])
+        self.uploads.clear()
+        UserIndexer._add_documents(objects, UserIndexer.index_name()).wait()
+        self.assertEqual(self._uploaded_ids(), [1])
+        UserIndexer.clear_document_hashes()
+        self.uploads.clear()
+        UserIndexer._add_documents(objects, UserIndexer.index_name()).wait()
+        self.assertEqual(self._uploaded_ids(), [0, 1, 2])
+
+    def test_unindex_by_filter(self) -> None:
+        objects = [{"id": i} for i in range(3)]
+        UserIndexer._add_documents(objects, UserIndexer.index_name()).wait()
+        UserIndexer.unindex_by_filter({"eq": [("is_active", False)]})
+        self.client.index.return_value.delete_documents.assert_called_once_with(
+            filter="is_active = false"
+        )
+        self.uploads.clear()
+        UserIndexer._add_documents(objects, UserIndexer.index_name())
+        self.assertEqual(self._uploaded_ids(), [0, 1, 2])
+
+
+class QuerysetOptionsTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.users = create_users("options", 3)
+        for user in cls.users:
+            Address.objects.create(user=user, city=f"City {user.age}")  # ty: ignore
+        return super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        User.objects.filter(email__endswith="@options.com").delete()  # ty: ignore
+        return super().tearDownClass()
+
+    def setUp(self) -> None:
+        super().setUp()
+        patcher = patch.object(
+            UserAddressIndexer, "_add_documents", self._add_documents
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.objects: List[Dict[str, Any]] = []
+
+    def _add_documents(
+        self, objects: Iterable[Dict[str, Any]], index_name: str, **kwargs: Any
+    ) -> None:
+        self.objects.extend(objects)
+
+    def test_get_queryset(self) -> None:
+        with patch.multiple(
+            UserAddressIndexer,
+            PREFETCH_RELATED=["addresses"],
+            ONLY=["id", "first_name"],
+        ):
+            queryset = UserAddressIndexer.get_queryset()
+        self.assertEqual(queryset.model, User)
+        self.assertEqual(queryset._prefetch_related_lookups, ("addresses",))
+        self.assertEqual(queryset.query.deferred_loading, ({"id", "first_name"}, False))
+
+    def test_select_related(self) -> None:
+        with patch.object(UserAddressIndexer, "SELECT_RELATED", ["user"]):
+            queryset = UserAddressIndexer._apply_queryset_options(
+                Address.objects.all()  # ty: ignore
+            )
+        self.assertEqual(queryset.query.select_related, {"user": {}})
+
+    def test_n_plus_one_warning(self) -> None:
+        query = Q(email__endswith="@options.com")
+        with self.assertWarns(RuntimeWarning):
+            UserAddressIndexer.index_from_query(query)
+        self.assertEqual(len(self.objects), 3)
+
+    def test_prefetch_related(self) -> None:
+        query = Q(email__endswith="@options.com")
+        with patch.object(UserAddressIndexer, "PREFETCH_RELATED", ["addresses"]):
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                with CaptureQueriesContext(connection) as context:
+                    UserAddressIndexer.index_from_query(query)
+        self.assertEqual(len(context.captured_queries), 2)
+        self.assertEqual(
+            [obj["cities"] for obj in self.objects],
+            [["City 0"], ["City 1"], ["City 2"]],
+        )
+
+    def test_prefetch_related_on_instances(self) -> None:
+        users = list(User.objects.filter(email__endswith="@options.com"))  # ty: ignore
+        with patch.object(UserAddressIndexer, "PREFETCH_RELATED", ["addresses"]):
+            with CaptureQueriesContext(connection) as context:
+                UserAddressIndexer.index_multiple(users)
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertEqual(len(self.objects), 3)
+
+
+class SignalsTestCase(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        UserIndexer.connect_signals()
+        self.addCleanup(UserIndexer.disconnect_signals)
+        self.index_mock = patch.object(UserIndexer, "index_from_query").start()
+        self.unindex_mock = patch.object(UserIndexer, "unindex_multiple").start()
+        self.addCleanup(patch.stopall)
+
+    def tearDown(self) -> None:
+        User.objects.filter(email__endswith="@signals.com").delete()  # ty: ignore
+        super().tearDown()
+
+    def _create_user(self, i: int) -> User:
+        return User.objects.create(  # ty: ignore
+            first_name=f"First {i}",
+            last_name=f"Last {i}",
+            email=f"{i}@signals.com",
+            is_active=True,
+            age=i,
+        )
+
+    def test_without_transaction(self) -> None:
+        user = self._create_user(1)
+        self.index_mock.assert_called_once_with(Q(pk__in={user.pk}))
+        user_pk = user.pk
+        user.delete()
+        self.unindex_mock.assert_called_once_with([user_pk])
+
+    def test_coalesced_in_transaction(self) -> None:
+        with transaction.atomic():
+            users = [self._create_user(i) for i in range(10)]
+            for user in users:
+                user.age += 1
+                user.save()
+            deleted_pk = users[0].pk
+            users[0].delete()
+            self.index_mock.assert_not_called()
+            self.unindex_mock.assert_not_called()
+        self.index_mock.assert_called_once_with(
+            Q(pk__in={user.pk for user in users[1:]})
+        )
+        self.unindex_mock.assert_called_once_with([deleted_pk])
+
+    def test_rollback(self) -> None:
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                self._create_user(1)
+                raise ValueError("Rollback")
+        with transaction.atomic():
+            user = self._create_user(2)
+        self.index_mock.assert_called_once_with(Q(pk__in={user.pk}))
+        self.unindex_mock.assert_not_called()
+
+    def test_savepoint_rollback(self) -> None:
+        with transaction.atomic():
+            with self.assertRaises(ValueError):
+                with transaction.atomic():
+                    self._create_user(1)
+                    raise ValueError("Rollback")
+            user = self._create_user(2)
+        self.index_mock.assert_called_once_with(Q(pk__in={user.pk}))
+        self.unindex_mock.assert_not_called()
+
+    def test_save_on_commit(self) -> None:
+        def save_again() -> None:
+            with transaction.atomic():
+                users[0].save()
+
+        with transaction.atomic():
+            users = [self._create_user(1)]
+            transaction.on_commit(save_again)
+        self.assertEqual(self.index_mock.call_count, 2)
+
+    def test_disconnect_signals(self) -> None:
+        UserIndexer.disconnect_signals()
+        self._create_user(1)
+        self.index_mock.assert_not_called()
+
+
+class IncrementalSyncTestCase(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.users = create_users("incremental", 3)
+        self.queryset = User.objects.filter(email__endswith="@incremental.com")  # ty: ignore
+        self.queryset.update(updated_at=timezone.now() - timedelta(days=1))
+        self.indexed_ids: List[int] = []
+        self.tracker = TaskTracker()
+        patch.object(
+            UserIndexer, "_add_documents", side_effect=self._add_documents
+        ).start()
+        self.addCleanup(patch.stopall)
+
+    def tearDown(self) -> None:
+        self.queryset.delete()
+        MeilisearchSyncState.objects.all().delete()
+        super().tearDown()
+
+    def _add_documents(
+        self, objects: Iterable[Dict[str, Any]], index_name: str, **kwargs: Any
+    ) -> TaskTracker:
+        user_ids = {user.pk for user in self.users}
+        self.indexed_ids.extend(obj["id"] for obj in objects if obj["id"] in user_ids)
+        return self.tracker
+
+    def test_index_changed_since(self) -> None:
+        self.users[1].save()
+        UserIndexer.index_changed_since(timezone.now() - timedelta(hours=1))
+        self.assertEqual(self.indexed_ids, [self.users[1].pk])
+
+    def test_sync_incremental(self) -> None:
+        # First run indexes everything
+        first_watermark = UserIndexer.sync_incremental()
+        self.assertEqual(self.indexed_ids, [user.pk for user in self.users])
+        state = MeilisearchSyncState.objects.get(index_name=UserIndexer.index_name())
+        self.assertEqual(state.synced_at, first_watermark)
+        # Next runs only send the rows changed since the watermark
+        self.indexed_ids.clear()
+        self.users[2].save()
+        second_watermark = UserIndexer.sync_incremental()
+        self.assertEqual(self.indexed_ids, [self.users[2].pk])
+        self.assertGreater(second_watermark, first_watermark)
+        # Rows written before the watermark but within the overlap are sent again
+        self.indexed_ids.clear()
+        self.queryset.filter(pk=self.users[0].pk).update(
+            updated_at=second_watermark - timedelta(seconds=30)
+        )
+        UserIndexer.sync_incremental()
+        self.assertEqual(self.indexed_ids, [self.users[0].pk, self.users[2].pk])
+        # Rows older than the overlap are not
+        self.indexed_ids.clear()
+        self.queryset.update(updated_at=timezone.now() - timedelta(days=1))
+        UserIndexer.sync_incremental()
+        self.assertEqual(self.indexed_ids, [])
+
+    def test_sync_incremental_failed_task(self) -> None:
+        first_watermark = UserIndexer.sync_incremental()
+        self.users[2].save()
+        # The document has no primary key, so the task fails once processed
+        client = Client(settings.MEILISEARCH_HOST, settings.MEILISEARCH_API_KEY)
+        task = client.index("test_incremental_failure").add_documents([{"age": 1}])
+        self.addCleanup(client.delete_index, "test_incremental_failure")
+        self.tracker = TaskTracker([task])
+        with self.assertRaises(MeilisearchTaskError):
+            UserIndexer.sync_incremental()
+        state = MeilisearchSyncState.objects.get(index_name=UserIndexer.index_name())
+        self.assertEqual(state.synced_at, first_watermark)
+        # The next run sends the rows again
+        self.indexed_ids.clear()
+        self.tracker = TaskTracker()
+        UserIndexer.sync_incremental()
+        self.assertEqual(self.indexed_ids, [self.users[2].pk])
+
+    def test_not_configured(self) -> None:
+        with self.assertRaises(ImproperlyConfigured):
+            UserFieldsIndexer.index_changed_since(timezone.now())
+        with self.assertRaises(ImproperlyConfigured):
+            UserFieldsIndexer.sync_incremental()
+        self.assertFalse(MeilisearchSyncState.objects.exists())
+
+
+class FieldsTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.user = User.objects.create(  # ty: ignore
+            first_name="John",
+            last_name="Fields",
+            email="john@fields.com",
+            is_active=True,
+            age=40,
+        )
+        return super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.user.delete()
+        return super().tearDownClass()
+
+    def test_build_object(self) -> None:
+        self.assertEqual(
+            UserFieldsIndexer.build_object(self.user),
+            {
+                "id": self.user.id,  # ty: ignore
+                "first_name": "John",
+                "last_name": "Fields",
+                "email": "JOHN@FIELDS.COM",
+                "is_active": True,
+                "age": 40,
+            },
+        )
+
+    def test_build_object_without_fields(self) -> None:
+        with patch.object(UserFieldsIndexer, "FIELDS", None):
+            with self.assertRaises(NotImplementedError):
+                UserFieldsIndexer.build_object(self.user)
+
+    def test_row_builder(self) -> None:
+        fields = {"id": "pk", "name": "first_name", "upper": ("first_name", str.upper)}
+        with patch.object(UserFieldsIndexer, "FIELDS", fields):
+            paths, build_row = UserFieldsIndexer._get_row_builder()
+            self.assertIs(UserFieldsIndexer._get_row_builder()[1], build_row)
+        self.assertEqual(paths, ["pk", "first_name"])
+        self.assertEqual(
+            build_row((1, "John")), {"id": 1, "name": "John", "upper": "JOHN"}
+        )
+        self.assertIsNot(UserFieldsIndexer._get_row_builder()[1], build_row)
+
+    def test_matches_build_object(self) -> None:
+        paths, build_row = UserFieldsIndexer._get_row_builder()
+        row = User.objects.filter(pk=self.user.pk).values_list(*paths).get()  # ty: ignore
+        self.assertEqual(build_row(row), UserFieldsIndexer.build_object(self.user))
+
+    def test_index_from_query_skips_instances(self) -> None:
+        with patch.object(UserFieldsIndexer, "_add_documents") as mock:
+            with CaptureQueriesContext(connection) as context:
+                UserFieldsIndexer.index_from_query(Q(pk=self.user.pk))
+                objects = list(mock.call_args[0][0])
+        self.assertEqual(objects, [UserFieldsIndexer.build_object(self.user)])
+        self.assertEqual(len(context.captured_queries), 1)
+
+
+class PartialUpdateTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.meilisearch_client = Client(
+            settings.MEILISEARCH_HOST, settings.MEILISEARCH_API_KEY
+        )
+        cls.user = User.objects.create(  # ty: ignore
+            first_name="John",
+            last_name="Partial",
+            email="john@partial.com",
+            is_active=True,
+            age=50,
+        )
+        return super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.user.delete()
+        return super().tearDownClass()
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.meilisearch_client.delete_index(UserFieldsIndexer.index_name())
+        UserFieldsIndexer.maybe_create_index().add(
+            UserFieldsIndexer.index(self.user)
+        ).wait()
+
+    def tearDown(self) -> None:
+        self.meilisearch_client.delete_index(UserFieldsIndexer.index_name())
+        User.objects.filter(pk=self.user.pk).update(age=50, email="john@partial.com")  # ty: ignore
+        super().tearDown()
+
+    def _get_document(self) -> Dict[str, Any]:
+        index = self.meilisearch_client.index(UserFieldsIndexer.index_name())
+        return dict(index.get_document(self.user.pk))  # ty: ignore
+
+    def test_index_fields_queryset(self) -> None:
+        User.objects.filter(pk=self.user.pk).update(age=51, email="new@partial.com")  # ty: ignore
+        queryset = User.objects.filter(pk=self.user.pk)  # ty: ignore
+        with CaptureQueriesContext(connection) as context:
+            tracker = UserFieldsIndexer.index_fields(queryset, ["age"])
+        tracker.wait()
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertNotIn("first_name", context.captured_queries[0]["sql"])
+        document = self._get_document()
+        self.assertEqual(document["age"], 51)
+        self.assertEqual(document["email"], "JOHN@PARTIAL.COM")
+        self.assertEqual(document["last_name"], "Partial")
+
+    def test_index_fields_instances(self) -> None:
+        self.user.age = 52
+        UserIndexer.index_fields([self.user], ["age"]).wait()
+        document = self._get_document()
+        self.assertEqual(document["age"], 52)
+        self.assertEqual(document["first_name"], "John")
+        self.assertNotIn("full_name", document)
+
+    def test_unknown_fields(self) -> None:
+        with self.assertRaises(ValueError):
+            UserFieldsIndexer.index_fields([self.user], ["full_name"])
+
+    def test_build_fields(self) -> None:
+        self.assertEqual(
+            UserFieldsIndexer.build_fields(self.user, ["id", "email"]),
+            {"id": self.user.pk, "email": "JOHN@PARTIAL.COM"},
+        )
+        self.assertEqual(
+            UserIndexer.build_fields(self.user, ["id", "full_name"]),
+            {"id": self.user.pk, "full_name": "John Partial"},
+        )
+
+    def test_get_document_fields(self) -> None:
+        self.assertEqual(
+            UserFieldsIndexer.get_document_fields(["age", "email"]), ["email", "age"]
+        )
+        self.assertEqual(UserFieldsIndexer.get_document_fields(["updated_at"]), [])
+        self.assertIsNone(UserIndexer.get_document_fields(["age"]))
+
+    def test_sync_fields(self) -> None:
+        with patch.object(UserFieldsIndexer, "unindex_multiple") as unindex_mock:
+            UserFieldsIndexer.sync_fields([self.user.pk, -1], ["age"])
+        unindex_mock.assert_called_once_with([-1])
+
+    def test_sync_fields_new_document(self) -> None:
+        new_user = User.objects.create(  # ty: ignore
+            first_name="Jane",
+            last_name="Partial",
+            email="jane@partial.com",
+            is_active=True,
+            age=40,
+        )
+        self.addCleanup(new_user.delete)
+        User.objects.filter(pk=self.user.pk).update(age=53, email="new@partial.com")  # ty: ignore
+        ids = [self.user.pk, new_user.pk]
+        post = PooledHttpRequests.post
+        with patch.object(
+            PooledHttpRequests, "post", autospec=True, side_effect=post
+        ) as post_mock:
+            UserFieldsIndexer.sync_fields(ids, ["age"]).wait()
+        # The existing documents are checked with a single request
+        paths = [call.args[1] for call in post_mock.call_args_list]
+        fetches = [path for path in paths if path.endswith("/documents/fetch")]
+        self.assertEqual(len(fetches), 1)
+        document = self._get_document()
+        self.assertEqual(document["age"], 53)
+        self.assertEqual(document["email"], "JOHN@PARTIAL.COM")
+        index = self.meilisearch_client.index(UserFieldsIndexer.index_name())
+        new_document = dict(index.get_document(new_user.pk))  # ty: ignore
+        self.assertEqual(new_document["first_name"], "Jane")
+
+    def test_signals(self) -> None:
+        UserFieldsIndexer.connect_signals(use_update_fields=True)
+        self.addCleanup(UserFieldsIndexer.disconnect_signals)
+        sync_fields_mock = patch.object(UserFieldsIndexer, "sync_fields").start()
+        sync_mock = patch.object(UserFieldsIndexer, "sync_multiple").start()
+        self.addCleanup(patch.stopall)
+        # Outside a transaction
+        self.user.save(update_fields=["age"])
+        sync_fields_mock.assert_called_once_with([self.user.pk], ["age"])
+        sync_mock.assert_not_called()
+        # Fields are merged within a transaction, and full saves take precedence
+        sync_fields_mock.reset_mock()
+        with transaction.atomic():
+            self.user.save(update_fields=["age"])
+            self.user.save(update_fields=["email", "updated_at"])
+        sync_fields_mock.assert_called_once_with([self.user.pk], ["age", "email"])
+        sync_fields_mock.reset_mock()
+        with transaction.atomic():
+            self.user.save(update_fields=["age"])
+            self.user.save()
+            self.user.save(update_fields=["email"])
+        sync_fields_mock.assert_not_called()
+        sync_mock.assert_called_once_with([self.user.pk])
+
+
+class IterPayloadsTestCase(TestCase):
+    def test_single_payload(self) -> None:
+        payloads = list(UserIndexer._iter_payloads([{"id": 1}, {"id": 2}]))
+        self.assertEqual(payloads, [b'{"id": 1}\n{"id": 2}\n'])
+
+    def test_empty(self) -> None:
+        self.assertEqual(list(UserIndexer._iter_payloads([])), [])
+
+    def test_max_payload_bytes(self) -> None:
+        objects = [{"id": i, "text": "a" * 10} for i in range(5)]
+        line_size = len(b'{"id": 0, "text": "aaaaaaaaaa"}\n')
+        with patch.object(UserIndexer, "MAX_PAYLOAD_BYTES", line_size * 2):
+            payloads = list(UserIndexer._iter_payloads(objects))
+        self.assertEqual([payload.count(b"\n") for payload in payloads], [2, 2, 1])
+        for payload in payloads:
+            self.assertLessEqual(len(payload), line_size * 2)
+
+    def test_oversized_object(self) -> None:
+        objects = [{"id": 1}, {"id": 2, "text": "a" * 100}, {"id": 3}]
+        with patch.object(UserIndexer, "MAX_PAYLOAD_BYTES", 50):
+            payloads = list(UserIndexer._iter_payloads(objects))
+        self.assertEqual([payload.count(b"\n") for payload in payloads], [1, 1, 1])
+
+    def test_max_batch_documents(self) -> None:
+        objects = [{"id": i} for i in range(5)]
+        with patch.object(UserIndexer, "MAX_BATCH_DOCUMENTS", 2):
+            payloads = list(UserIndexer._iter_payloads(objects))
+        self.assertEqual([payload.count(b"\n") for payload in payloads], [2, 2, 1])
+
+    def test_django_types(self) -> None:
+        objects = [{"id": 1, "created_at": datetime(2024, 1, 1, 12, 30)}]
+        payloads = list(UserIndexer._iter_payloads(objects))
+        self.assertEqual(
+            payloads, [b'{"id": 1, "created_at": "2024-01-01T12:30:00"}\n']
+        )
+
+
 class BuildSearchFilterTestCase(TestCase):
     def test_empty(self) -> None:
         self.assertEqual(UserIndexer._build_search_filter(), "")
@@ -371,10 +1085,3 @@ class BuildSearchFilterTestCase(TestCase):
             + "AND field_14 < 14 "
             + "AND field_15 <= 15",
         )
-
-
-# --------------------------------------------------
-# Django migrations
-# --------------------------------------------------
-call_command("makemigrations", "tests")
-call_command("migrate")
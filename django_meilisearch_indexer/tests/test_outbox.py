@@ -0,0 +1,161 @@
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from django.core.management import call_command
+from django.db import transaction
+from django.utils.connection import ConnectionDoesNotExist
+
+from django_meilisearch_indexer.models import MeilisearchOutboxEntry
+from django_meilisearch_indexer.outbox import (
+    MAX_ATTEMPTS,
+    drain_outbox,
+    drain_outbox_batch,
+)
+from django_meilisearch_indexer.tasks import TaskTracker
+from django_meilisearch_indexer.tests.indexers import UserIndexer
+from django_meilisearch_indexer.tests.models import User
+
+
+class OutboxTestCase(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.sync_mock = patch.object(
+            UserIndexer, "sync_multiple", return_value=TaskTracker()
+        ).start()
+        self.unindex_mock = patch.object(
+            UserIndexer, "unindex_multiple", return_value=TaskTracker()
+        ).start()
+        self.addCleanup(patch.stopall)
+
+    def tearDown(self) -> None:
+        MeilisearchOutboxEntry.objects.all().delete()
+        User.objects.filter(email__endswith="@outbox.com").delete()  # ty: ignore
+        super().tearDown()
+
+    def test_enqueue(self) -> None:
+        UserIndexer.enqueue_index([1, 2])
+        UserIndexer.enqueue_unindex([3])
+        entries = MeilisearchOutboxEntry.objects.order_by("pk")
+        self.assertEqual(
+            [(entry.indexer, entry.object_pk, entry.operation) for entry in entries],
+            [
+                ("django_meilisearch_indexer.tests.indexers.UserIndexer", "1", "index"),
+                ("django_meilisearch_indexer.tests.indexers.UserIndexer", "2", "index"),
+                (
+                    "django_meilisearch_indexer.tests.indexers.UserIndexer",
+                    "3",
+                    "unindex",
+                ),
+            ],
+        )
+
+    def test_enqueue_rollback(self) -> None:
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                UserIndexer.enqueue_index([1])
+                raise ValueError("Rollback")
+        self.assertFalse(MeilisearchOutboxEntry.objects.exists())
+
+    def test_drain_collapses_pks(self) -> None:
+        UserIndexer.enqueue_index([1, 2, 1, 1])
+        UserIndexer.enqueue_unindex([2, 3])
+        UserIndexer.enqueue_index([3])
+        self.assertEqual(drain_outbox_batch(), 7)
+        self.sync_mock.assert_called_once()
+        self.assertCountEqual(self.sync_mock.call_args[0][0], [1, 3])
+        self.unindex_mock.assert_called_once_with([2])
+        self.assertFalse(MeilisearchOutboxEntry.objects.exists())
+        self.assertEqual(drain_outbox_batch(), 0)
+
+    def test_drain_by_batch(self) -> None:
+        UserIndexer.enqueue_index([1, 2, 3, 4, 5])
+        self.assertEqual(drain_outbox_batch(batch_size=2), 2)
+        self.assertEqual(MeilisearchOutboxEntry.objects.count(), 3)
+        self.assertEqual(drain_outbox(batch_size=2), 3)
+        self.assertEqual(self.sync_mock.call_count, 3)
+        self.assertFalse(MeilisearchOutboxEntry.objects.exists())
+
+    def test_drain_failure_keeps_entries(self) -> None:
+        UserIndexer.enqueue_index([1, 2])
+        self.sync_mock.side_effect = ConnectionError("Meilisearch is down")
+        self.assertEqual(drain_outbox(), 2)
+        entries = MeilisearchOutboxEntry.objects.all()
+        self.assertEqual([entry.attempts for entry in entries], [1, 1])
+        self.assertIn("Meilisearch is down", entries[0].last_error)
+        # Claimed until the claim expires
+        self.assertEqual(drain_outbox(), 0)
+        entries.update(claimed_until=None)
+        self.sync_mock.side_effect = None
+        self.assertEqual(drain_outbox(), 2)
+        self.assertFalse(MeilisearchOutboxEntry.objects.exists())
+
+    def test_drain_failure_per_indexer(self) -> None:
+        UserIndexer.enqueue_unindex([1])
+        MeilisearchOutboxEntry.objects.create(
+            indexer="unknown.Indexer", object_pk="1", operation="index"
+        )
+        self.assertEqual(drain_outbox_batch(), 2)
+        self.unindex_mock.assert_called_once_with([1])
+        entry = MeilisearchOutboxEntry.objects.get()
+        self.assertEqual(entry.indexer, "unknown.Indexer")
+        self.assertIn("No module named", entry.last_error)
+
+    def test_drain_failed_task(self) -> None:
+        UserIndexer.enqueue_index([1])
+        task = MagicMock(uid=1, status="failed", error={"code": "invalid_document"})
+        with patch.object(TaskTracker, "failed", [task]):
+            self.sync_mock.return_value = TaskTracker([1])
+            with patch.object(TaskTracker, "wait"):
+                self.assertEqual(drain_outbox_batch(), 1)
+        entry = MeilisearchOutboxEntry.objects.get()
+        self.assertIn("invalid_document", entry.last_error)
+
+    def test_dead_letters(self) -> None:
+        UserIndexer.enqueue_index([1])
+        self.sync_mock.side_effect = ConnectionError("Meilisearch is down")
+        for _ in range(MAX_ATTEMPTS):
+            self.assertEqual(drain_outbox_batch(), 1)
+            MeilisearchOutboxEntry.objects.update(claimed_until=None)
+        self.assertEqual(drain_outbox_batch(), 0)
+        self.assertEqual(MeilisearchOutboxEntry.objects.get().attempts, MAX_ATTEMPTS)
+        self.assertEqual(drain_outbox_batch(max_attempts=MAX_ATTEMPTS + 1), 1)
+
+    def test_drain_using(self) -> None:
+        UserIndexer.enqueue_index([1])
+        with self.assertRaises(ConnectionDoesNotExist):
+            drain_outbox_batch(using="other")
+        self.assertEqual(MeilisearchOutboxEntry.objects.get().attempts, 0)
+        self.assertEqual(drain_outbox(using="default"), 1)
+        self.assertFalse(MeilisearchOutboxEntry.objects.exists())
+
+    def test_signals(self) -> None:
+        UserIndexer.connect_signals(use_outbox=True)
+        self.addCleanup(UserIndexer.disconnect_signals)
+        with transaction.atomic():
+            user = User.objects.create(  # ty: ignore
+                first_name="John",
+                last_name="Outbox",
+                email="john@outbox.com",
+                is_active=True,
+                age=30,
+            )
+            user.age = 31
+            user.save()
+        user_pk = user.pk
+        user.delete()
+        self.sync_mock.assert_not_called()
+        operations = MeilisearchOutboxEntry.objects.values_list("operation", flat=True)
+        self.assertEqual(list(operations), ["index", "index", "unindex"])
+        drain_outbox()
+        self.sync_mock.assert_not_called()
+        self.unindex_mock.assert_called_once_with([user_pk])
+
+    def test_command(self) -> None:
+        UserIndexer.enqueue_index([1, 2])
+        stdout = StringIO()
+        call_command("meilisearch_drain_outbox", "--batch-size", "1", stdout=stdout)
+        self.assertIn("Applied 2 outbox entries", stdout.getvalue())
+        self.assertEqual(self.sync_mock.call_count, 2)
+        with self.assertRaises(ConnectionDoesNotExist):
+            call_command("meilisearch_drain_outbox", "--database", "other")
@@ -0,0 +1,182 @@
+from typing import Any, List
+from unittest import TestCase
+from unittest.mock import patch
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Q
+from meilisearch import Client
+
+from django_meilisearch_indexer.models import MeilisearchRebuild
+from django_meilisearch_indexer.tasks import MeilisearchTaskError, TaskTracker
+from django_meilisearch_indexer.tests import create_users, wait_for_pending_tasks
+from django_meilisearch_indexer.tests.indexers import UserIndexer
+from django_meilisearch_indexer.tests.models import User
+
+
+class RebuildTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.meilisearch_client = Client(
+            settings.MEILISEARCH_HOST, settings.MEILISEARCH_API_KEY
+        )
+        cls.users = create_users("rebuild")
+        return super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        User.objects.filter(email__endswith="@rebuild.com").delete()  # ty: ignore
+        return super().tearDownClass()
+
+    def setUp(self) -> None:
+        super().setUp()
+        MeilisearchRebuild.objects.all().delete()
+        UserIndexer.abort_rebuild()
+        tracker = TaskTracker(
+            [self.meilisearch_client.delete_index(UserIndexer.index_name())]
+        )
+        tracker.wait(raise_on_failure=False)
+        UserIndexer.maybe_create_index().wait()
+
+    def tearDown(self) -> None:
+        UserIndexer.abort_rebuild()
+        self.meilisearch_client.delete_index(UserIndexer.index_name())
+        MeilisearchRebuild.objects.all().delete()
+        super().tearDown()
+
+    def get_indexed_ids(self) -> List[Any]:
+        response = self.meilisearch_client.index(UserIndexer.index_name()).search(
+            "", {"limit": 1000}
+        )
+        return sorted(hit["id"] for hit in response["hits"])
+
+    def get_tmp_index_names(self) -> List[str]:
+        indexes = self.meilisearch_client.get_indexes({"limit": 1000})["results"]
+        return [index.uid for index in indexes if index.uid.startswith("test_users_")]
+
+    def crash_rebuild(self, on_call: int) -> MeilisearchRebuild:
+        calls: List[Q] = []
+        original = UserIndexer._index_from_query
+
+        def crash(query: Q, index_name: str, **kwargs: Any) -> None:
+            calls.append(query)
+            if len(calls) == on_call:
+                raise ConnectionError
+            original(query, index_name, **kwargs)
+
+        with (
+            patch.object(UserIndexer, "REBUILD_CHECKPOINT_ROWS", 2),
+            patch.object(UserIndexer, "_index_from_query", side_effect=crash),
+        ):
+            with self.assertRaises(ConnectionError):
+                UserIndexer.index_all_atomically()
+        return MeilisearchRebuild.objects.get(index_name=UserIndexer.index_name())
+
+    def test_checkpoints(self) -> None:
+        with patch.object(UserIndexer, "REBUILD_CHECKPOINT_ROWS", 2):
+            UserIndexer.index_all_atomically().wait()
+        pks = sorted(User.objects.values_list("pk", flat=True))  # ty: ignore
+        self.assertEqual(self.get_indexed_ids(), pks)
+        self.assertEqual(self.get_tmp_index_names(), [])
+        rebuild = MeilisearchRebuild.objects.get()
+        self.assertEqual(rebuild.status, MeilisearchRebuild.Status.COMPLETED)
+        self.assertEqual(rebuild.indexed_rows, len(pks))
+        self.assertEqual(rebuild.task_uids, [])
+        self.assertFalse(UserIndexer.resume_rebuild())
+
+    def test_concurrent_chunks(self) -> None:
+        with (
+            patch.multiple(
+                UserIndexer, REBUILD_CHECKPOINT_ROWS=2, REBUILD_CONCURRENCY=3
+            ),
+            patch.object(
+                UserIndexer, "_wait_for_tasks", wraps=UserIndexer._wait_for_tasks
+            ) as mock,
+        ):
+            UserIndexer.index_all_atomically().wait()
+        pks = sorted(User.objects.values_list("pk", flat=True))  # ty: ignore
+        self.assertEqual(self.get_indexed_ids(), pks)
+        self.assertEqual(self.get_tmp_index_names(), [])
+        # Every task of the last window is confirmed before the swap
+        uids = mock.call_args_list[-1].args[0]
+        self.assertEqual(len(uids), len(set(uids)))
+        rebuild = MeilisearchRebuild.objects.get()
+        self.assertEqual(rebuild.indexed_rows, len(pks))
+
+    def test_failed_task(self) -> None:
+        UserIndexer.index_all().wait()
+        indexed_ids = self.get_indexed_ids()
+        with (
+            patch.object(UserIndexer, "REBUILD_CHECKPOINT_ROWS", 2),
+            patch.object(UserIndexer, "build_object", return_value={"age": 1}),
+        ):
+            with self.assertRaises(MeilisearchTaskError):
+                UserIndexer.index_all_atomically()
+        wait_for_pending_tasks()
+        self.assertEqual(self.get_indexed_ids(), indexed_ids)
+        self.assertEqual(self.get_tmp_index_names(), [])
+        rebuild = MeilisearchRebuild.objects.get()
+        self.assertEqual(rebuild.status, MeilisearchRebuild.Status.ABORTED)
+
+    def test_resume(self) -> None:
+        rebuild = self.crash_rebuild(on_call=3)
+        self.assertEqual(rebuild.status, MeilisearchRebuild.Status.RUNNING)
+        self.assertIsNotNone(rebuild.confirmed_pk)
+        self.assertEqual(rebuild.indexed_rows, 4)
+        self.assertEqual(self.get_tmp_index_names(), [rebuild.tmp_index_name])
+        self.assertEqual(self.get_indexed_ids(), [])
+        with patch.object(UserIndexer, "REBUILD_CHECKPOINT_ROWS", 2):
+            with patch.object(
+                UserIndexer,
+                "_index_from_query",
+                side_effect=UserIndexer._index_from_query,
+            ) as mock:
+                self.assertTrue(UserIndexer.resume_rebuild())
+        # The second chunk succeeded, so the rebuild goes on after it
+        query = mock.call_args_list[0].args[0]
+        self.assertIn(("pk__gt", int(rebuild.last_pk)), query.children)
+        wait_for_pending_tasks()
+        pks = sorted(User.objects.values_list("pk", flat=True))  # ty: ignore
+        self.assertEqual(self.get_indexed_ids(), pks)
+        self.assertEqual(self.get_tmp_index_names(), [])
+        rebuild.refresh_from_db()
+        self.assertEqual(rebuild.status, MeilisearchRebuild.Status.COMPLETED)
+
+    def test_resume_without_tmp_index(self) -> None:
+        rebuild = self.crash_rebuild(on_call=2)
+        task = self.meilisearch_client.delete_index(rebuild.tmp_index_name)
+        TaskTracker([task]).wait()
+        self.assertTrue(UserIndexer.resume_rebuild())
+        wait_for_pending_tasks()
+        pks = sorted(User.objects.values_list("pk", flat=True))  # ty: ignore
+        self.assertEqual(self.get_indexed_ids(), pks)
+
+    def test_abort(self) -> None:
+        rebuild = self.crash_rebuild(on_call=2)
+        TaskTracker(
+            [
+                self.meilisearch_client.create_index("test_users_tmp"),
+                self.meilisearch_client.create_index("test_users_tmp_archive"),
+            ]
+        ).wait()
+        self.assertEqual(
+            UserIndexer.abort_rebuild(),
+            sorted(["test_users_tmp", rebuild.tmp_index_name]),
+        )
+        wait_for_pending_tasks()
+        self.assertEqual(self.get_tmp_index_names(), ["test_users_tmp_archive"])
+        rebuild.refresh_from_db()
+        self.assertEqual(rebuild.status, MeilisearchRebuild.Status.ABORTED)
+        self.assertFalse(UserIndexer.resume_rebuild())
+        self.meilisearch_client.delete_index("test_users_tmp_archive")
+
+    def test_without_app(self) -> None:
+        with (
+            patch.object(apps, "is_installed", return_value=False),
+            patch.object(UserIndexer, "build_object", side_effect=ValueError),
+        ):
+            with self.assertRaises(ValueError):
+                UserIndexer.index_all_atomically()
+        wait_for_pending_tasks()
+        self.assertEqual(self.get_tmp_index_names(), [])
+        self.assertFalse(MeilisearchRebuild.objects.exists())
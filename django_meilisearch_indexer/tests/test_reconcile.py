@@ -0,0 +1,120 @@
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.management import call_command
+from meilisearch import Client
+
+from django_meilisearch_indexer import reconcile as reconcile_module
+from django_meilisearch_indexer.reconcile import (
+    IdSet,
+    iter_document_ids,
+    iter_sorted,
+    reconcile,
+)
+from django_meilisearch_indexer.tests import create_users
+from django_meilisearch_indexer.tests.indexers import UserIndexer
+from django_meilisearch_indexer.tests.models import User
+
+
+class IdSetTestCase(TestCase):
+    def test_bitmap_and_others(self) -> None:
+        ids = IdSet()
+        for id_ in [3, 0, 17, 3, "a", -1, 1 << 40]:
+            ids.add(id_)
+        self.assertEqual(len(ids), 6)
+        self.assertTrue(ids.discard(17))
+        self.assertFalse(ids.discard(17))
+        self.assertFalse(ids.discard(1000))
+        self.assertTrue(ids.discard("a"))
+        self.assertFalse(ids.discard("b"))
+        self.assertEqual(sorted(ids, key=str), sorted([0, 3, -1, 1 << 40], key=str))
+        self.assertEqual(len(ids), 4)
+
+
+class IterSortedTestCase(TestCase):
+    def test_runs(self) -> None:
+        items = [f"id-{i}" for i in [5, 3, 9, 1, 7, 2, 8]]
+        self.assertEqual(list(iter_sorted(items, run_size=3)), sorted(items))
+        self.assertEqual(list(iter_sorted([], run_size=3)), [])
+
+
+class ReconcileTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.meilisearch_client = Client(
+            settings.MEILISEARCH_HOST, settings.MEILISEARCH_API_KEY
+        )
+        cls.users = create_users("reconcile")
+        return super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        User.objects.filter(email__endswith="@reconcile.com").delete()  # ty: ignore
+        return super().tearDownClass()
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.meilisearch_client.delete_index(UserIndexer.index_name())
+        UserIndexer.maybe_create_index().add(UserIndexer.index_all()).wait()
+        self.index = self.meilisearch_client.index(UserIndexer.index_name())
+        # Drift: a deleted row still indexed, and a row never indexed
+        self.orphan_id = max(User.objects.values_list("pk", flat=True)) + 1000  # ty: ignore
+        tracker = UserIndexer.unindex(self.users[2].pk)
+        tracker.add(self.index.add_documents([{"id": self.orphan_id}])).wait()
+        self.total = User.objects.count()  # ty: ignore
+
+    def tearDown(self) -> None:
+        self.meilisearch_client.delete_index(UserIndexer.index_name())
+        super().tearDown()
+
+    def get_indexed_ids(self) -> set:
+        return set(iter_document_ids(UserIndexer, page_size=2))
+
+    def test_iter_document_ids(self) -> None:
+        ids = list(iter_document_ids(UserIndexer, page_size=2))
+        self.assertEqual(len(ids), self.total)
+        self.assertIn(self.orphan_id, ids)
+        self.assertNotIn(self.users[2].pk, ids)
+
+    def test_reconcile(self) -> None:
+        with patch.object(UserIndexer, "BATCH_SIZE", 2):
+            report = reconcile(UserIndexer, page_size=3)
+        self.assertEqual(report.documents, self.total)
+        self.assertEqual(report.rows, self.total)
+        self.assertEqual((report.orphans, report.missing), (1, 1))
+        self.assertEqual(len(report.tracker), 2)
+        report.tracker.wait()
+        pks = set(User.objects.values_list("pk", flat=True))  # ty: ignore
+        self.assertEqual(self.get_indexed_ids(), pks)
+        report = reconcile(UserIndexer)
+        self.assertEqual(
+            (report.orphans, report.missing, len(report.tracker)), (0, 0, 0)
+        )
+
+    def test_reconcile_sorted(self) -> None:
+        # The path of non-integer primary keys, such as strings or UUIDs
+        with (
+            patch.object(reconcile_module, "_has_integer_pk", return_value=False),
+            patch.object(reconcile_module, "SORT_RUN_SIZE", 2),
+            patch.object(UserIndexer, "BATCH_SIZE", 2),
+        ):
+            report = reconcile(UserIndexer, page_size=3)
+        self.assertEqual((report.documents, report.rows), (self.total, self.total))
+        self.assertEqual((report.orphans, report.missing), (1, 1))
+        report.tracker.wait()
+        pks = set(User.objects.values_list("pk", flat=True))  # ty: ignore
+        self.assertEqual(self.get_indexed_ids(), pks)
+
+    def test_dry_run(self) -> None:
+        report = reconcile(UserIndexer, dry_run=True)
+        self.assertEqual((report.orphans, report.missing), (1, 1))
+        self.assertEqual(len(report.tracker), 0)
+        self.assertIn(self.orphan_id, self.get_indexed_ids())
+
+    def test_command(self) -> None:
+        stdout = StringIO()
+        call_command("meilisearch_reconcile", "UserIndexer", "--wait", stdout=stdout)
+        self.assertIn("1 orphans, 1 missing", stdout.getvalue())
+        self.assertNotIn(self.orphan_id, self.get_indexed_ids())
@@ -0,0 +1,131 @@
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from meilisearch import Client
+
+from django_meilisearch_indexer.reindex import PkRange, get_pk_ranges, reindex
+from django_meilisearch_indexer.tasks import MeilisearchTaskError, TaskTracker
+from django_meilisearch_indexer.tests import create_users, wait_for_pending_tasks
+from django_meilisearch_indexer.tests.indexers import UserIndexer
+from django_meilisearch_indexer.tests.models import User
+
+
+class ReindexTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.meilisearch_client = Client(
+            settings.MEILISEARCH_HOST, settings.MEILISEARCH_API_KEY
+        )
+        cls.users = create_users("reindex")
+        return super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        User.objects.filter(email__endswith="@reindex.com").delete()  # ty: ignore
+        return super().tearDownClass()
+
+    def setUp(self) -> None:
+        super().setUp()
+        tracker = TaskTracker(
+            [self.meilisearch_client.delete_index(UserIndexer.index_name())]
+        )
+        tracker.wait(raise_on_failure=False)
+        UserIndexer.maybe_create_index().wait()
+
+    def tearDown(self) -> None:
+        self.meilisearch_client.delete_index(UserIndexer.index_name())
+        super().tearDown()
+
+    def get_indexed_ids(self) -> set:
+        response = self.meilisearch_client.index(UserIndexer.index_name()).search(
+            "", {"limit": 1000}
+        )
+        return {hit["id"] for hit in response["hits"]}
+
+    def test_get_pk_ranges(self) -> None:
+        queryset = User.objects.filter(email__endswith="@reindex.com")  # ty: ignore
+        pks = [user.pk for user in self.users]
+        with CaptureQueriesContext(connection) as context:
+            ranges = get_pk_ranges(queryset, 2)
+        self.assertEqual(len(context), 2)  # The count, and the primary keys
+        self.assertEqual(ranges, [PkRange(None, pks[2]), PkRange(pks[2], None)])
+        self.assertEqual(len(get_pk_ranges(queryset, 50)), 5)
+        self.assertEqual(get_pk_ranges(queryset.none(), 4), [])
+        covered = [
+            user.pk
+            for pk_range in get_pk_ranges(queryset, 3)
+            for user in queryset.filter(pk_range.as_q())
+        ]
+        self.assertEqual(sorted(covered), pks)
+
+    def test_reindex(self) -> None:
+        reports = []
+        progress = reindex(UserIndexer, shards=3, on_progress=reports.append)
+        wait_for_pending_tasks()
+        total = User.objects.count()  # ty: ignore
+        self.assertEqual(progress.rows, total)
+        self.assertGreater(progress.bytes, 0)
+        self.assertEqual(len(reports), 4)
+        self.assertIn(f"{total:,}/{total:,} rows (100%)", str(progress))
+        self.assertEqual(len(self.get_indexed_ids()), total)
+
+    def test_reindex_with_processes(self) -> None:
+        with patch.object(UserIndexer, "BATCH_SIZE", 1):
+            progress = reindex(UserIndexer, processes=2, atomic=True, interval=0.01)
+        wait_for_pending_tasks()
+        self.assertEqual(progress.rows, User.objects.count())  # ty: ignore
+        self.assertTrue(
+            {user.pk for user in self.users}.issubset(self.get_indexed_ids())
+        )
+        indexes = self.meilisearch_client.get_indexes({"limit": 1000})["results"]
+        self.assertEqual(
+            [index.uid for index in indexes if index.uid.startswith("test_users")],
+            ["test_users"],
+        )
+
+    def test_dry_run(self) -> None:
+        with patch.object(UserIndexer, "meilisearch_client") as mock:
+            progress = reindex(UserIndexer, atomic=True, dry_run=True)
+        mock.assert_not_called()
+        self.assertEqual(progress.rows, User.objects.count())  # ty: ignore
+        self.assertGreater(progress.bytes, 0)
+        self.assertEqual(self.get_indexed_ids(), set())
+
+    def test_failure_deletes_tmp_index(self) -> None:
+        with patch.object(UserIndexer, "build_object", side_effect=ValueError):
+            with self.assertRaises(ValueError):
+                reindex(UserIndexer, atomic=True)
+        wait_for_pending_tasks()
+        indexes = self.meilisearch_client.get_indexes({"limit": 1000})["results"]
+        self.assertEqual(
+            [index.uid for index in indexes if index.uid.startswith("test_users")],
+            ["test_users"],
+        )
+
+    def test_failed_task(self) -> None:
+        with patch.object(UserIndexer, "build_object", return_value={"age": 1}):
+            with self.assertRaises(MeilisearchTaskError):
+                reindex(UserIndexer, atomic=True)
+        wait_for_pending_tasks()
+        indexes = self.meilisearch_client.get_indexes({"limit": 1000})["results"]
+        self.assertEqual(
+            [index.uid for index in indexes if index.uid.startswith("test_users")],
+            ["test_users"],
+        )
+
+    def test_command(self) -> None:
+        stdout = StringIO()
+        call_command(
+            "meilisearch_reindex", "UserIndexer", "--processes=1", stdout=stdout
+        )
+        wait_for_pending_tasks()
+        self.assertIn("Indexed", stdout.getvalue())
+        self.assertEqual(len(self.get_indexed_ids()), User.objects.count())  # ty: ignore
+        with self.assertRaises(CommandError):
+            call_command("meilisearch_reindex", "UnknownIndexer")
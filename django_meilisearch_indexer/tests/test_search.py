@@ -0,0 +1,226 @@
+from time import sleep
+from unittest import IsolatedAsyncioTestCase, TestCase, skipIf
+from unittest.mock import patch
+
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from meilisearch import Client
+
+from django_meilisearch_indexer.async_client import close_async_clients, httpx
+from django_meilisearch_indexer.search import (
+    MultiSearchQuery,
+    amulti_search,
+    multi_search,
+)
+from django_meilisearch_indexer.tasks import TaskTracker
+from django_meilisearch_indexer.tests.indexers import AddressIndexer, UserIndexer
+from django_meilisearch_indexer.tests.models import Address, User
+
+SLEEP_TIME = 0.1
+
+
+class MultiSearchMixin:
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.meilisearch_client = Client(
+            settings.MEILISEARCH_HOST, settings.MEILISEARCH_API_KEY
+        )
+        cls.user_1 = User.objects.create(  # ty: ignore
+            first_name="John",
+            last_name="Multi",
+            email="john@multi.com",
+            is_active=True,
+            age=30,
+        )
+        cls.user_2 = User.objects.create(  # ty: ignore
+            first_name="Jane",
+            last_name="Multi",
+            email="jane@multi.com",
+            is_active=False,
+            age=25,
+        )
+        cls.address = Address.objects.create(user=cls.user_1, city="Paris")  # ty: ignore
+        tracker = TaskTracker()
+        for indexer in [UserIndexer, AddressIndexer]:
+            cls.meilisearch_client.delete_index(indexer.index_name())
+            tracker.add(indexer.maybe_create_index())
+        tracker.add(UserIndexer.index_multiple([cls.user_1, cls.user_2]))
+        tracker.add(AddressIndexer.index_multiple([cls.address]))
+        tracker.wait()
+        return super().setUpClass()  # ty: ignore
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        for indexer in [UserIndexer, AddressIndexer]:
+            cls.meilisearch_client.delete_index(indexer.index_name())
+        User.objects.filter(email__endswith="@multi.com").delete()  # ty: ignore
+        return super().tearDownClass()  # ty: ignore
+
+
+class MultiSearchTestCase(MultiSearchMixin, TestCase):
+    def test_multi_search(self) -> None:
+        results = multi_search(
+            [
+                (UserIndexer, "Multi", {"eq": [("is_active", True)]}),
+                MultiSearchQuery(AddressIndexer, "Paris"),
+                (UserIndexer, "Multi", None, {"sort": ["age:asc"]}),
+            ]
+        )
+        self.assertEqual(len(results), 3)
+        self.assertEqual([hit["id"] for hit in results[0]["hits"]], [self.user_1.pk])  # ty: ignore
+        self.assertEqual(results[1]["hits"][0]["city"], "Paris")  # ty: ignore
+        self.assertEqual(
+            [hit["id"] for hit in results[2]["hits"]],  # ty: ignore
+            [self.user_2.pk, self.user_1.pk],
+        )
+
+    def test_single_request(self) -> None:
+        client = UserIndexer.meilisearch_search_client()
+        with patch.object(client, "multi_search", wraps=client.multi_search) as mock:
+            multi_search([(UserIndexer, "Multi"), (AddressIndexer, "Paris")])
+        mock.assert_called_once_with(
+            [
+                {"indexUid": "test_users", "q": "Multi", "filter": None},
+                {"indexUid": "test_addresses", "q": "Paris", "filter": None},
+            ]
+        )
+
+    def test_federated(self) -> None:
+        results = multi_search(
+            [(UserIndexer, "John"), (AddressIndexer, "Paris")],
+            federation={"limit": 10},
+        )
+        self.assertEqual(
+            [hit["_federation"]["indexUid"] for hit in results["hits"]],  # ty: ignore
+            ["test_users", "test_addresses"],
+        )
+
+    def test_empty(self) -> None:
+        self.assertEqual(multi_search([]), [])
+        self.assertEqual(multi_search([], federation={})["hits"], [])  # ty: ignore
+
+
+class SearchInstancesTestCase(MultiSearchMixin, TestCase):
+    def test_search_queryset(self) -> None:
+        queryset = UserIndexer.search_queryset("Multi", sort=["age:asc"])
+        self.assertEqual(list(queryset), [self.user_2, self.user_1])
+        queryset = UserIndexer.search_queryset("Multi", sort=["age:desc"])
+        self.assertEqual(list(queryset), [self.user_1, self.user_2])
+        self.assertEqual(list(queryset.filter(is_active=True)), [self.user_1])
+
+    def test_search_queryset_no_hits(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            queryset = UserIndexer.search_queryset("Nobody")
+            self.assertEqual(list(queryset), [])
+        self.assertEqual(len(context), 0)
+
+    def test_search_instances(self) -> None:
+        instances = UserIndexer.search_instances(
+            "Multi", sort=["age:asc"], facets=["is_active"]
+        )
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(list(instances), [self.user_2, self.user_1])
+            self.assertEqual(instances[0], self.user_2)
+            self.assertEqual(len(instances), 2)
+        self.assertEqual(len(context), 1)
+        self.assertEqual(instances.total_hits, 2)
+        self.assertEqual(
+            instances.facet_distribution, {"is_active": {"false": 1, "true": 1}}
+        )
+        self.assertEqual(list(instances.results["hits"][0]), ["id"])  # ty: ignore
+
+    def test_lazy(self) -> None:
+        with patch.object(UserIndexer, "search", wraps=UserIndexer.search) as mock:
+            instances = UserIndexer.search_instances("Multi")
+            mock.assert_not_called()
+            list(instances)
+            list(instances)
+        mock.assert_called_once()
+
+    def test_missing_rows(self) -> None:
+        ghost = User.objects.create(  # ty: ignore
+            first_name="Ghost",
+            last_name="Multi",
+            email="ghost@multi.com",
+            age=20,
+            is_active=True,
+        )
+        UserIndexer.index(ghost).wait()
+        self.addCleanup(UserIndexer.unindex, ghost.pk)
+        ghost_pk = ghost.pk
+        ghost.delete()
+        instances = UserIndexer.search_instances("Multi", sort=["age:asc"])
+        self.assertEqual(list(instances), [self.user_2, self.user_1])
+        self.assertEqual(instances.missing_ids, [ghost_pk])
+        queryset = UserIndexer.search_queryset("Multi", sort=["age:asc"])
+        self.assertEqual(list(queryset), [self.user_2, self.user_1])
+
+    def test_custom_queryset(self) -> None:
+        instances = UserIndexer.search_instances(
+            "Multi",
+            queryset=User.objects.prefetch_related("addresses"),  # ty: ignore
+            filters={"eq": [("is_active", True)]},
+        )
+        with CaptureQueriesContext(connection) as context:
+            cities = [
+                address.city
+                for user in instances
+                for address in user.addresses.all()  # ty: ignore
+            ]
+        self.assertEqual(cities, ["Paris"])
+        self.assertEqual(len(context), 2)
+
+
+class IterSearchTestCase(MultiSearchMixin, TestCase):
+    def test_iter_search(self) -> None:
+        hits = UserIndexer.iter_search("Multi", sort=["age:asc"], page_size=1)
+        self.assertEqual([hit["id"] for hit in hits], [self.user_2.pk, self.user_1.pk])
+        hits = UserIndexer.iter_search(
+            "Multi", filters={"eq": [("is_active", True)]}, limit=1, offset=1
+        )
+        self.assertEqual([hit["id"] for hit in hits], [self.user_1.pk])
+        with self.assertRaises(ValueError):
+            UserIndexer.iter_search(filters={"eq": [("age", 30)]})
+
+    def test_iter_documents(self) -> None:
+        documents = list(UserIndexer.iter_documents(fields=["id"], page_size=1))
+        self.assertEqual(
+            sorted(documents, key=lambda document: document["id"]),
+            [{"id": self.user_1.pk}, {"id": self.user_2.pk}],
+        )
+        documents = UserIndexer.iter_documents(filters={"eq": [("is_active", False)]})
+        self.assertEqual([document["id"] for document in documents], [self.user_2.pk])
+
+    def test_prefetch(self) -> None:
+        index = self.meilisearch_client.index(UserIndexer.index_name())
+        with patch.object(UserIndexer, "meilisearch_search_client") as mock_client:
+            mock_client.return_value.index.return_value = index
+            with patch.object(index.http, "post", wraps=index.http.post) as mock:
+                documents = UserIndexer.iter_documents(page_size=1)
+                next(documents)
+                # The second page was requested while the first one is consumed
+                sleep(SLEEP_TIME)
+                self.assertEqual(mock.call_count, 2)
+                documents.close()
+        self.assertEqual(mock.call_count, 2)
+
+
+@skipIf(httpx is None, "httpx is not installed")
+class AsyncMultiSearchTestCase(MultiSearchMixin, IsolatedAsyncioTestCase):
+    async def asyncTearDown(self) -> None:
+        await close_async_clients()
+        await super().asyncTearDown()
+
+    async def test_amulti_search(self) -> None:
+        results = await amulti_search(
+            [(UserIndexer, "Multi", {"eq": [("is_active", False)]}), (AddressIndexer,)]
+        )
+        self.assertEqual([hit["id"] for hit in results[0]["hits"]], [self.user_2.pk])  # ty: ignore
+        self.assertEqual(len(results[1]["hits"]), 1)  # ty: ignore
+
+    async def test_federated(self) -> None:
+        results = await amulti_search(
+            [(UserIndexer, "Jane"), (AddressIndexer, "Paris")], federation={}
+        )
+        self.assertEqual(len(results["hits"]), 2)  # ty: ignore
@@ -0,0 +1,161 @@
+from datetime import timedelta
+from itertools import count
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from django.conf import settings
+from meilisearch import Client
+from meilisearch.errors import MeilisearchTimeoutError
+
+from django_meilisearch_indexer import tasks
+from django_meilisearch_indexer.cache import LocalSearchCache
+from django_meilisearch_indexer.tasks import (
+    MeilisearchTaskError,
+    TaskTracker,
+    wait_for_tasks,
+)
+from django_meilisearch_indexer.tests.indexers import UserIndexer
+from django_meilisearch_indexer.tests.models import User
+
+TIMEOUT = timedelta(seconds=5)
+
+
+class WaitForTasksTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.meilisearch_client = Client(
+            settings.MEILISEARCH_HOST, settings.MEILISEARCH_API_KEY
+        )
+        return super().setUpClass()
+
+    def tearDown(self) -> None:
+        self.meilisearch_client.delete_index("test_tasks")
+        super().tearDown()
+
+    def test_bulk_polling(self) -> None:
+        index = self.meilisearch_client.index("test_tasks")
+        uids = [
+            index.add_documents([{"id": i, "name": f"Task {i}"}]).task_uid
+            for i in range(5)
+        ]
+        with patch.object(
+            self.meilisearch_client,
+            "get_tasks",
+            wraps=self.meilisearch_client.get_tasks,
+        ) as mock:
+            results = wait_for_tasks(self.meilisearch_client, uids, TIMEOUT)
+        self.assertEqual([task.uid for task in results], uids)
+        self.assertTrue(all(task.status == "succeeded" for task in results))
+        mock.assert_called_once()
+
+    def test_failed_task(self) -> None:
+        self.meilisearch_client.create_index("test_tasks")
+        task = self.meilisearch_client.create_index("test_tasks")
+        with self.assertRaises(MeilisearchTaskError) as context:
+            wait_for_tasks(self.meilisearch_client, [task.task_uid], TIMEOUT)
+        self.assertEqual(context.exception.task.uid, task.task_uid)
+        self.assertEqual(context.exception.task.error["code"], "index_already_exists")
+
+    def test_backoff(self) -> None:
+        uid = self.meilisearch_client.create_index("test_tasks").task_uid
+        with (
+            patch.object(tasks, "monotonic", side_effect=count()),
+            patch.object(tasks, "sleep") as mock,
+            self.assertRaises(MeilisearchTimeoutError),
+        ):
+            # An unknown task never finishes
+            wait_for_tasks(
+                self.meilisearch_client, [uid, uid + 10**9], timedelta(seconds=10)
+            )
+        delays = [call.args[0] for call in mock.call_args_list]
+        self.assertEqual(delays, [0.05, 0.1, 0.2, 0.4, 0.8, 1, 1, 1, 1])
+
+
+class TaskTrackerTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.meilisearch_client = Client(
+            settings.MEILISEARCH_HOST, settings.MEILISEARCH_API_KEY
+        )
+        cls.user = User.objects.create(  # ty: ignore
+            first_name="John",
+            last_name="Tracker",
+            email="john@tracker.com",
+            is_active=True,
+            age=30,
+        )
+        return super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        User.objects.filter(email__endswith="@tracker.com").delete()  # ty: ignore
+        return super().tearDownClass()
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.meilisearch_client.delete_index(UserIndexer.index_name())
+        self.meilisearch_client.delete_index("test_tasks")
+
+    def tearDown(self) -> None:
+        self.meilisearch_client.delete_index(UserIndexer.index_name())
+        self.meilisearch_client.delete_index("test_tasks")
+        super().tearDown()
+
+    def test_write_methods(self) -> None:
+        tracker = UserIndexer.maybe_create_index()
+        self.assertEqual(len(tracker), 2)
+        tracker.add(UserIndexer.index(self.user))
+        tracker.add(UserIndexer.sync_multiple([self.user.pk, -1]))
+        self.assertEqual(len(tracker), 5)
+        self.assertFalse(tracker.done)
+        tasks = tracker.wait()
+        self.assertTrue(tracker.done)
+        self.assertEqual([task.uid for task in tasks], tracker.task_uids)
+        self.assertEqual(tracker.failed, [])
+        self.assertEqual(set(tracker.durations), set(tracker.task_uids))
+        self.assertTrue(
+            all(latency.total_seconds() >= 0 for latency in tracker.latencies.values())
+        )
+        self.assertEqual(len(UserIndexer.maybe_create_index()), 0)
+        self.assertEqual(len(UserIndexer.unindex(self.user.pk).wait()), 1)
+
+    def test_merge(self) -> None:
+        first = self.meilisearch_client.create_index("test_tasks")
+        tracker = TaskTracker([first, {"taskUid": first.task_uid}])
+        self.assertEqual(len(tracker), 1)
+        other = TaskTracker([first.task_uid + 1])
+        tracker.add(other).add(first.task_uid)
+        self.assertEqual(tracker.task_uids, [first.task_uid, first.task_uid + 1])
+
+    def test_errors(self) -> None:
+        self.meilisearch_client.create_index("test_tasks")
+        failed = self.meilisearch_client.create_index("test_tasks")
+        created = UserIndexer.maybe_create_index()
+        tracker = TaskTracker([failed, created])
+        tasks = tracker.wait(raise_on_failure=False)
+        self.assertEqual(len(tasks), 3)
+        self.assertEqual([task.uid for task in tracker.failed], [failed.task_uid])
+        self.assertEqual(
+            tracker.errors[failed.task_uid]["code"], "index_already_exists"
+        )
+        with self.assertRaises(MeilisearchTaskError):
+            TaskTracker([failed]).wait()
+
+    def test_done_callbacks(self) -> None:
+        callback = MagicMock()
+        tracker = UserIndexer.maybe_create_index().add_done_callback(callback)
+        merged = TaskTracker([tracker]).add_done_callback(callback)
+        merged.wait()
+        callback.assert_called_once()
+        merged.wait()
+        callback.assert_called_once()
+
+    def test_search_cache_version(self) -> None:
+        cache = LocalSearchCache()
+        UserIndexer.maybe_create_index().wait()
+        with patch.object(UserIndexer, "SEARCH_CACHE", cache):
+            tracker = UserIndexer.index(self.user)
+            # Results cached while the task is processed are dropped once it finished
+            version = cache.get_version(UserIndexer.index_name())
+            tracker.wait()
+            self.assertNotEqual(cache.get_version(UserIndexer.index_name()), version)
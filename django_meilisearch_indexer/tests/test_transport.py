@@ -0,0 +1,132 @@
+import inspect
+from threading import Barrier, Thread
+from typing import List
+from unittest import TestCase
+from unittest.mock import patch
+
+from django.conf import settings
+from django.test import override_settings
+from meilisearch._httprequests import HttpRequests
+
+from django_meilisearch_indexer.tests.indexers import AddressIndexer, UserIndexer
+from django_meilisearch_indexer.transport import (
+    MeilisearchTransport,
+    PooledClient,
+    _after_fork_in_child,
+    get_transport,
+    reset_transport,
+)
+
+
+class TransportTestCase(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        reset_transport()
+        self.addCleanup(reset_transport)
+
+    def test_shared_client(self) -> None:
+        client = UserIndexer.meilisearch_client()
+        self.assertIsInstance(client, PooledClient)
+        self.assertIs(AddressIndexer.meilisearch_client(), client)
+        self.assertIs(client, get_transport().client)
+
+    def test_thread_safe_creation(self) -> None:
+        reset_transport()
+        barrier = Barrier(8)
+        transports: List[MeilisearchTransport] = []
+
+        def run() -> None:
+            barrier.wait()
+            transports.append(get_transport())
+
+        threads = [Thread(target=run) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({id(transport) for transport in transports}), 1)
+
+    def test_pooled_session(self) -> None:
+        session = get_transport().write_session
+        with (
+            patch.object(session, "request", wraps=session.request) as mock,
+            patch("requests.api.request") as module_mock,
+        ):
+            UserIndexer.index_exists()
+            UserIndexer.meilisearch_client().health()
+        self.assertEqual(mock.call_count, 2)
+        module_mock.assert_not_called()
+
+    def test_sdk_contract(self) -> None:
+        # `PooledHttpRequests` relies on the private `send_request` of the SDK:
+        # this fails if a release changes its signature or the methods it receives
+        parameters = list(inspect.signature(HttpRequests.send_request).parameters)
+        self.assertEqual(parameters[:3], ["self", "http_method", "path"])
+        http = get_transport().client.http
+        session = get_transport().write_session
+        methods = ["get", "post", "put", "patch", "delete"]
+        with (
+            patch.object(session, "request") as mock,
+            patch("requests.api.request") as module_mock,
+        ):
+            for method in methods:
+                getattr(http, method)("health")
+        self.assertEqual(
+            [call.args[0].lower() for call in mock.call_args_list], methods
+        )
+        module_mock.assert_not_called()
+
+    def test_per_thread_headers(self) -> None:
+        http = get_transport().client.http
+        http.headers["Content-Type"] = "application/x-ndjson"
+        headers = {}
+        thread = Thread(target=lambda: headers.update(http.headers))
+        thread.start()
+        thread.join()
+        self.assertNotEqual(headers.get("Content-Type"), "application/x-ndjson")
+        self.assertEqual(http.headers["Content-Type"], "application/x-ndjson")
+
+    def test_retries(self) -> None:
+        transport = MeilisearchTransport("http://localhost:7700", None, {"RETRIES": 5})
+        write_retry = transport.write_session.get_adapter("http://").max_retries  # ty: ignore
+        search_retry = transport.search_session.get_adapter("http://").max_retries  # ty: ignore
+        self.assertEqual(write_retry.total, 5)
+        self.assertNotIn("POST", write_retry.allowed_methods)
+        self.assertTrue(search_retry.is_retry("POST", 503))
+        self.assertFalse(write_retry.is_retry("POST", 503))
+        transport.close()
+
+    def test_timeouts(self) -> None:
+        transport = MeilisearchTransport(
+            "http://localhost:7700",
+            None,
+            {"TIMEOUT": 5, "SEARCH_TIMEOUT": 1},
+        )
+        self.assertEqual(transport.client.config.timeout, 5)
+        self.assertEqual(transport.search_client().config.timeout, 1)
+        transport.close()
+
+    def test_search_hosts(self) -> None:
+        hosts = [settings.MEILISEARCH_HOST, settings.MEILISEARCH_HOST + "/"]
+        with override_settings(MEILISEARCH_TRANSPORT={"SEARCH_HOSTS": hosts}):
+            transport = get_transport()
+            self.assertEqual(
+                [client.config.url for client in transport.search_clients], hosts
+            )
+            self.assertIn(
+                UserIndexer.meilisearch_search_client(), transport.search_clients
+            )
+            self.assertNotIn(transport.client, transport.search_clients)
+        self.assertIsNot(get_transport(), transport)
+
+    def test_settings_change(self) -> None:
+        transport = get_transport()
+        with override_settings(MEILISEARCH_API_KEY="other"):
+            self.assertIsNot(get_transport(), transport)
+            self.assertEqual(get_transport().client.config.api_key, "other")
+
+    def test_fork(self) -> None:
+        transport = get_transport()
+        _after_fork_in_child()
+        self.assertIsNot(get_transport(), transport)
+        transport.close()
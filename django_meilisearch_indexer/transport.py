@@ -0,0 +1,216 @@
+import os
+import random
+from threading import Lock, local
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from meilisearch import Client
+from meilisearch._httprequests import HttpRequests
+from meilisearch.config import Config
+from meilisearch.index import Index
+from meilisearch.models.task import TaskInfo
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TRANSPORT_OPTIONS: Dict[str, Any] = {
+    "POOL_SIZE": 10,
+    "TIMEOUT": None,
+    "SEARCH_TIMEOUT": None,
+    "WRITE_TIMEOUT": None,
+    "RETRIES": 3,
+    "BACKOFF_FACTOR": 0.1,
+    "BACKOFF_JITTER": 0.1,
+    "SEARCH_HOSTS": None,
+}
+
+
+class PooledHttpRequests(HttpRequests):
+    """
+    Sends the requests of the Meilisearch SDK through a shared `requests.Session`,
+    which keeps a pool of keep-alive connections, instead of a new connection per call.
+    The SDK mutates its headers on each request, so they are kept per thread.
+    It overrides the private `send_request` of the SDK, so the `meilisearch` versions
+    are bounded to the tested range, and `test_sdk_contract` checks that contract.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        session: requests.Session,
+        custom_headers: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        self._local = local()
+        self.session = session
+        super().__init__(config, custom_headers)
+        self._default_headers = dict(self.headers)
+
+    @property
+    def headers(self) -> Dict[str, str]:  # ty: ignore
+        headers = getattr(self._local, "headers", None)
+        if headers is None:
+            headers = self._local.headers = dict(self._default_headers)
+        return headers
+
+    @headers.setter
+    def headers(self, value: Dict[str, str]) -> None:
+        self._local.headers = value
+
+    def send_request(self, http_method: Callable, *args: Any, **kwargs: Any) -> Any:
+        # The SDK passes `requests.get`, `requests.post`... which open a new session each time
+        method = getattr(self.session, http_method.__name__)  # ty: ignore
+        return super().send_request(method, *args, **kwargs)
+
+
+class PooledClient(Client):
+    """
+    A Meilisearch client whose requests, and those of its indexes,
+    go through the given `requests.Session`.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        api_key: Optional[str],
+        session: requests.Session,
+        timeout: Optional[float] = None,
+    ) -> None:
+        super().__init__(url, api_key, timeout=timeout)  # ty: ignore
+        self.session = session
+        self.http = self._make_http()
+        self.task_handler.http = self._make_http()
+
+    def index(self, uid: str) -> Index:
+        index = super().index(uid)
+        index.http = self._make_http()
+        index.task_handler.http = self._make_http()
+        return index
+
+    def get_index(self, uid: str) -> Index:
+        return self.index(uid).fetch_info()
+
+    def create_index(  # ty: ignore
+        self, uid: str, options: Optional[Mapping[str, Any]] = None
+    ) -> TaskInfo:
+        payload = {**(options or {}), "uid": uid}
+        return TaskInfo(**self.http.post(self.config.paths.index, payload))  # ty: ignore
+
+    def _make_http(self) -> PooledHttpRequests:
+        return PooledHttpRequests(self.config, self.session)
+
+
+class MeilisearchTransport:
+    """
+    The clients shared by all the indexers, built from the `MEILISEARCH_HOST`,
+    `MEILISEARCH_API_KEY`, and `MEILISEARCH_TRANSPORT` settings.
+    Writes go to `MEILISEARCH_HOST`, while searches are spread over `SEARCH_HOSTS`
+    if set. Each role has its own pooled session, timeout, and retry policy:
+    searches are retried on any method since they are read-only,
+    while writes are only retried for idempotent methods.
+
+    Args:
+        url (str): The Meilisearch host, used for writes
+        api_key (Optional[str]): The Meilisearch API key
+        options (Optional[Dict[str, Any]]): Overrides `DEFAULT_TRANSPORT_OPTIONS`
+    """
+
+    def __init__(
+        self,
+        url: str,
+        api_key: Optional[str],
+        options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.options = {**DEFAULT_TRANSPORT_OPTIONS, **(options or {})}
+        timeout = self.options["TIMEOUT"]
+        write_timeout = self.options["WRITE_TIMEOUT"] or timeout
+        search_timeout = self.options["SEARCH_TIMEOUT"] or timeout
+        self.write_session = self._make_session(Retry.DEFAULT_ALLOWED_METHODS)
+        self.search_session = self._make_session(None)
+        self.client = PooledClient(url, api_key, self.write_session, write_timeout)
+        search_hosts: List[str] = self.options["SEARCH_HOSTS"] or [url]
+        self.search_clients = [
+            PooledClient(host, api_key, self.search_session, search_timeout)
+            for host in search_hosts
+        ]
+
+    def search_client(self) -> Client:
+        """Returns the client of a random search host."""
+        return random.choice(self.search_clients)
+
+    def close(self) -> None:
+        """Closes the pooled connections."""
+        self.write_session.close()
+        self.search_session.close()
+
+    def _make_session(self, allowed_methods: Optional[Any]) -> requests.Session:
+        """Returns a session with a connection pool and a retry policy."""
+        retry_options: Dict[str, Any] = {
+            "total": self.options["RETRIES"],
+            "backoff_factor": self.options["BACKOFF_FACTOR"],
+            "status_forcelist": (502, 503, 504),
+            "allowed_methods": allowed_methods,
+            "raise_on_status": False,
+        }
+        try:
+            retry = Retry(
+                backoff_jitter=self.options["BACKOFF_JITTER"], **retry_options
+            )
+        except TypeError:  # pragma: no cover
+            # urllib3 < 2 has no jitter
+            retry = Retry(**retry_options)
+        adapter = HTTPAdapter(
+            pool_connections=self.options["POOL_SIZE"],
+            pool_maxsize=self.options["POOL_SIZE"],
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+
+_transport: Optional[MeilisearchTransport] = None
+_transport_lock = Lock()
+
+
+def get_transport() -> MeilisearchTransport:
+    """Returns the shared transport, creating it once in a thread-safe way."""
+    global _transport
+    transport = _transport
+    if transport is None:
+        with _transport_lock:
+            transport = _transport
+            if transport is None:
+                transport = _transport = MeilisearchTransport(
+                    settings.MEILISEARCH_HOST,
+                    settings.MEILISEARCH_API_KEY,
+                    getattr(settings, "MEILISEARCH_TRANSPORT", None),
+                )
+    return transport
+
+
+def reset_transport() -> None:
+    """Closes the shared transport, so the next call creates a new one from the settings."""
+    global _transport
+    with _transport_lock:
+        if _transport is not None:
+            _transport.close()
+        _transport = None
+
+
+def _on_setting_changed(setting: str, **kwargs: Any) -> None:
+    if setting.startswith("MEILISEARCH_"):
+        reset_transport()
+
+
+def _after_fork_in_child() -> None:
+    # The pooled sockets belong to the parent, the child opens its own
+    global _transport, _transport_lock
+    _transport = None
+    _transport_lock = Lock()
+
+
+setting_changed.connect(_on_setting_changed)
+if hasattr(os, "register_at_fork"):  # Not available on Windows
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -1,4 +1,14 @@
-from typing import Any, Dict, List, Literal, Optional, Tuple, TypedDict, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    TypedDict,
+    Union,
+)
 
 
 class Faceting(TypedDict):
@@ -43,6 +53,9 @@ class MeilisearchSettings(TypedDict, total=False):
     typoTolerance: Optional[TypoTolerance]
 
 
+MeilisearchFieldSource = Union[str, Tuple[str, Callable[[Any], Any]]]
+MeilisearchFieldMap = Dict[str, MeilisearchFieldSource]
+
 MeilisearchFilterValue = Union[str, int, float]
 
 
@@ -100,3 +113,25 @@ class MeilisearchSearchResults(TypedDict, total=False):
 
 class MeilisearchSearchHits(TypedDict, total=False):
     hits: List[Dict[str, Any]]
+
+
+class MeilisearchFederation(TypedDict, total=False):
+    offset: int
+    limit: int
+    facetsByIndex: Dict[str, List[str]]
+    mergeFacets: Dict[str, Any]
+
+
+class MeilisearchFederatedSearchResults(TypedDict, total=False):
+    hits: List[Dict[str, Any]]
+    offset: int
+    limit: int
+    estimatedTotalHits: int
+    totalHits: int
+    totalPages: int
+    hitsPerPage: int
+    page: int
+    facetDistribution: Dict[str, Dict[str, int]]
+    facetStats: Dict[str, Dict[str, int]]
+    facetsByIndex: Dict[str, Dict[str, Any]]
+    processingTimeMs: int